@@ -61,8 +61,12 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',
+    'core.middleware.APICompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'core.middleware.SPAStaticFilesMiddleware',
+    'core.middleware.ReplicaRoutingMiddleware',
+    'core.middleware.RequestProfilerMiddleware',
+    'core.middleware.QuerySourceMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -91,6 +95,9 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'config.wsgi.application'
 
+# Set by config/asgi.py so the ASGI deployment routes the async read endpoints
+ASYNC_API_VIEWS = os.environ.get('DJANGO_ASYNC_API_VIEWS') == '1'
+
 
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
@@ -104,9 +111,15 @@ if 'sqlite' in DATABASE_URL.lower():
     print("ERROR: SQLite is not allowed. Use Supabase Postgres only.", file=sys.stderr)
     sys.exit(1)
 
+# Seconds a worker keeps its database connection between requests (0 = reconnect
+# every request). Kept connections are health-checked before reuse.
+DB_CONN_MAX_AGE = int(os.environ.get('DB_CONN_MAX_AGE', '60'))
+
 try:
     DATABASES = {
-        'default': dj_database_url.parse(DATABASE_URL, conn_max_age=0)
+        'default': dj_database_url.parse(
+            DATABASE_URL, conn_max_age=DB_CONN_MAX_AGE, conn_health_checks=DB_CONN_MAX_AGE > 0
+        )
     }
     DATABASES['default']['OPTIONS'] = {
         'connect_timeout': 10,
@@ -115,6 +128,45 @@ except Exception as e:
     print(f"ERROR: Failed to parse DATABASE_URL: {e}", file=sys.stderr)
     sys.exit(1)
 
+# Optional streaming replica. Safe GETs under REPLICA_READ_PATHS and read-only
+# jobs read from it (core/db_routing.py); writes and everything else use the
+# primary. Clients that just wrote stay on the primary for
+# READ_YOUR_WRITES_SECONDS, and a replica that is down or more than
+# REPLICA_MAX_LAG_SECONDS behind is skipped.
+DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL')
+if DATABASE_REPLICA_URL:
+    try:
+        DATABASES['replica'] = dj_database_url.parse(
+            DATABASE_REPLICA_URL, conn_max_age=DB_CONN_MAX_AGE, conn_health_checks=DB_CONN_MAX_AGE > 0
+        )
+    except Exception as e:
+        print(f"ERROR: Failed to parse DATABASE_REPLICA_URL: {e}", file=sys.stderr)
+        sys.exit(1)
+    # Fail fast: a dead replica must not stall requests that fall back to the primary
+    DATABASES['replica']['OPTIONS'] = {
+        'connect_timeout': 2,
+    }
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+    DATABASE_ROUTERS = ['core.db_routing.ReplicaRouter']
+
+REPLICA_READ_PATHS = [
+    '/api/v1/courses',
+    '/api/v1/resources',
+    '/api/v1/me/bootstrap',
+    '/api/v1/assignments',
+    '/api/v1/employees',
+    '/api/v1/teams',
+    '/api/v1/leaderboard',
+]
+# Non-GET endpoints that do not write to the database (heartbeats are buffered in
+# the cache), so a client calling them is not pinned to the primary
+REPLICA_PIN_EXEMPT_PATHS = [
+    r'^/api/v1/assignments/\d+/heartbeat/?$',
+]
+REPLICA_MAX_LAG_SECONDS = float(os.environ.get('REPLICA_MAX_LAG_SECONDS', '5'))
+REPLICA_CHECK_INTERVAL = 5
+READ_YOUR_WRITES_SECONDS = int(os.environ.get('READ_YOUR_WRITES_SECONDS', '10'))
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -156,8 +208,81 @@ STATICFILES_DIRS = [
     BASE_DIR / 'static',
 ]
 
-# WhiteNoise configuration for serving static files in production
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# WhiteNoise configuration for serving static files in production.
+# collectstatic writes .gz and .br (Brotli is installed) siblings for every file;
+# hashed files are then served with a one-year immutable Cache-Control.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+    },
+}
+
+# Files written by background jobs (exports); not served publicly
+MEDIA_ROOT = BASE_DIR / 'media'
+EXPORTS_ROOT = MEDIA_ROOT / 'exports'
+
+# Request profiles (core.profiling): opt-in per request by admins, plus a
+# sampled fraction of API traffic (0 = none)
+PROFILES_ROOT = MEDIA_ROOT / 'profiles'
+PROFILE_MAX_FILES = int(os.environ.get('PROFILE_MAX_FILES', '200'))
+PROFILE_SAMPLE_RATE = float(os.environ.get('PROFILE_SAMPLE_RATE', '0'))
+PROFILE_INTERVAL_MS = float(os.environ.get('PROFILE_INTERVAL_MS', '5'))
+
+# Slow query log (core.slow_queries): queries over SLOW_QUERY_MS (0 = off) are
+# aggregated per fingerprint. SLOW_QUERY_EXPLAIN: always (development), sample, off.
+# EXPLAIN ANALYZE runs each explained query a second time, so it is opt-in
+SLOW_QUERY_MS = float(os.environ.get('SLOW_QUERY_MS', '200'))
+SLOW_QUERY_EXPLAIN = os.environ.get('SLOW_QUERY_EXPLAIN', 'off')
+SLOW_QUERY_EXPLAIN_SAMPLE_RATE = float(os.environ.get('SLOW_QUERY_EXPLAIN_SAMPLE_RATE', '0.05'))
+
+# The SPA shell is read once and served from memory with an ETag.
+# Keep its lifetime short: it points at the current hashed bundle.
+SPA_INDEX_FILE = BASE_DIR / 'static' / 'frontend' / 'index.html'
+SPA_INDEX_MAX_AGE = int(os.environ.get('SPA_INDEX_MAX_AGE', '60'))
+
+# Caches: 'default' is per process and only holds entries whose keys embed a
+# data version; 'shared' lives in Postgres and holds state every worker must
+# agree on (version tokens). Create its table with `manage.py createcachetable`.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'OPTIONS': {'MAX_ENTRIES': 5000},
+    },
+    'shared': {
+        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+        'LOCATION': 'django_cache',
+        'OPTIONS': {'MAX_ENTRIES': 100000},
+    },
+}
+
+# Outgoing email. Nothing is sent during a request: emails are written to the
+# outbox table and delivered by `manage.py send_outbox` (or the worker).
+# Locally, point EMAIL_HOST/EMAIL_PORT at a stand-in SMTP server on :1025.
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
+EMAIL_HOST = os.environ.get('EMAIL_HOST', 'localhost')
+EMAIL_PORT = int(os.environ.get('EMAIL_PORT', '1025'))
+EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', '')
+EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
+EMAIL_USE_TLS = os.environ.get('EMAIL_USE_TLS') == '1'
+EMAIL_TIMEOUT = 10
+DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'LMS <no-reply@localhost>')
+# Messages per second per sender process; most SMTP providers enforce a limit
+EMAIL_RATE_LIMIT = float(os.environ.get('EMAIL_RATE_LIMIT', '10'))
+# Frontend page that receives ?token=... from reset and invite emails
+PASSWORD_RESET_URL = os.environ.get('PASSWORD_RESET_URL', 'http://localhost:5000/reset-password')
+
+# Assignments due within this many hours get a "due soon" reminder
+REMINDER_DUE_SOON_HOURS = int(os.environ.get('REMINDER_DUE_SOON_HOURS', '48'))
+
+# How often buffered video heartbeats are merged into assignments; also the most
+# watch time a database crash can lose
+HEARTBEAT_FLUSH_SECONDS = int(os.environ.get('HEARTBEAT_FLUSH_SECONDS', '30'))
+
+# Change history kept for GET /sync; older sync tokens must do a full sync
+SYNC_RETENTION_DAYS = int(os.environ.get('SYNC_RETENTION_DAYS', '30'))
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.1/ref/settings/#default-auto-field
@@ -181,5 +306,22 @@ REST_FRAMEWORK = {
     ],
     'DEFAULT_RENDERER_CLASSES': [
         'rest_framework.renderers.JSONRenderer',
+        'core.renderers.MessagePackRenderer',
+        'core.renderers.ColumnarJSONRenderer',
     ],
+    # Token buckets for the auth endpoints (core/throttling.py): burst / refill per period.
+    # The per-account bucket (email and IP) is the real limit; the per-IP one is loose because
+    # a whole office behind one NAT address shares it, and only stops floods from one address.
+    'DEFAULT_THROTTLE_RATES': {
+        'auth_ip': os.environ.get('THROTTLE_AUTH_IP', '300/min'),
+        'auth_account': os.environ.get('THROTTLE_AUTH_ACCOUNT', '10/min'),
+        'auth_refresh': os.environ.get('THROTTLE_AUTH_REFRESH', '600/min'),
+    },
+    # Proxies in front of Django that append to X-Forwarded-For; the client IP is
+    # read that many entries from the right. With 0 it is REMOTE_ADDR and a client
+    # cannot pick its own bucket with a forged header. Set 1 behind Replit's router.
+    'NUM_PROXIES': int(os.environ.get('NUM_PROXIES', '0')),
 }
+
+# API responses at least this large are brotli/gzip compressed when the client accepts it
+API_COMPRESSION_MIN_BYTES = 1024
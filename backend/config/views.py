@@ -0,0 +1,59 @@
+"""
+Project-level views: the SPA shell and the JSON 404 for unknown API paths.
+"""
+import hashlib
+import os
+import threading
+from django.conf import settings
+from django.http import Http404, HttpResponse, JsonResponse
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition, require_safe
+
+
+_index_lock = threading.Lock()
+_index_cache = {}
+
+
+def _load_index():
+    """
+    Read index.html once per process and keep it, with its ETag, in memory.
+    The file's mtime is checked so a rebuilt frontend is picked up without a restart.
+    """
+    path = settings.SPA_INDEX_FILE
+    try:
+        mtime = os.stat(path).st_mtime
+    except OSError:
+        raise Http404('Frontend has not been built')
+
+    cached = _index_cache.get('page')
+    if cached and cached['mtime'] == mtime:
+        return cached
+
+    with _index_lock:
+        with open(path, 'rb') as f:
+            content = f.read()
+        cached = {
+            'mtime': mtime,
+            'content': content,
+            'etag': hashlib.sha256(content).hexdigest()[:32],
+        }
+        _index_cache['page'] = cached
+    return cached
+
+
+def _index_etag(request, *args, **kwargs):
+    return _load_index()['etag']
+
+
+@require_safe
+@condition(etag_func=_index_etag)
+def spa_index(request, *args, **kwargs):
+    """Serve the React shell for every client-side route"""
+    response = HttpResponse(_load_index()['content'], content_type='text/html; charset=utf-8')
+    patch_cache_control(response, public=True, max_age=settings.SPA_INDEX_MAX_AGE)
+    return response
+
+
+def api_not_found(request, *args, **kwargs):
+    """Unknown /api/ paths get a JSON 404 instead of the SPA shell"""
+    return JsonResponse({'detail': 'Not found.'}, status=404)
@@ -1,13 +1,53 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
-from .models import User, Team, Course, Resource, Assignment, ProgressEvent, Notification, Approval, RefreshToken
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+from .models import User, Team, Course, Resource, Assignment, ProgressEvent, Notification, Approval, RefreshToken, Job, OutboundEmail, SlowQuery
+from .jobs import retry_dead
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    An unfiltered changelist of a big table is counted from the planner's
+    estimate (pg_class.reltuples) instead of a full COUNT(*).
+    """
+    EXACT_BELOW = 100_000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            with connections[queryset.db].cursor() as cursor:
+                cursor.execute(
+                    'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                    [queryset.model._meta.db_table]
+                )
+                row = cursor.fetchone()
+            # -1 until the table is first analyzed
+            if row and row[0] >= self.EXACT_BELOW:
+                return row[0]
+        return super().count
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    Changelist settings for tables with millions of rows: estimated counts,
+    no second unfiltered COUNT(*), newest first by primary key, and related
+    objects picked by id or autocomplete rather than a <select> of every row.
+    """
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    ordering = ('-id',)
 
 
 @admin.register(User)
 class UserAdmin(BaseUserAdmin):
     list_display = ('email', 'first_name', 'last_name', 'role', 'team', 'is_staff', 'date_joined')
     list_filter = ('role', 'is_staff', 'is_active')
-    search_fields = ('email', 'first_name', 'last_name')
+    # Prefix search, served by the users_*_upper_idx indexes (also used by autocomplete)
+    search_fields = ('^email', '^first_name', '^last_name')
+    list_select_related = ('team',)
     ordering = ('-date_joined',)
     
     fieldsets = (
@@ -27,14 +67,14 @@ class UserAdmin(BaseUserAdmin):
 
 @admin.register(Team)
 class TeamAdmin(admin.ModelAdmin):
-    list_display = ('name', 'manager', 'created_at')
+    list_display = ('name', 'manager', 'member_count', 'created_at')
     search_fields = ('name',)
     list_filter = ('created_at',)
 
 
 @admin.register(Course)
 class CourseAdmin(admin.ModelAdmin):
-    list_display = ('title', 'status', 'level', 'created_by', 'created_at')
+    list_display = ('title', 'status', 'level', 'created_by', 'enrolled_count', 'completed_count', 'created_at')
     list_filter = ('status', 'level', 'created_at')
     search_fields = ('title', 'description')
     ordering = ('-created_at',)
@@ -48,23 +88,30 @@ class ResourceAdmin(admin.ModelAdmin):
 
 
 @admin.register(Assignment)
-class AssignmentAdmin(admin.ModelAdmin):
-    list_display = ('user', 'course', 'status', 'progress_pct', 'assigned_by', 'assigned_at')
-    list_filter = ('status', 'assigned_at')
-    search_fields = ('user__email', 'course__title')
+class AssignmentAdmin(LargeTableAdmin):
+    list_display = ('user', 'course', 'status', 'progress_pct', 'assigned_by', 'assigned_at', 'due_at')
+    list_filter = ('status', 'assigned_at', 'due_at')
+    list_select_related = ('user', 'course', 'assigned_by')
+    search_fields = ('^user__email',)
+    autocomplete_fields = ('user', 'course', 'assigned_by')
 
 
 @admin.register(ProgressEvent)
-class ProgressEventAdmin(admin.ModelAdmin):
+class ProgressEventAdmin(LargeTableAdmin):
     list_display = ('assignment', 'progress_pct', 'created_at')
     list_filter = ('created_at',)
+    # Assignment.__str__ reads the user's email and the course title
+    list_select_related = ('assignment__user', 'assignment__course')
+    raw_id_fields = ('assignment',)
 
 
 @admin.register(Notification)
-class NotificationAdmin(admin.ModelAdmin):
+class NotificationAdmin(LargeTableAdmin):
     list_display = ('user', 'text', 'read_at', 'created_at')
     list_filter = ('read_at', 'created_at')
-    search_fields = ('user__email', 'text')
+    list_select_related = ('user',)
+    search_fields = ('^user__email',)
+    autocomplete_fields = ('user',)
 
 
 @admin.register(Approval)
@@ -75,7 +122,73 @@ class ApprovalAdmin(admin.ModelAdmin):
 
 
 @admin.register(RefreshToken)
-class RefreshTokenAdmin(admin.ModelAdmin):
+class RefreshTokenAdmin(LargeTableAdmin):
     list_display = ('user', 'created_at', 'expires_at', 'is_blacklisted')
     list_filter = ('is_blacklisted', 'created_at')
-    search_fields = ('user__email',)
+    list_select_related = ('user',)
+    search_fields = ('^user__email',)
+    autocomplete_fields = ('user',)
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'task', 'queue', 'status', 'attempts', 'max_attempts', 'run_at', 'created_at')
+    list_filter = ('status', 'queue', 'task')
+    readonly_fields = ('locked_by', 'locked_at', 'last_error', 'result', 'created_at', 'finished_at')
+    ordering = ('-created_at',)
+    actions = ['retry_jobs']
+    
+    @admin.action(description='Retry selected dead jobs')
+    def retry_jobs(self, request, queryset):
+        count = retry_dead(list(queryset.values_list('id', flat=True)))
+        self.message_user(request, f'{count} job(s) requeued.')
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    list_display = ('to_email', 'kind', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status', 'kind')
+    search_fields = ('to_email',)
+    # Bodies hold live reset and invite links
+    exclude = ('body',)
+    readonly_fields = ('last_error', 'created_at', 'sent_at')
+    ordering = ('-created_at',)
+
+
+@admin.register(SlowQuery)
+class SlowQueryAdmin(admin.ModelAdmin):
+    """Slow query fingerprints ranked by total time spent"""
+    list_display = ('source', 'short_sql', 'calls', 'total', 'average', 'slowest', 'has_plan', 'last_seen')
+    list_filter = ('last_seen',)
+    search_fields = ('source', 'normalized_sql')
+    ordering = ('-total_ms',)
+    readonly_fields = (
+        'fingerprint', 'source', 'normalized_sql', 'example_sql', 'calls', 'total_ms', 'max_ms',
+        'plan', 'plan_captured_at', 'first_seen', 'last_seen',
+    )
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    @admin.display(description='SQL')
+    def short_sql(self, obj):
+        return obj.normalized_sql[:120]
+
+    @admin.display(description='Total ms', ordering='total_ms')
+    def total(self, obj):
+        return f'{obj.total_ms:,.0f}'
+
+    @admin.display(description='Avg ms')
+    def average(self, obj):
+        return f'{obj.avg_ms:,.1f}'
+
+    @admin.display(description='Max ms', ordering='max_ms')
+    def slowest(self, obj):
+        return f'{obj.max_ms:,.1f}'
+
+    @admin.display(description='Plan', boolean=True)
+    def has_plan(self, obj):
+        return bool(obj.plan)
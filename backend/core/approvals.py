@@ -0,0 +1,136 @@
+"""
+Course approval review queue.
+
+Several admins can review at the same time: pending approvals are claimed with
+SELECT ... FOR UPDATE SKIP LOCKED, and decisions are conditional UPDATEs on
+status='pending', so an approval is never processed twice. A live claim is
+binding: only the admin holding it can decide the approval until it expires.
+"""
+import base64
+from datetime import timedelta
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from .cache_utils import bump_versions
+from .models import Approval, Course
+
+
+# A claim that is not decided within this window is handed out again
+CLAIM_TIMEOUT = timedelta(minutes=15)
+
+DECISIONS = {
+    'approve': ('approved', 'published'),
+    'reject': ('rejected', 'draft'),
+}
+
+
+def pending_queue():
+    """Pending approvals, oldest first (served by approvals_pending_queue_idx)"""
+    return Approval.objects.filter(status='pending').order_by('requested_at', 'id')
+
+
+def encode_cursor(approval):
+    raw = f'{approval.requested_at.isoformat()}|{approval.id}'
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor):
+    """Return (requested_at, id) for a cursor, or None if it is malformed"""
+    try:
+        requested_at, approval_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        requested_at = parse_datetime(requested_at)
+        if requested_at is None:
+            return None
+        return requested_at, int(approval_id)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def after_cursor(queryset, cursor):
+    """Keyset pagination: rows strictly after (requested_at, id)"""
+    requested_at, approval_id = cursor
+    return queryset.filter(
+        Q(requested_at__gt=requested_at) | Q(requested_at=requested_at, id__gt=approval_id)
+    )
+
+
+def claimed_by_others(reviewer, now):
+    """Approvals under another reviewer's unexpired claim"""
+    return (
+        Q(claimed_by__isnull=False) &
+        ~Q(claimed_by=reviewer) &
+        Q(claimed_at__gte=now - CLAIM_TIMEOUT)
+    )
+
+
+def claim_pending(reviewer, limit):
+    """
+    Claim up to `limit` pending approvals for `reviewer`, oldest first.
+    Rows locked by another reviewer's claim are skipped rather than waited on.
+    Returns the claimed approval ids.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        approval_ids = list(
+            pending_queue()
+            .exclude(claimed_by_others(reviewer, now))
+            .select_for_update(skip_locked=True, of=('self',))
+            .values_list('id', flat=True)[:limit]
+        )
+        if approval_ids:
+            Approval.objects.filter(id__in=approval_ids).update(claimed_by=reviewer, claimed_at=now)
+            bump_versions('approvals')
+    return approval_ids
+
+
+def decide_approvals(approvals, decision, reviewer, note=''):
+    """
+    Approve or reject the pending rows of the `approvals` queryset.
+    Must run inside a transaction. Rows claimed by or locked by another
+    reviewer are skipped and rows that are no longer pending are not touched.
+    Returns a list of (approval_id, course_id) that were decided.
+    """
+    approval_status, _ = DECISIONS[decision]
+    now = timezone.now()
+    decided = list(
+        approvals.filter(status='pending')
+        .exclude(claimed_by_others(reviewer, now))
+        .select_for_update(skip_locked=True, of=('self',))
+        .values_list('id', 'course_id')
+    )
+    if not decided:
+        return []
+
+    changes = {
+        'status': approval_status,
+        'approved_by': reviewer,
+        'reviewed_at': now,
+        'claimed_by': None,
+        'claimed_at': None,
+    }
+    if decision == 'reject':
+        changes['rejection_note'] = note
+
+    Approval.objects.filter(
+        id__in=[approval_id for approval_id, _ in decided],
+        status='pending',
+    ).update(**changes)
+    bump_versions('approvals')
+    return decided
+
+
+def bulk_decide(approvals, decision, reviewer, note=''):
+    """
+    Decide many approvals and move their courses in one transaction.
+    Returns the list of (approval_id, course_id) that were decided.
+    """
+    _, course_status = DECISIONS[decision]
+    with transaction.atomic():
+        decided = decide_approvals(approvals, decision, reviewer, note)
+        if decided:
+            Course.objects.filter(
+                id__in={course_id for _, course_id in decided}
+            ).update(status=course_status, updated_at=timezone.now())
+            bump_versions('courses')
+    return decided
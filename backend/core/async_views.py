@@ -0,0 +1,157 @@
+"""
+Async versions of the I/O-bound read endpoints.
+
+These are only routed when the project runs under ASGI (see config/asgi.py).
+Authentication and the database reads go through Django's async API, so a
+slow database or client does not pin a worker. Everything else is the DRF
+viewset's own code, run on a viewset instance set up as the router would:
+its permission classes, ?fields / ?expand / ?compact (filter_queryset and
+get_serializer), content negotiation (msgpack, columnar JSON) and exception
+handling. Anything other than GET is handed to the original DRF view.
+"""
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.http import HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+from . import heartbeats, views
+from .db_routing import replica_status
+from .jwt_utils import decode_access_token
+from .models import User, Assignment
+from .serializers import is_compact
+
+
+_course_list_view = views.CourseViewSet.as_view(
+    {'get': 'list', 'post': 'create'}, basename='course', detail=False
+)
+_assignment_mine_view = views.AssignmentViewSet.as_view(
+    {'get': 'mine'}, basename='assignment', detail=False
+)
+_notification_list_view = views.NotificationViewSet.as_view(
+    {'get': 'list', 'post': 'create'}, basename='notification', detail=False
+)
+
+
+def _json_response(data, status_code=status.HTTP_200_OK):
+    return HttpResponse(
+        JSONRenderer().render(data),
+        status=status_code,
+        content_type='application/json',
+    )
+
+
+def _ping_database():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+        return cursor.fetchone()
+
+
+async def health_db(request):
+    try:
+        result = await sync_to_async(_ping_database)()
+        replica = await sync_to_async(replica_status)()
+        heartbeat_buffer = await sync_to_async(heartbeats.buffer_status)()
+
+        return _json_response({
+            'status': 'healthy',
+            'database': 'connected',
+            'result': result[0] if result else None,
+            'replica': replica,
+            'heartbeats': heartbeat_buffer
+        })
+    except Exception as e:
+        return _json_response({
+            'status': 'unhealthy',
+            'database': 'disconnected',
+            'error': str(e)
+        }, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+
+async def _authenticate(request):
+    """Async counterpart of JWTAuthentication.authenticate; AnonymousUser without a bearer token"""
+    auth_header = request.headers.get('Authorization')
+    if not auth_header:
+        return AnonymousUser()
+
+    try:
+        prefix, token = auth_header.split(' ')
+    except ValueError:
+        return AnonymousUser()
+    if prefix.lower() != 'bearer':
+        return AnonymousUser()
+
+    payload = decode_access_token(token)
+    if not payload:
+        raise AuthenticationFailed('Invalid or expired token')
+
+    try:
+        return await User.objects.aget(id=payload['user_id'], is_active=True)
+    except User.DoesNotExist:
+        raise AuthenticationFailed('User not found')
+
+
+async def _list(request, viewset_class, action, basename, get_queryset, side_load=False):
+    """
+    Serve a viewset's list-style GET action: `get_queryset(view)` is read with
+    the async ORM, so it must select_related whatever the serializer touches.
+    With side_load, ?compact responses side-load like list_response().
+    """
+    view = viewset_class(
+        action_map={'get': action}, basename=basename, detail=False, args=(), kwargs={}, format_kwarg=None,
+    )
+    drf_request = view.initialize_request(request)
+    view.request = drf_request
+    view.headers = view.default_response_headers
+
+    try:
+        drf_request.user = await _authenticate(request)
+        # Content negotiation, permissions and throttles; the user is already set
+        view.initial(drf_request)
+        queryset = view.filter_queryset(get_queryset(view))
+        rows = [row async for row in queryset.aiterator()]
+        data = view.get_serializer(rows, many=True).data
+        if side_load and is_compact(drf_request):
+            data = {'results': data, **await sync_to_async(views.side_load)(data)}
+        response = Response(data)
+    except Exception as exc:
+        response = view.handle_exception(exc)
+
+    return view.finalize_response(drf_request, response).render()
+
+
+@csrf_exempt
+async def course_list(request):
+    if request.method != 'GET':
+        return await sync_to_async(_course_list_view)(request)
+    return await _list(
+        request, views.CourseViewSet, 'list', 'course',
+        lambda view: view.get_queryset().select_related('created_by'),
+    )
+
+
+@csrf_exempt
+async def assignments_mine(request):
+    if request.method != 'GET':
+        return await sync_to_async(_assignment_mine_view)(request)
+    return await _list(
+        request, views.AssignmentViewSet, 'mine', 'assignment',
+        lambda view: Assignment.objects.filter(user=view.request.user).select_related(
+            'user', 'course__created_by', 'assigned_by'
+        ),
+        side_load=True,
+    )
+
+
+@csrf_exempt
+async def notification_list(request):
+    if request.method != 'GET':
+        return await sync_to_async(_notification_list_view)(request)
+    return await _list(
+        request, views.NotificationViewSet, 'list', 'notification',
+        lambda view: view.get_queryset(),
+    )
@@ -0,0 +1,95 @@
+"""
+Small HTTP helpers shared by the benchmark management commands.
+
+Only the standard library is used so the commands can run against any local
+instance without extra dependencies.
+"""
+import json
+import math
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers"""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def timed_request(url, method='GET', headers=None, data=None, timeout=30, response_headers=None):
+    """
+    Send one request and time it.
+    Returns (status_code, elapsed_ms, response_bytes, body); if a
+    response_headers dict is given it is filled with the response headers.
+    """
+    body = json.dumps(data).encode() if data is not None else None
+    request_headers = {'Content-Type': 'application/json'}
+    request_headers.update(headers or {})
+    request = urllib.request.Request(url, data=body, method=method, headers=request_headers)
+
+    started = time.perf_counter()
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            payload = response.read()
+            status_code = response.status
+            headers_received = response.headers
+    except urllib.error.HTTPError as e:
+        payload = e.read()
+        status_code = e.code
+        headers_received = e.headers
+    except (urllib.error.URLError, OSError):
+        payload = b''
+        status_code = 0
+        headers_received = {}
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    if response_headers is not None:
+        response_headers.update(headers_received)
+    return status_code, elapsed_ms, len(payload), payload
+
+
+def obtain_token(base_url, email, password):
+    """Log in through the API and return the access token"""
+    status_code, _, _, payload = timed_request(
+        f'{base_url}/api/v1/auth/login', method='POST',
+        data={'email': email, 'password': password},
+    )
+    if status_code != 200:
+        raise RuntimeError(f'Login failed for {email} against {base_url} (HTTP {status_code})')
+    return json.loads(payload)['access']
+
+
+def summarize(samples, duration_s):
+    """
+    Summarize a list of (status_code, elapsed_ms) samples collected over duration_s seconds
+    """
+    latencies = [elapsed for _, elapsed in samples]
+    errors = sum(1 for status_code, _ in samples if status_code == 0 or status_code >= 400)
+    return {
+        'requests': len(samples),
+        'errors': errors,
+        'error_rate': errors / len(samples) if samples else 0.0,
+        'throughput': len(samples) / duration_s if duration_s else 0.0,
+        'p50': percentile(latencies, 50),
+        'p95': percentile(latencies, 95),
+        'p99': percentile(latencies, 99),
+    }
+
+
+def hammer(url, total_requests, concurrency, headers=None):
+    """
+    Fire total_requests GETs at url from `concurrency` threads.
+    Returns (samples, duration_s).
+    """
+    def one(_):
+        status_code, elapsed_ms, _, _ = timed_request(url, headers=headers)
+        return status_code, elapsed_ms
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(one, range(total_requests)))
+    return samples, time.perf_counter() - started
@@ -0,0 +1,77 @@
+"""
+Helpers for conditional GETs and version-keyed response caching.
+
+Cache keys always embed the version of the data they were built from (for
+example a row's updated_at), so a stale entry is simply never looked up again
+and the per-process default cache is safe to use across workers.
+
+Where no row timestamp is available, a named version token is kept in the
+shared (database-backed) cache and replaced whenever that data changes.
+"""
+import hashlib
+import uuid
+from django.core.cache import cache, caches
+from django.utils.cache import patch_cache_control
+from rest_framework import status
+from rest_framework.response import Response
+
+
+PAYLOAD_TIMEOUT = 60 * 60
+
+
+def make_etag(*parts):
+    digest = hashlib.sha256('|'.join(str(part) for part in parts).encode()).hexdigest()[:32]
+    return f'"{digest}"'
+
+
+def _opaque_tag(tag):
+    # Weak comparison (RFC 9110 8.8.3.2): APICompressionMiddleware sends W/ tags for compressed bodies
+    tag = tag.strip()
+    return tag[2:] if tag.startswith('W/') else tag
+
+
+def is_not_modified(request, etag):
+    if_none_match = request.headers.get('If-None-Match', '')
+    candidates = [_opaque_tag(tag) for tag in if_none_match.split(',')]
+    return '*' in candidates or _opaque_tag(etag) in candidates
+
+
+def conditional_response(request, etag, build_payload, cache_key=None):
+    """
+    Return 304 if the client already has `etag`, otherwise the payload built by
+    `build_payload` (cached under `cache_key` when given) with validators attached.
+    """
+    if is_not_modified(request, etag):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    elif cache_key:
+        response = Response(cache.get_or_set(cache_key, build_payload, PAYLOAD_TIMEOUT))
+    else:
+        response = Response(build_payload())
+
+    response['ETag'] = etag
+    # Visibility is role-based, so only the user's own browser may reuse it
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def get_versions(names):
+    """
+    Current version token for each name, from the shared cache.
+    Names without a token get a fresh one, so nothing cached earlier can match.
+    """
+    shared = caches['shared']
+    keys = {name: f'version:{name}' for name in names}
+    found = shared.get_many(keys.values())
+
+    versions = {}
+    for name, key in keys.items():
+        if key not in found:
+            shared.add(key, uuid.uuid4().hex, None)
+            found[key] = shared.get(key)
+        versions[name] = found[key]
+    return versions
+
+
+def bump_versions(*names):
+    """Invalidate everything cached under these version names"""
+    caches['shared'].set_many({f'version:{name}': uuid.uuid4().hex for name in names}, None)
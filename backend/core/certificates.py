@@ -0,0 +1,155 @@
+"""
+Completion certificates.
+
+Completing an assignment (core.progress, core.heartbeats or a model save)
+queues the certificates.generate job in the same transaction; the progress
+call itself never renders anything. The job renders an SVG and stores it in
+certificate_files under its SHA-256, in Postgres rather than on a local disk,
+because the job runs on the worker while any web instance may serve the file.
+A name never changes content once written, so it is served with a one-year
+immutable Cache-Control. A certificate is only rewritten when its content
+changes: a renamed learner or course (queued from core.signals) or a new
+template.
+"""
+import hashlib
+import re
+from html import escape
+from django.db import transaction
+from django.utils import timezone
+from .jobs import enqueue
+from .models import Assignment, Certificate, CertificateFile
+
+
+BATCH_SIZE = 500
+
+DIGEST_RE = re.compile(r'^[0-9a-f]{64}$')
+
+TEMPLATE = '''<svg xmlns="http://www.w3.org/2000/svg" width="1123" height="794" viewBox="0 0 1123 794">
+  <rect width="1123" height="794" fill="#ffffff"/>
+  <rect x="24" y="24" width="1075" height="746" fill="none" stroke="#1e3a8a" stroke-width="6"/>
+  <rect x="40" y="40" width="1043" height="714" fill="none" stroke="#93c5fd" stroke-width="2"/>
+  <g font-family="Georgia, 'Times New Roman', serif" text-anchor="middle" fill="#111827">
+    <text x="561.5" y="190" font-size="54" fill="#1e3a8a">Certificate of Completion</text>
+    <text x="561.5" y="280" font-size="24" fill="#4b5563">This certifies that</text>
+    <text x="561.5" y="360" font-size="{name_size}" font-weight="bold">{name}</text>
+    <text x="561.5" y="430" font-size="24" fill="#4b5563">has successfully completed</text>
+    <text x="561.5" y="500" font-size="{title_size}" font-style="italic">{title}</text>
+    <text x="561.5" y="640" font-size="20" fill="#4b5563">Completed on {date}</text>
+  </g>
+</svg>
+'''
+
+
+def _font_size(text, normal, minimum, fits):
+    """Shrink long lines so they stay inside the border"""
+    if len(text) <= fits:
+        return normal
+    return max(minimum, normal * fits // len(text))
+
+
+def render(learner_name, course_title, completed_at):
+    """The certificate SVG as bytes"""
+    completed_on = timezone.localtime(completed_at).date() if completed_at else timezone.localdate()
+    svg = TEMPLATE.format(
+        name=escape(learner_name),
+        name_size=_font_size(learner_name, 44, 24, 36),
+        title=escape(course_title),
+        title_size=_font_size(course_title, 34, 18, 48),
+        date=f'{completed_on.day} {completed_on:%B %Y}',
+    )
+    return svg.encode()
+
+
+def is_digest(value):
+    return bool(DIGEST_RE.match(value or ''))
+
+
+def has_file(certificate):
+    return CertificateFile.objects.filter(digest=certificate.digest).exists()
+
+
+def generate(assignments):
+    """
+    Render the certificates of the completed assignments in `assignments` whose
+    content changed or that have none. Returns {'generated', 'unchanged'}.
+    """
+    rows = (
+        assignments.filter(status='completed')
+        .select_related('user', 'course', 'certificate')
+        .order_by('id')
+    )
+    totals = {'generated': 0, 'unchanged': 0}
+    batch = []
+    for assignment in rows.iterator(chunk_size=BATCH_SIZE):
+        content = render(assignment.user.get_full_name(), assignment.course.title, assignment.completed_at)
+        batch.append((assignment, hashlib.sha256(content).hexdigest(), content))
+        if len(batch) >= BATCH_SIZE:
+            _save(batch, totals)
+            batch = []
+    if batch:
+        _save(batch, totals)
+    return totals
+
+
+def _save(batch, totals):
+    stored = set(
+        CertificateFile.objects.filter(digest__in={digest for _, digest, _ in batch}).values_list('digest', flat=True)
+    )
+    now = timezone.now()
+    files, changed = {}, []
+    for assignment, digest, content in batch:
+        existing = getattr(assignment, 'certificate', None)
+        if existing and existing.digest == digest and digest in stored:
+            totals['unchanged'] += 1
+            continue
+        if digest not in stored:
+            files[digest] = CertificateFile(digest=digest, content=content, created_at=now)
+        changed.append(Certificate(assignment_id=assignment.id, digest=digest, generated_at=now))
+    if not changed:
+        return
+    with transaction.atomic():
+        # Same hash, same content: a file another certificate already stored is shared
+        CertificateFile.objects.bulk_create(files.values(), ignore_conflicts=True)
+        Certificate.objects.bulk_create(
+            changed, update_conflicts=True, unique_fields=['assignment'], update_fields=['digest', 'generated_at'],
+        )
+    totals['generated'] += len(changed)
+
+
+def scope(payload):
+    """Assignments a certificates.generate payload refers to"""
+    assignments = Assignment.objects.all()
+    if 'assignment_ids' in payload:
+        assignments = assignments.filter(id__in=payload['assignment_ids'])
+    if 'user_id' in payload:
+        assignments = assignments.filter(user_id=payload['user_id'])
+    if 'course_id' in payload:
+        assignments = assignments.filter(course_id=payload['course_id'])
+    return assignments
+
+
+def queue(assignment_ids=None, user_id=None, course_id=None):
+    """
+    Queue certificate generation for some assignments, or all of one learner's
+    or one course's. Call it inside the transaction that completes or renames.
+    """
+    if assignment_ids is not None:
+        assignment_ids = list(assignment_ids)
+        if not assignment_ids:
+            return None
+        payload = {'assignment_ids': assignment_ids}
+        unique_key = f'certificates:assignment:{assignment_ids[0]}' if len(assignment_ids) == 1 else ''
+    elif user_id is not None:
+        # No unique key: a job already running may have read the old name
+        payload, unique_key = {'user_id': user_id}, ''
+    else:
+        payload, unique_key = {'course_id': course_id}, ''
+    return enqueue('certificates.generate', payload, unique_key=unique_key)
+
+
+def prune_files():
+    """Delete stored files no certificate refers to any more; returns how many"""
+    deleted, _ = CertificateFile.objects.exclude(
+        digest__in=Certificate.objects.values('digest')
+    ).delete()
+    return deleted
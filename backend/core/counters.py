@@ -0,0 +1,191 @@
+"""
+Stored enrollment and learning counters.
+
+Course.enrolled_count/completed_count/progress_sum and LearnerSummary rows are
+adjusted with F() updates whenever an assignment is created, deleted, or
+changes status or progress (see the Assignment signal handler), so course
+cards and profile headers read them in O(1) instead of scanning assignments.
+
+Bulk writes that bypass signals call recompute() for the rows they touched.
+find_drift()/repair() recompute everything from the assignments table; they
+back `manage.py repair_counters` and a nightly job.
+"""
+from collections import Counter, defaultdict
+from django.db import connection
+from django.db.models import F
+from .models import Course, LearnerSummary
+
+
+def _contribution(state):
+    """What one assignment in `state` ((status, progress_pct) or None) adds to the counters"""
+    if state is None:
+        return {'enrolled': 0, 'in_progress': 0, 'completed': 0, 'progress': 0}
+    status, progress_pct = state
+    return {
+        'enrolled': 1,
+        'in_progress': int(status == 'in_progress'),
+        'completed': int(status == 'completed'),
+        'progress': progress_pct,
+    }
+
+
+def record_transition(user_id, course_id, before, after):
+    """
+    Adjust the course and learner counters for one assignment going from
+    `before` to `after`; each is (status, progress_pct), or None when the
+    assignment does not exist on that side (created / deleted).
+    """
+    record_transitions([(user_id, course_id, before, after)])
+
+
+def record_transitions(transitions):
+    """
+    record_transition() for many assignments at once: the deltas are summed so
+    each course and learner row is updated once.
+    """
+    course_deltas, learner_deltas = defaultdict(Counter), defaultdict(Counter)
+    created_users = set()
+    for user_id, course_id, before, after in transitions:
+        old, new = _contribution(before), _contribution(after)
+        for name in new:
+            course_deltas[course_id][name] += new[name] - old[name]
+            learner_deltas[user_id][name] += new[name] - old[name]
+        if after is not None:
+            created_users.add(user_id)
+
+    # Fixed order so concurrent batches lock rows in the same order
+    for course_id in sorted(course_deltas):
+        delta = course_deltas[course_id]
+        if any(delta.values()):
+            Course.objects.filter(id=course_id).update(
+                enrolled_count=F('enrolled_count') + delta['enrolled'],
+                completed_count=F('completed_count') + delta['completed'],
+                progress_sum=F('progress_sum') + delta['progress'],
+            )
+
+    missing = []
+    for user_id in sorted(learner_deltas):
+        delta = learner_deltas[user_id]
+        if not any(delta.values()):
+            continue
+        updated = LearnerSummary.objects.filter(user_id=user_id).update(
+            assigned_count=F('assigned_count') + delta['enrolled'],
+            in_progress_count=F('in_progress_count') + delta['in_progress'],
+            completed_count=F('completed_count') + delta['completed'],
+            progress_sum=F('progress_sum') + delta['progress'],
+        )
+        if not updated and user_id in created_users:
+            missing.append(user_id)
+    if missing:
+        # No summary row yet (user created before this table existed): build it exactly
+        recompute(user_ids=missing)
+
+
+# Each query lists rows whose stored counters differ from the assignments
+# table: (id, stored values..., expected values...). %(ids)s narrows it down.
+DRIFT_QUERIES = {
+    'courses': '''
+        SELECT c.id, c.enrolled_count, c.completed_count, c.progress_sum,
+               COALESCE(a.enrolled, 0), COALESCE(a.completed, 0), COALESCE(a.progress, 0)
+        FROM courses c
+        LEFT JOIN (
+            SELECT course_id, count(*) AS enrolled,
+                   count(*) FILTER (WHERE status = 'completed') AS completed,
+                   sum(progress_pct) AS progress
+            FROM assignments
+            WHERE %(ids)s IS NULL OR course_id = ANY(%(ids)s)
+            GROUP BY course_id
+        ) a ON a.course_id = c.id
+        WHERE (%(ids)s IS NULL OR c.id = ANY(%(ids)s))
+          AND (c.enrolled_count, c.completed_count, c.progress_sum)
+              IS DISTINCT FROM (COALESCE(a.enrolled, 0), COALESCE(a.completed, 0), COALESCE(a.progress, 0))
+    ''',
+    'learners': '''
+        SELECT u.id, s.assigned_count, s.in_progress_count, s.completed_count, s.progress_sum,
+               COALESCE(a.assigned, 0), COALESCE(a.in_progress, 0), COALESCE(a.completed, 0), COALESCE(a.progress, 0)
+        FROM users u
+        LEFT JOIN learner_summaries s ON s.user_id = u.id
+        LEFT JOIN (
+            SELECT user_id, count(*) AS assigned,
+                   count(*) FILTER (WHERE status = 'in_progress') AS in_progress,
+                   count(*) FILTER (WHERE status = 'completed') AS completed,
+                   sum(progress_pct) AS progress
+            FROM assignments
+            WHERE %(ids)s IS NULL OR user_id = ANY(%(ids)s)
+            GROUP BY user_id
+        ) a ON a.user_id = u.id
+        WHERE (%(ids)s IS NULL OR u.id = ANY(%(ids)s))
+          AND (s.assigned_count, s.in_progress_count, s.completed_count, s.progress_sum)
+              IS DISTINCT FROM (COALESCE(a.assigned, 0), COALESCE(a.in_progress, 0),
+                                COALESCE(a.completed, 0), COALESCE(a.progress, 0))
+    ''',
+    'teams': '''
+        SELECT t.id, t.member_count, COALESCE(m.members, 0)
+        FROM teams t
+        LEFT JOIN (SELECT team_id, count(*) AS members FROM users GROUP BY team_id) m ON m.team_id = t.id
+        WHERE (%(ids)s IS NULL OR t.id = ANY(%(ids)s))
+          AND t.member_count IS DISTINCT FROM COALESCE(m.members, 0)
+    ''',
+}
+
+# Rewrite the drifted rows found by the matching DRIFT_QUERIES entry
+REPAIR_QUERIES = {
+    'courses': '''
+        WITH drift (id, enrolled, completed, progress, expected_enrolled, expected_completed, expected_progress) AS (
+            {drift}
+        )
+        UPDATE courses SET enrolled_count = drift.expected_enrolled,
+                           completed_count = drift.expected_completed,
+                           progress_sum = drift.expected_progress
+        FROM drift WHERE courses.id = drift.id
+        RETURNING courses.id
+    ''',
+    'learners': '''
+        WITH drift (id, assigned, in_progress, completed, progress,
+                    expected_assigned, expected_in_progress, expected_completed, expected_progress) AS (
+            {drift}
+        )
+        INSERT INTO learner_summaries (user_id, assigned_count, in_progress_count, completed_count, progress_sum)
+        SELECT id, expected_assigned, expected_in_progress, expected_completed, expected_progress FROM drift
+        ON CONFLICT (user_id) DO UPDATE SET
+            assigned_count = EXCLUDED.assigned_count,
+            in_progress_count = EXCLUDED.in_progress_count,
+            completed_count = EXCLUDED.completed_count,
+            progress_sum = EXCLUDED.progress_sum
+        RETURNING learner_summaries.user_id
+    ''',
+    'teams': '''
+        WITH drift (id, members, expected_members) AS (
+            {drift}
+        )
+        UPDATE teams SET member_count = drift.expected_members
+        FROM drift WHERE teams.id = drift.id
+        RETURNING teams.id
+    ''',
+}
+
+
+def find_drift(kind, ids=None):
+    """Rows of `kind` whose stored counters are wrong, as tuples (see DRIFT_QUERIES)"""
+    if ids is not None and not ids:
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(DRIFT_QUERIES[kind], {'ids': ids})
+        return cursor.fetchall()
+
+
+def repair(kind, ids=None):
+    """Recompute the counters of `kind` in one statement; returns the ids that were wrong"""
+    if ids is not None and not ids:
+        return []
+    with connection.cursor() as cursor:
+        cursor.execute(REPAIR_QUERIES[kind].format(drift=DRIFT_QUERIES[kind]), {'ids': ids})
+        return [row[0] for row in cursor.fetchall()]
+
+
+def recompute(course_ids=None, user_ids=None):
+    """Exact recount for specific courses and learners, after writes that bypass signals"""
+    if course_ids is not None:
+        repair('courses', list(course_ids))
+    if user_ids is not None:
+        repair('learners', list(user_ids))
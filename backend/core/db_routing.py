@@ -0,0 +1,120 @@
+"""
+Read-replica routing.
+
+With DATABASE_REPLICA_URL set, settings add a 'replica' database and this
+router. Reads go to the replica only inside replica_reads() - entered by
+ReplicaRoutingMiddleware for safe GET paths and by read-only background jobs -
+and only while the replica is reachable and not lagging more than
+REPLICA_MAX_LAG_SECONDS. Everything else, including every write, uses the
+primary ('default').
+"""
+import contextvars
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from django.conf import settings
+from django.db import connections
+
+
+logger = logging.getLogger(__name__)
+
+REPLICA = 'replica'
+
+_replica_reads = contextvars.ContextVar('replica_reads', default=False)
+
+# Shared-state tables every reader must see up to date (cache version tokens)
+PRIMARY_ONLY_APPS = {'django_cache'}
+
+LAG_SQL = '''
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+'''
+
+
+def replica_configured():
+    return REPLICA in settings.DATABASES
+
+
+@contextmanager
+def replica_reads():
+    """Let reads in this block use the replica (when it is healthy)"""
+    token = _replica_reads.set(True)
+    try:
+        yield
+    finally:
+        _replica_reads.reset(token)
+
+
+class ReplicaHealth:
+    """
+    Per-process view of the replica's health, refreshed at most every
+    REPLICA_CHECK_INTERVAL seconds by whichever thread gets there first;
+    other threads keep using the last result instead of waiting.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.healthy = False
+        self.lag = None
+        self.checked_at = float('-inf')
+
+    def is_healthy(self):
+        if time.monotonic() - self.checked_at >= settings.REPLICA_CHECK_INTERVAL and self.lock.acquire(blocking=False):
+            try:
+                self.check()
+            finally:
+                self.lock.release()
+        return self.healthy
+
+    def check(self):
+        try:
+            with connections[REPLICA].cursor() as cursor:
+                cursor.execute(LAG_SQL)
+                self.lag = float(cursor.fetchone()[0])
+            self.healthy = self.lag <= settings.REPLICA_MAX_LAG_SECONDS
+            if not self.healthy:
+                logger.warning('Replica is %.1fs behind; reading from the primary', self.lag)
+        except Exception:
+            logger.warning('Replica unavailable; reading from the primary', exc_info=True)
+            self.healthy, self.lag = False, None
+            connections[REPLICA].close()
+        self.checked_at = time.monotonic()
+
+
+replica_health = ReplicaHealth()
+
+
+def replica_status():
+    """Replica health for /health/db, or None without a replica"""
+    if not replica_configured():
+        return None
+    return {'healthy': replica_health.is_healthy(), 'lag_seconds': replica_health.lag}
+
+
+def read_alias():
+    """Database alias reads should use right now"""
+    if _replica_reads.get() and replica_configured() and replica_health.is_healthy():
+        return REPLICA
+    return 'default'
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label in PRIMARY_ONLY_APPS:
+            return 'default'
+        return read_alias()
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica receives schema changes through replication
+        return db == 'default'
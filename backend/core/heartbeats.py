@@ -0,0 +1,156 @@
+"""
+Write-behind buffer for video heartbeats.
+
+The player reports its position every 10-15 seconds. record() upserts one
+row per assignment into the UNLOGGED progress_heartbeats table - no WAL, no
+progress event, no assignment update - and flush(), run by the
+progress.flush_heartbeats job every HEARTBEAT_FLUSH_SECONDS, drains the
+buffer into assignments in batches, writing at most one progress event per
+assignment per flush. A crash loses at most one flush interval of heartbeats.
+
+Like core.progress, the flush bypasses signals and updates counters and cache
+versions explicitly, and queues certificates for the assignments it completes.
+"""
+from django.db import connection, transaction
+from django.utils import timezone
+from . import certificates
+from .cache_utils import bump_versions
+from .counters import record_transitions
+from .models import User
+
+
+# Watch time credited per heartbeat at most, whatever the client claims
+MAX_WATCH_PER_BEAT = 120
+
+# Largest value the integer position/watch columns hold; larger reports are rejected
+MAX_SECONDS = 2 ** 31 - 1
+
+FLUSH_BATCH_SIZE = 1000
+
+RECORD_SQL = '''
+    INSERT INTO progress_heartbeats
+        (assignment_id, progress_pct, position_seconds, watch_seconds, beats, first_beat_at, last_beat_at)
+    SELECT id, %(pct)s::integer, %(position)s, %(watched)s, 1, %(now)s, %(now)s
+    FROM assignments
+    WHERE id = %(id)s AND user_id = %(user_id)s
+    ON CONFLICT (assignment_id) DO UPDATE SET
+        progress_pct = GREATEST(progress_heartbeats.progress_pct, EXCLUDED.progress_pct),
+        position_seconds = EXCLUDED.position_seconds,
+        watch_seconds = progress_heartbeats.watch_seconds + EXCLUDED.watch_seconds,
+        beats = progress_heartbeats.beats + 1,
+        last_beat_at = EXCLUDED.last_beat_at
+'''
+
+# Drain up to %(limit)s buffered rows (oldest first) and merge them into
+# assignments with the same rules as core.progress: progress only increases
+# and status/completed_at follow from it.
+FLUSH_SQL = '''
+    WITH drained AS (
+        DELETE FROM progress_heartbeats
+        WHERE assignment_id IN (
+            SELECT assignment_id FROM progress_heartbeats
+            ORDER BY first_beat_at
+            LIMIT %(limit)s
+            FOR UPDATE SKIP LOCKED
+        )
+        RETURNING *
+    ), locked AS (
+        SELECT a.id, a.status, a.progress_pct, a.completed_at,
+               d.position_seconds, d.watch_seconds, d.last_beat_at,
+               GREATEST(a.progress_pct, d.progress_pct) AS new_pct
+        FROM assignments a
+        JOIN drained d ON d.assignment_id = a.id
+        ORDER BY a.id
+        FOR NO KEY UPDATE OF a
+    ), target AS (
+        SELECT locked.*, CASE
+            WHEN new_pct >= 100 THEN 'completed'
+            WHEN new_pct > 0 AND status = 'not_started' THEN 'in_progress'
+            ELSE status
+        END AS new_status
+        FROM locked
+    ), updated AS (
+        UPDATE assignments SET
+            progress_pct = target.new_pct,
+            status = target.new_status,
+            completed_at = CASE WHEN target.new_status = 'completed'
+                                THEN COALESCE(target.completed_at, target.last_beat_at) ELSE target.completed_at END,
+            last_activity_at = GREATEST(assignments.last_activity_at, target.last_beat_at),
+            position_seconds = target.position_seconds,
+            watch_seconds = assignments.watch_seconds + target.watch_seconds
+        FROM target
+        WHERE assignments.id = target.id
+        RETURNING assignments.id, assignments.user_id, assignments.course_id,
+                  assignments.status, assignments.progress_pct, target.last_beat_at,
+                  target.status AS previous_status, target.progress_pct AS previous_pct
+    ), events AS (
+        INSERT INTO progress_events (assignment_id, progress_pct, created_at)
+        SELECT id, progress_pct, last_beat_at FROM updated
+        WHERE progress_pct > previous_pct
+    )
+    SELECT id, user_id, course_id, status, progress_pct, previous_status, previous_pct
+    FROM updated
+'''
+
+STATUS_SQL = '''
+    SELECT count(*), EXTRACT(EPOCH FROM now() - min(first_beat_at))
+    FROM progress_heartbeats
+'''
+
+
+def record(assignment_id, user_id, position_seconds, watched_seconds, progress_pct=None):
+    """
+    Buffer one heartbeat from the assigned learner. Returns False when the
+    assignment does not exist or belongs to someone else.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(RECORD_SQL, {
+            'id': assignment_id,
+            'user_id': user_id,
+            'pct': progress_pct,
+            'position': position_seconds,
+            'watched': min(max(watched_seconds, 0), MAX_WATCH_PER_BEAT),
+            'now': timezone.now(),
+        })
+        return cursor.rowcount == 1
+
+
+def flush(batch_size=FLUSH_BATCH_SIZE):
+    """
+    Merge every buffered heartbeat into assignments, one batch per transaction.
+    Returns {'assignments': merged, 'lag_seconds': age of the oldest heartbeat before the flush}.
+    """
+    lag = buffer_status()['flush_lag_seconds']
+    merged = 0
+    while True:
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute(FLUSH_SQL, {'limit': batch_size})
+                rows = cursor.fetchall()
+            if rows:
+                record_transitions([
+                    (user_id, course_id, (previous_status, previous_pct), (new_status, new_pct))
+                    for _, user_id, course_id, new_status, new_pct, previous_status, previous_pct in rows
+                ])
+                certificates.queue(assignment_ids=[
+                    row[0] for row in rows if row[3] == 'completed' and row[5] != 'completed'
+                ])
+                user_ids = {row[1] for row in rows}
+                team_ids = set(
+                    User.objects.filter(id__in=user_ids, team__isnull=False).values_list('team_id', flat=True)
+                )
+                bump_versions(
+                    *[f'assignments:user:{user_id}' for user_id in user_ids],
+                    *[f'assignments:team:{team_id}' for team_id in team_ids],
+                )
+        merged += len(rows)
+        if len(rows) < batch_size:
+            return {'assignments': merged, 'lag_seconds': lag}
+
+
+def buffer_status():
+    """Buffered assignments and the age of the oldest unflushed heartbeat (flush lag)"""
+    with connection.cursor() as cursor:
+        cursor.execute(STATUS_SQL)
+        buffered, lag = cursor.fetchone()
+    return {'buffered': buffered, 'flush_lag_seconds': float(lag) if lag is not None else 0.0}
@@ -0,0 +1,214 @@
+"""
+Durable background jobs stored in Postgres.
+
+Jobs are rows in the `jobs` table. Workers (`manage.py run_worker`) claim
+ready rows with SELECT ... FOR UPDATE SKIP LOCKED, so any number of workers
+can share a queue without a broker. Failed jobs are retried with exponential
+backoff; after max_attempts they are left in the 'dead' state for inspection.
+
+Tasks are plain functions registered with @task and receive the job payload:
+
+    @task('notifications.broadcast')
+    def broadcast(payload):
+        ...
+        return {'sent': 120}   # stored as Job.result
+
+Periodic tasks (@task(name, every=timedelta(...))) are kept scheduled by the
+worker: there is always exactly one queued instance, keyed by unique_key.
+
+While a handler runs, its worker renews the job's lock (locked_at) every
+LEASE_RENEW_INTERVAL, so a long job is never taken for one whose worker died.
+"""
+import logging
+import random
+import threading
+import traceback
+from contextlib import contextmanager
+from datetime import timedelta
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+from . import slow_queries
+from .models import Job
+
+
+logger = logging.getLogger(__name__)
+
+# Running jobs whose lock has not been renewed in this long are requeued
+LOCK_TIMEOUT = timedelta(minutes=10)
+
+LEASE_RENEW_INTERVAL = LOCK_TIMEOUT / 4
+
+BACKOFF_BASE_SECONDS = 10
+BACKOFF_MAX_SECONDS = 60 * 60
+
+_tasks = {}
+_periodic = {}
+
+
+def task(name, every=None):
+    """Register a function as the handler for jobs named `name`"""
+    def register(func):
+        _tasks[name] = func
+        if every is not None:
+            _periodic[name] = every
+        return func
+    return register
+
+
+def registered_tasks():
+    return dict(_tasks)
+
+
+def enqueue(task_name, payload=None, *, queue='default', priority=0, run_at=None,
+            max_attempts=5, unique_key='', created_by=None):
+    """
+    Add a job. It is written in the caller's transaction, so it only becomes
+    visible to workers if that transaction commits.
+    With a unique_key, an already pending job with the same key is returned instead.
+    """
+    if task_name not in _tasks:
+        raise ValueError(f'Unknown task: {task_name}')
+
+    fields = {
+        'queue': queue,
+        'task': task_name,
+        'payload': payload or {},
+        'priority': priority,
+        'run_at': run_at or timezone.now(),
+        'max_attempts': max_attempts,
+        'unique_key': unique_key,
+        'created_by': created_by,
+    }
+
+    if not unique_key:
+        return Job.objects.create(**fields)
+
+    while True:
+        try:
+            with transaction.atomic():
+                return Job.objects.create(**fields)
+        except IntegrityError:
+            existing = Job.objects.filter(unique_key=unique_key, status__in=['queued', 'running']).first()
+            if existing is not None:
+                return existing
+            # The conflicting job finished between the insert and the lookup: insert again
+
+
+def claim(worker_id, queues, limit):
+    """Lock up to `limit` ready jobs for this worker, highest priority first"""
+    now = timezone.now()
+    with transaction.atomic():
+        job_ids = list(
+            Job.objects.filter(status='queued', queue__in=queues, run_at__lte=now)
+            .order_by('-priority', 'run_at', 'id')
+            .select_for_update(skip_locked=True)
+            .values_list('id', flat=True)[:limit]
+        )
+        if not job_ids:
+            return []
+        Job.objects.filter(id__in=job_ids).update(
+            status='running', locked_by=worker_id, locked_at=now, attempts=F('attempts') + 1
+        )
+    return list(Job.objects.filter(id__in=job_ids).order_by('-priority', 'run_at', 'id'))
+
+
+def backoff(attempts):
+    """Seconds to wait before retry number `attempts`, with jitter"""
+    delay = min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+
+@contextmanager
+def _lease(job):
+    """Renew the job's lock from a side thread (on its own connection) until the block exits"""
+    stop = threading.Event()
+
+    def renew():
+        try:
+            while not stop.wait(LEASE_RENEW_INTERVAL.total_seconds()):
+                try:
+                    Job.objects.filter(id=job.id, status='running', locked_by=job.locked_by).update(
+                        locked_at=timezone.now()
+                    )
+                except Exception:
+                    logger.exception('Could not renew the lock of job %s', job.id)
+        finally:
+            connection.close()
+
+    renewer = threading.Thread(target=renew, name=f'job-{job.id}-lease', daemon=True)
+    renewer.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        renewer.join()
+
+
+def run(job):
+    """Execute one claimed job and record the outcome"""
+    func = _tasks.get(job.task)
+    try:
+        if func is None:
+            raise LookupError(f'No handler registered for task {job.task}')
+        with slow_queries.source(f'job:{job.task}'), _lease(job):
+            result = func(job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        logger.exception('Job %s (%s) failed on attempt %s', job.id, job.task, job.attempts)
+        _record_failure(job, error)
+        return False
+
+    Job.objects.filter(id=job.id, status='running').update(
+        status='succeeded', result=result, finished_at=timezone.now(), last_error=''
+    )
+    if job.task in _periodic:
+        schedule_periodic(job.task, delay=_periodic[job.task])
+    return True
+
+
+def _record_failure(job, error):
+    if job.attempts >= job.max_attempts:
+        # Dead-letter: kept for inspection, never retried automatically
+        Job.objects.filter(id=job.id).update(
+            status='dead', last_error=error, finished_at=timezone.now(), locked_by='', locked_at=None
+        )
+        if job.task in _periodic:
+            schedule_periodic(job.task, delay=_periodic[job.task])
+    else:
+        Job.objects.filter(id=job.id).update(
+            status='queued',
+            last_error=error,
+            run_at=timezone.now() + timedelta(seconds=backoff(job.attempts)),
+            locked_by='',
+            locked_at=None,
+        )
+
+
+def requeue_stale():
+    """Put back jobs whose worker died while running them"""
+    cutoff = timezone.now() - LOCK_TIMEOUT
+    stale = Job.objects.filter(status='running', locked_at__lt=cutoff)
+    dead = stale.filter(attempts__gte=F('max_attempts')).update(
+        status='dead', last_error='Worker lock expired', finished_at=timezone.now(), locked_by='', locked_at=None
+    )
+    requeued = stale.update(status='queued', locked_by='', locked_at=None)
+    return requeued + dead
+
+
+def schedule_periodic(task_name, delay=None):
+    """Make sure the periodic task has one queued instance"""
+    run_at = timezone.now() + delay if delay else None
+    return enqueue(task_name, run_at=run_at, unique_key=f'periodic:{task_name}')
+
+
+def schedule_all_periodic():
+    for task_name in _periodic:
+        schedule_periodic(task_name)
+
+
+def retry_dead(job_ids):
+    """Move dead-lettered jobs back to the queue with a fresh attempt budget"""
+    return Job.objects.filter(id__in=job_ids, status='dead').update(
+        status='queued', attempts=0, run_at=timezone.now(), finished_at=None
+    )
@@ -0,0 +1,87 @@
+"""
+Team and org leaderboards.
+
+Rankings are computed with RANK() window functions over assignments and
+progress_events by the periodic leaderboards.refresh job and stored in
+leaderboard_entries, so a request reads the top N through
+leaderboard_top_idx and the caller's own row by its unique key instead of
+aggregating the whole assignments table.
+"""
+from datetime import timedelta
+from django.db import connection, transaction
+from django.utils import timezone
+from .cache_utils import bump_versions
+from .models import LeaderboardEntry
+
+
+PERIODS = {
+    '7d': timedelta(days=7),
+    '30d': timedelta(days=30),
+    'all': None,
+}
+
+REFRESH_INTERVAL = timedelta(minutes=10)
+
+# One period: completions and progress activity per active user since
+# %(since)s (NULL = all time), ranked org-wide and within each team.
+REBUILD_SQL = '''
+    WITH completions AS (
+        SELECT user_id, count(*) AS n
+        FROM assignments
+        WHERE status = 'completed' AND (%(since)s::timestamptz IS NULL OR completed_at >= %(since)s)
+        GROUP BY user_id
+    ), activity AS (
+        SELECT a.user_id, count(*) AS n
+        FROM progress_events e JOIN assignments a ON a.id = e.assignment_id
+        WHERE %(since)s::timestamptz IS NULL OR e.created_at >= %(since)s
+        GROUP BY a.user_id
+    ), stats AS (
+        SELECT u.id AS user_id, u.team_id, COALESCE(c.n, 0) AS completions, COALESCE(x.n, 0) AS activity
+        FROM users u
+        LEFT JOIN completions c ON c.user_id = u.id
+        LEFT JOIN activity x ON x.user_id = u.id
+        WHERE u.is_active AND (c.n IS NOT NULL OR x.n IS NOT NULL)
+    )
+    INSERT INTO leaderboard_entries (scope, period, user_id, completions, activity, rank, computed_at)
+    SELECT 'org', %(period)s, user_id, completions, activity,
+           RANK() OVER (ORDER BY completions DESC, activity DESC), %(now)s
+    FROM stats
+    UNION ALL
+    SELECT 'team:' || team_id, %(period)s, user_id, completions, activity,
+           RANK() OVER (PARTITION BY team_id ORDER BY completions DESC, activity DESC), %(now)s
+    FROM stats
+    WHERE team_id IS NOT NULL
+'''
+
+
+def refresh():
+    """
+    Rebuild every leaderboard in one transaction; readers keep seeing the
+    previous rankings until it commits. Returns the number of rows written.
+    """
+    now = timezone.now()
+    written = 0
+    with transaction.atomic(), connection.cursor() as cursor:
+        LeaderboardEntry.objects.all().delete()
+        for period, window in PERIODS.items():
+            since = now - window if window else None
+            cursor.execute(REBUILD_SQL, {'since': since, 'period': period, 'now': now})
+            written += cursor.rowcount
+        bump_versions('leaderboards')
+    return written
+
+
+def team_scope(team_id):
+    return f'team:{team_id}'
+
+
+def top_entries(scope, period, limit):
+    return list(
+        LeaderboardEntry.objects.filter(scope=scope, period=period, rank__lte=limit)
+        .select_related('user')
+        .order_by('rank', 'user_id')[:limit]
+    )
+
+
+def entry_for(scope, period, user):
+    return LeaderboardEntry.objects.filter(scope=scope, period=period, user=user).first()
@@ -0,0 +1,46 @@
+from django.core.management.base import BaseCommand
+from core import certificates
+from core.models import Assignment
+
+
+class Command(BaseCommand):
+    help = (
+        'Generate certificates for completed assignments that have none (e.g. completed before '
+        'certificates existed). Queues certificates.generate jobs in batches for the worker, or '
+        'renders here with --inline. --all re-checks every completed assignment, which rewrites '
+        'only the certificates whose content changed (after a template change).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Assignments per job')
+        parser.add_argument('--inline', action='store_true', help='Render in this process instead of queueing jobs')
+        parser.add_argument('--all', action='store_true', help='Include assignments that already have a certificate')
+        parser.add_argument('--prune', action='store_true', help='Afterwards delete files no certificate refers to')
+
+    def handle(self, *args, **options):
+        completed = Assignment.objects.filter(status='completed')
+        if not options['all']:
+            completed = completed.filter(certificate__isnull=True)
+        assignment_ids = list(completed.order_by('id').values_list('id', flat=True))
+        batch_size = options['batch_size']
+        batches = [assignment_ids[start:start + batch_size] for start in range(0, len(assignment_ids), batch_size)]
+
+        if options['inline']:
+            totals = {'generated': 0, 'unchanged': 0}
+            for batch in batches:
+                result = certificates.generate(Assignment.objects.filter(id__in=batch))
+                for key in totals:
+                    totals[key] += result[key]
+                self.stdout.write(f"  {totals['generated'] + totals['unchanged']}/{len(assignment_ids)}")
+            self.stdout.write(self.style.SUCCESS(
+                f"Generated {totals['generated']} certificate(s), {totals['unchanged']} unchanged"
+            ))
+        else:
+            for batch in batches:
+                certificates.queue(assignment_ids=batch)
+            self.stdout.write(self.style.SUCCESS(
+                f'Queued {len(batches)} job(s) for {len(assignment_ids)} completed assignment(s)'
+            ))
+
+        if options['prune']:
+            self.stdout.write(f'Deleted {certificates.prune_files()} unreferenced file(s)')
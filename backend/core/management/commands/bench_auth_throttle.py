@@ -0,0 +1,99 @@
+import secrets
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand, CommandError
+from core.benchmarking import obtain_token, timed_request, summarize
+
+
+class Command(BaseCommand):
+    help = (
+        'Measure legitimate API latency before and during a login flood. '
+        'Simulated clients are told apart by X-Forwarded-For, so run it directly '
+        'against an instance with NUM_PROXIES=1 and nothing in front of it.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000')
+        parser.add_argument('--email', default='employee@company.com')
+        parser.add_argument('--password', default='employee123')
+        parser.add_argument('--users', type=int, default=5, help='Concurrent legitimate clients')
+        parser.add_argument('--attackers', type=int, default=40, help='Concurrent attacking threads')
+        parser.add_argument('--attacker-ips', type=int, default=4, help='Distinct IPs the attack comes from')
+        parser.add_argument('--duration', type=float, default=20.0, help='Seconds per phase')
+
+    def handle(self, *args, **options):
+        self.base_url = options['url'].rstrip('/')
+        try:
+            self.token = obtain_token(self.base_url, options['email'], options['password'])
+        except RuntimeError as e:
+            raise CommandError(str(e))
+
+        baseline, _, _ = self.run_phase(options, attackers=0)
+        attacked, attack_statuses, retry_after = self.run_phase(options, attackers=options['attackers'])
+
+        self.stdout.write(f"{'phase':<16}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}")
+        for label, r in [('baseline', baseline), ('under attack', attacked)]:
+            self.stdout.write(
+                f"{label:<16}{r['throughput']:>10.1f}{r['p50']:>10.1f}"
+                f"{r['p95']:>10.1f}{r['p99']:>10.1f}{r['errors']:>8}"
+            )
+
+        total = sum(attack_statuses.values())
+        self.stdout.write(f'\nAttack login attempts: {total}')
+        for status_code, count in sorted(attack_statuses.items()):
+            self.stdout.write(f'  HTTP {status_code}: {count} ({count / total:.0%})')
+        if retry_after:
+            self.stdout.write(f'  Retry-After values: {min(retry_after)}-{max(retry_after)} s')
+
+        if baseline['p95'] and attacked['p95']:
+            change = (attacked['p95'] / baseline['p95'] - 1) * 100
+            style = self.style.SUCCESS if change < 50 else self.style.WARNING
+            self.stdout.write(style(f'\nLegitimate p95 change under attack: {change:+.1f}%'))
+
+    def run_phase(self, options, attackers):
+        """
+        Legitimate clients browse /courses/ while `attackers` threads try
+        passwords against random accounts. Returns the legitimate traffic
+        summary, the attack status counts and the Retry-After values seen.
+        """
+        stop = threading.Event()
+        lock = threading.Lock()
+        legit_samples = []
+        attack_statuses = Counter()
+        retry_after = set()
+
+        def legit_client(index):
+            headers = {'Authorization': f'Bearer {self.token}', 'X-Forwarded-For': f'10.1.0.{index + 1}'}
+            while not stop.is_set():
+                status_code, elapsed_ms, _, _ = timed_request(f'{self.base_url}/api/v1/courses/', headers=headers)
+                with lock:
+                    legit_samples.append((status_code, elapsed_ms))
+                time.sleep(0.1)
+
+        def attacker(index):
+            headers = {'X-Forwarded-For': f'10.66.0.{index % options["attacker_ips"] + 1}'}
+            while not stop.is_set():
+                response_headers = {}
+                status_code, _, _, _ = timed_request(
+                    f'{self.base_url}/api/v1/auth/login', method='POST', headers=headers,
+                    data={'email': f'victim{secrets.randbelow(1000)}@company.com', 'password': 'wrong-password'},
+                    response_headers=response_headers,
+                )
+                with lock:
+                    attack_statuses[status_code] += 1
+                    if 'Retry-After' in response_headers:
+                        retry_after.add(int(response_headers['Retry-After']))
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['users'] + attackers) as pool:
+            for index in range(options['users']):
+                pool.submit(legit_client, index)
+            for index in range(attackers):
+                pool.submit(attacker, index)
+            time.sleep(options['duration'])
+            stop.set()
+        duration = time.perf_counter() - started
+
+        return summarize(legit_samples, duration), attack_statuses, retry_after
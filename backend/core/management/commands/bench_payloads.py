@@ -0,0 +1,111 @@
+import gzip
+import statistics
+import time
+import brotli
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from core.models import User, Course, Assignment
+from core.renderers import MessagePackRenderer, ColumnarJSONRenderer
+from core.serializers import (
+    AssignmentSerializer, EmployeeSerializer, MinimalCourseSerializer, UserSummarySerializer
+)
+
+
+RENDERERS = [
+    ('json', JSONRenderer()),
+    ('msgpack', MessagePackRenderer()),
+    ('columnar', ColumnarJSONRenderer()),
+]
+
+COMPRESSORS = [
+    ('', lambda body: body),
+    ('+gzip', lambda body: gzip.compress(body, compresslevel=6)),
+    ('+br', lambda body: brotli.compress(body, quality=5)),
+]
+
+
+def synthetic_data(rows):
+    """Unsaved model instances shaped like a large team's assignments"""
+    now = timezone.now()
+    manager = User(id=1, email='manager@company.com', first_name='Sarah', last_name='Johnson')
+    courses = [
+        Course(
+            id=i, title=f'Course {i}', description='Learn the fundamentals. ' * 12,
+            video_url=f'https://www.youtube.com/embed/video{i}',
+            thumbnail_url=f'https://images.unsplash.com/photo-{i}?w=400',
+            status='published', level='intermediate', duration='4 hours',
+            created_by=manager, created_at=now, updated_at=now,
+        )
+        for i in range(1, 41)
+    ]
+    users = [
+        User(id=100 + i, email=f'employee{i}@company.com', first_name=f'First{i}',
+             last_name=f'Last{i}', job_title='Engineer', role='EMPLOYEE')
+        for i in range(max(rows // 10, 1))
+    ]
+    assignments = [
+        Assignment(
+            id=i, user=users[i % len(users)], course=courses[i % len(courses)],
+            assigned_by=manager, status='in_progress', progress_pct=i % 100,
+            last_activity_at=now, assigned_at=now,
+        )
+        for i in range(rows)
+    ]
+    return assignments, users
+
+
+def compact_payload(assignments):
+    """Same shape as ?compact=1 on the assignment lists"""
+    request = Request(APIRequestFactory().get('/', {'compact': '1'}))
+    rows = AssignmentSerializer(assignments, many=True, context={'request': request}).data
+    courses = {a.course_id: a.course for a in assignments}
+    users = {}
+    for a in assignments:
+        users[a.user_id] = a.user
+        if a.assigned_by_id:
+            users[a.assigned_by_id] = a.assigned_by
+    return {
+        'results': rows,
+        'courses': {pk: MinimalCourseSerializer(course).data for pk, course in courses.items()},
+        'users': {pk: UserSummarySerializer(user).data for pk, user in users.items()},
+    }
+
+
+class Command(BaseCommand):
+    help = 'Report payload size and encode time per wire format for the big list endpoints'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=5000, help='Synthetic assignment rows')
+        parser.add_argument('--repeat', type=int, default=5)
+        parser.add_argument('--from-db', action='store_true', help='Use the rows in the database instead')
+
+    def handle(self, *args, **options):
+        if options['from_db']:
+            assignments = list(Assignment.objects.select_related('user', 'course__created_by', 'assigned_by'))
+            users = list(User.objects.all())
+        else:
+            assignments, users = synthetic_data(options['rows'])
+
+        payloads = [
+            ('assignments/team', lambda: AssignmentSerializer(assignments, many=True).data),
+            ('assignments/team?compact=1', lambda: compact_payload(assignments)),
+            ('employees', lambda: EmployeeSerializer(users, many=True).data),
+        ]
+
+        self.stdout.write(f"{'payload':<28}{'format':<18}{'bytes':>12}{'encode ms':>12}")
+        for label, build in payloads:
+            data = build()
+            for renderer_name, renderer in RENDERERS:
+                for compressor_name, compress in COMPRESSORS:
+                    timings = []
+                    for _ in range(options['repeat']):
+                        started = time.perf_counter()
+                        body = compress(renderer.render(data))
+                        timings.append((time.perf_counter() - started) * 1000)
+                    self.stdout.write(
+                        f"{label:<28}{renderer_name + compressor_name:<18}"
+                        f"{len(body):>12,}{statistics.median(timings):>12.2f}"
+                    )
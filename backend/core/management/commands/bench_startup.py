@@ -0,0 +1,101 @@
+import os
+import signal
+import statistics
+import subprocess
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from core.benchmarking import timed_request
+from core.jwt_utils import create_access_token
+from core.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        'Start gunicorn (gunicorn.conf.py) repeatedly and measure the time from process '
+        'start to the first ready /health/ready and the first successful /api/v1/courses/'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--runs', type=int, default=3)
+        parser.add_argument('--port', type=int, default=8123)
+        parser.add_argument('--workers', type=int, default=1)
+        parser.add_argument('--email', default='employee@company.com', help='User the courses request is made as')
+        parser.add_argument('--timeout', type=float, default=60.0, help='Seconds to wait for a run')
+        parser.add_argument('--no-preload', action='store_true', help='Load the app in each worker instead')
+        parser.add_argument('--no-warmup', action='store_true', help='Skip the start-up warm-up')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(email=options['email'])
+        except User.DoesNotExist:
+            raise CommandError(f"No user {options['email']}")
+        headers = {'Authorization': f'Bearer {create_access_token(user)}'}
+
+        env = {
+            **os.environ,
+            'PORT': str(options['port']),
+            'WEB_CONCURRENCY': str(options['workers']),
+            'GUNICORN_PRELOAD': '0' if options['no_preload'] else '1',
+            'STARTUP_WARMUP': '0' if options['no_warmup'] else '1',
+        }
+        base_url = f"http://127.0.0.1:{options['port']}/api/v1"
+
+        results = []
+        for run in range(1, options['runs'] + 1):
+            # Without warm-up /health/ready would itself warm the process up, so it is not polled
+            result = self.measure(env, base_url, headers, options['timeout'], check_ready=not options['no_warmup'])
+            results.append(result)
+            self.stdout.write(
+                f"run {run}: ready {self.ms(result['ready'])}, first courses 200 {self.ms(result['first_ok'])} "
+                f"(that request {self.ms(result['first_request'])}, next {self.ms(result['next_request'])})"
+            )
+
+        self.stdout.write('')
+        for key, label in [
+            ('ready', 'time to ready'),
+            ('first_ok', 'time to first /courses/ 200'),
+            ('first_request', 'first /courses/ request'),
+            ('next_request', 'second /courses/ request'),
+        ]:
+            values = [r[key] for r in results if r[key] is not None]
+            median = statistics.median(values) if values else None
+            self.stdout.write(f'{label:<30}{self.ms(median):>12}')
+
+    def measure(self, env, base_url, headers, timeout, check_ready):
+        """Start gunicorn once; times are in ms since the process was spawned"""
+        result = {'ready': None, 'first_ok': None, 'first_request': None, 'next_request': None}
+        started = time.perf_counter()
+        process = subprocess.Popen(
+            ['gunicorn', '-c', 'gunicorn.conf.py', 'config.wsgi:application'],
+            cwd=settings.BASE_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            deadline = started + timeout
+            while time.perf_counter() < deadline:
+                if process.poll() is not None:
+                    raise CommandError(f'gunicorn exited with code {process.returncode}')
+                if check_ready and result['ready'] is None:
+                    status_code, _, _, _ = timed_request(f'{base_url}/health/ready', timeout=5)
+                    if status_code == 200:
+                        result['ready'] = (time.perf_counter() - started) * 1000
+                status_code, elapsed, _, _ = timed_request(f'{base_url}/courses/', headers=headers, timeout=5)
+                if status_code == 200:
+                    result['first_ok'] = (time.perf_counter() - started) * 1000
+                    result['first_request'] = elapsed
+                    _, result['next_request'], _, _ = timed_request(f'{base_url}/courses/', headers=headers)
+                    break
+                time.sleep(0.05)
+            else:
+                self.stderr.write(f'No successful response within {timeout:.0f}s')
+        finally:
+            process.send_signal(signal.SIGTERM)
+            try:
+                process.wait(timeout=30)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+        return result
+
+    def ms(self, value):
+        return f'{value:.0f} ms' if value is not None else '-'
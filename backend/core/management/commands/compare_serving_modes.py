@@ -0,0 +1,54 @@
+from django.core.management.base import BaseCommand, CommandError
+from core.benchmarking import obtain_token, hammer, summarize
+
+
+ENDPOINTS = [
+    ('health', '/api/v1/health/db'),
+    ('courses', '/api/v1/courses/'),
+    ('assignments/mine', '/api/v1/assignments/mine/'),
+    ('notifications', '/api/v1/notifications/'),
+]
+
+
+class Command(BaseCommand):
+    help = 'Load-compare the WSGI (gunicorn sync) and ASGI (uvicorn) deployments on the async read endpoints'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--wsgi-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--asgi-url', default='http://127.0.0.1:8001')
+        parser.add_argument('--email', default='employee@company.com')
+        parser.add_argument('--password', default='employee123')
+        parser.add_argument('--requests', type=int, default=500, help='Requests per endpoint per mode')
+        parser.add_argument('--concurrency', type=int, default=50)
+
+    def handle(self, *args, **options):
+        modes = [('wsgi', options['wsgi_url'].rstrip('/')), ('asgi', options['asgi_url'].rstrip('/'))]
+        results = {}
+
+        for mode, base_url in modes:
+            try:
+                token = obtain_token(base_url, options['email'], options['password'])
+            except RuntimeError as e:
+                raise CommandError(str(e))
+            headers = {'Authorization': f'Bearer {token}'}
+
+            for label, path in ENDPOINTS:
+                samples, duration = hammer(
+                    f'{base_url}{path}', options['requests'], options['concurrency'], headers=headers
+                )
+                results[(mode, label)] = summarize(samples, duration)
+
+        self.stdout.write(
+            f"{'endpoint':<20}{'mode':<6}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'errors':>8}"
+        )
+        for label, _ in ENDPOINTS:
+            for mode, _ in modes:
+                r = results[(mode, label)]
+                self.stdout.write(
+                    f"{label:<20}{mode:<6}{r['throughput']:>10.1f}{r['p50']:>10.1f}"
+                    f"{r['p95']:>10.1f}{r['p99']:>10.1f}{r['errors']:>8}"
+                )
+            wsgi, asgi = results[('wsgi', label)], results[('asgi', label)]
+            if wsgi['throughput']:
+                gain = (asgi['throughput'] / wsgi['throughput'] - 1) * 100
+                self.stdout.write(self.style.SUCCESS(f'  ASGI throughput change: {gain:+.1f}%'))
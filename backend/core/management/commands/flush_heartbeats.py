@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from core import heartbeats
+
+
+class Command(BaseCommand):
+    help = 'Merge buffered video heartbeats into assignments now (the worker does this periodically)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=heartbeats.FLUSH_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        result = heartbeats.flush(batch_size=options['batch_size'])
+        self.stdout.write(
+            f"Merged heartbeats into {result['assignments']} assignments "
+            f"(oldest was {result['lag_seconds']:.1f}s old)"
+        )
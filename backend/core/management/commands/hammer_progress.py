@@ -0,0 +1,82 @@
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from core import counters
+from core.models import Assignment, ProgressEvent
+from core.progress import apply_progress
+
+
+class Command(BaseCommand):
+    help = (
+        'Send many concurrent progress reports for one assignment and check that none '
+        'was lost: progress ends at the highest value reported, never went backwards, '
+        'every report wrote one event and the stored counters still match. '
+        'Writes real progress to the assignment, so point it at a scratch one.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('assignment_id', type=int)
+        parser.add_argument('--threads', type=int, default=16)
+        parser.add_argument('--reports', type=int, default=50, help='Reports per thread')
+
+    def handle(self, *args, **options):
+        try:
+            assignment = Assignment.objects.get(id=options['assignment_id'])
+        except Assignment.DoesNotExist:
+            raise CommandError('Assignment not found')
+
+        initial_pct, initial_status = assignment.progress_pct, assignment.status
+        events_before = ProgressEvent.objects.filter(assignment=assignment).count()
+        lock = threading.Lock()
+        sent, regressions = [], []
+
+        def worker(_):
+            seen = initial_pct
+            try:
+                for _ in range(options['reports']):
+                    pct = random.randint(0, 100)
+                    result = apply_progress(assignment.id, pct)
+                    with lock:
+                        sent.append(pct)
+                        if result['progress_pct'] < seen:
+                            regressions.append((seen, result['progress_pct']))
+                    seen = result['progress_pct']
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(options['threads']) as pool:
+            list(pool.map(worker, range(options['threads'])))
+
+        assignment.refresh_from_db()
+        expected_pct = max(initial_pct, *sent)
+        if expected_pct >= 100:
+            expected_status = 'completed'
+        elif expected_pct > 0 and initial_status == 'not_started':
+            expected_status = 'in_progress'
+        else:
+            expected_status = initial_status
+        events = ProgressEvent.objects.filter(assignment=assignment).count() - events_before
+        drift = (
+            counters.find_drift('courses', [assignment.course_id])
+            + counters.find_drift('learners', [assignment.user_id])
+        )
+
+        checks = [
+            ('final progress', assignment.progress_pct, expected_pct),
+            ('status', assignment.status, expected_status),
+            ('events written', events, len(sent)),
+            ('progress regressions', len(regressions), 0),
+            ('counter rows drifted', len(drift), 0),
+        ]
+        failed = False
+        for label, actual, expected in checks:
+            ok = actual == expected
+            failed = failed or not ok
+            style = self.style.SUCCESS if ok else self.style.ERROR
+            self.stdout.write(style(f'{label:<24}{actual!s:>12}  (expected {expected})'))
+
+        if failed:
+            raise CommandError('Concurrent progress updates were lost or applied out of order')
+        self.stdout.write(self.style.SUCCESS(f'{len(sent)} reports from {options["threads"]} threads applied correctly'))
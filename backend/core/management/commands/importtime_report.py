@@ -0,0 +1,71 @@
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        'Import the WSGI application in a fresh interpreter under `python -X importtime` '
+        'and report where start-up import time goes'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--module', default='config.wsgi', help='Module to import (default config.wsgi)')
+        parser.add_argument('--top', type=int, default=20, help='Rows per table')
+
+    def handle(self, *args, **options):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get('DJANGO_SETTINGS_MODULE', 'config.settings')}
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f"import {options['module']}"],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True,
+        )
+        wall_ms = (time.perf_counter() - started) * 1000
+        if result.returncode != 0:
+            raise CommandError(f"Importing {options['module']} failed:\n{result.stderr[-2000:]}")
+
+        modules = self.parse(result.stderr)
+        if not modules:
+            raise CommandError('No import timings found in the output')
+
+        total_self = sum(self_us for _, self_us, _ in modules)
+        self.stdout.write(
+            f"{options['module']}: {len(modules)} modules, {total_self / 1000:.0f} ms importing, "
+            f"{wall_ms:.0f} ms wall time for the interpreter"
+        )
+
+        by_package = defaultdict(int)
+        for name, self_us, _ in modules:
+            by_package[name.split('.')[0]] += self_us
+        self.table('Self time by top-level package', sorted(by_package.items(), key=lambda item: -item[1]), options['top'])
+        self.table(
+            'Slowest modules (cumulative)',
+            sorted(((name, cumulative) for name, _, cumulative in modules), key=lambda item: -item[1]),
+            options['top'],
+        )
+        self.table(
+            'Slowest modules (self)',
+            sorted(((name, self_us) for name, self_us, _ in modules), key=lambda item: -item[1]),
+            options['top'],
+        )
+
+    def parse(self, output):
+        """[(module, self_us, cumulative_us)] from `-X importtime` output"""
+        modules = []
+        for line in output.splitlines():
+            if not line.startswith('import time:'):
+                continue
+            parts = line[len('import time:'):].split('|')
+            if len(parts) != 3 or not parts[0].strip().isdigit():
+                continue
+            modules.append((parts[2].strip(), int(parts[0]), int(parts[1])))
+        return modules
+
+    def table(self, title, rows, top):
+        self.stdout.write(f'\n{title}')
+        for name, micros in rows[:top]:
+            self.stdout.write(f'{micros / 1000:>10.1f} ms  {name}')
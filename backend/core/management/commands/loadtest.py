@@ -0,0 +1,308 @@
+import json
+import random
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand, CommandError
+from core.benchmarking import summarize, timed_request
+from core.management.commands.seed_loadtest import DOMAIN
+from core.models import User
+
+
+ROLES = {'employee': 'EMPLOYEE', 'manager': 'MANAGER'}
+
+
+class VirtualUser:
+    """One simulated person: logs in once, then repeats weighted actions with think time"""
+
+    # (weight, action); see the methods below
+    ACTIONS = {
+        'employee': [
+            (3, 'mine'), (2, 'bootstrap'), (2, 'courses'), (3, 'progress'),
+            (1, 'start'), (4, 'heartbeat'), (0.2, 'refresh'),
+        ],
+        'manager': [
+            (2, 'bootstrap'), (3, 'team_assignments'), (1, 'team_members'), (2, 'leaderboard'),
+            (1, 'employees'), (1, 'courses'), (0.2, 'refresh'),
+        ],
+    }
+
+    def __init__(self, base_url, role, email, password, ip, record):
+        self.base_url = base_url
+        self.role = role
+        self.email = email
+        self.password = password
+        self.headers = {'X-Forwarded-For': ip}
+        self.record = record
+        self.access = None
+        self.refresh_token = None
+        self.assignments = {}
+        weights, names = zip(*[(weight, name) for weight, name in self.ACTIONS[role]])
+        self.weights, self.names = weights, names
+
+    def request(self, endpoint, path, method='GET', data=None, auth=True):
+        headers = dict(self.headers)
+        if auth:
+            headers['Authorization'] = f'Bearer {self.access}'
+        status_code, elapsed_ms, _, payload = timed_request(
+            f'{self.base_url}/api/v1/{path}', method=method, headers=headers, data=data,
+        )
+        self.record(endpoint, status_code, elapsed_ms)
+        if auth and status_code == 401:
+            # Access token expired: log in again on the next step
+            self.access = None
+        return status_code, payload
+
+    def login(self):
+        status_code, payload = self.request(
+            'POST auth/login', 'auth/login', method='POST',
+            data={'email': self.email, 'password': self.password}, auth=False,
+        )
+        if status_code == 200:
+            tokens = json.loads(payload)
+            self.access, self.refresh_token = tokens['access'], tokens.get('refresh')
+        return status_code == 200
+
+    def step(self):
+        if self.access is None:
+            return self.login()
+        name = random.choices(self.names, weights=self.weights)[0]
+        getattr(self, name)()
+        return True
+
+    def run(self, deadline, think):
+        while time.monotonic() < deadline:
+            if not self.step():
+                time.sleep(1)
+                continue
+            if think > 0:
+                time.sleep(min(random.expovariate(1 / think), max(deadline - time.monotonic(), 0)))
+
+    # Employee actions
+
+    def mine(self):
+        status_code, payload = self.request('GET assignments/mine', 'assignments/mine/')
+        if status_code == 200:
+            self.assignments = {
+                item['id']: item for item in json.loads(payload)
+            }
+
+    def pick(self, statuses):
+        candidates = [item for item in self.assignments.values() if item['status'] in statuses]
+        return random.choice(candidates) if candidates else None
+
+    def progress(self):
+        assignment = self.pick(('in_progress',))
+        if assignment is None:
+            return self.mine() if not self.assignments else self.start()
+        pct = min(100, assignment['progress_pct'] + random.randint(5, 20))
+        self.update(assignment, {'progress_pct': pct})
+
+    def start(self):
+        assignment = self.pick(('not_started',))
+        if assignment is None:
+            return self.mine()
+        self.update(assignment, {'status': 'in_progress'})
+
+    def update(self, assignment, data):
+        status_code, payload = self.request(
+            'PATCH assignments/{id}/progress', f"assignments/{assignment['id']}/progress/", method='PATCH', data=data,
+        )
+        if status_code == 200:
+            self.assignments[assignment['id']] = json.loads(payload)
+
+    def heartbeat(self):
+        assignment = self.pick(('in_progress',))
+        if assignment is None:
+            return self.start()
+        assignment['position_seconds'] = (assignment.get('position_seconds') or 0) + 15
+        self.request(
+            'POST assignments/{id}/heartbeat', f"assignments/{assignment['id']}/heartbeat/", method='POST',
+            data={'position_seconds': assignment['position_seconds'], 'watched_seconds': 15},
+        )
+
+    def bootstrap(self):
+        self.request('GET me/bootstrap', 'me/bootstrap')
+
+    def courses(self):
+        self.request('GET courses', 'courses/')
+
+    def refresh(self):
+        if not self.refresh_token:
+            return self.login()
+        status_code, payload = self.request(
+            'POST auth/refresh', 'auth/refresh', method='POST', data={'refresh': self.refresh_token}, auth=False,
+        )
+        if status_code == 200:
+            self.access = json.loads(payload)['access']
+
+    # Manager actions
+
+    def team_assignments(self):
+        self.request('GET assignments/team', 'assignments/team/')
+
+    def team_members(self):
+        self.request('GET teams/members', 'teams/members/')
+
+    def leaderboard(self):
+        self.request('GET leaderboard', 'leaderboard')
+
+    def employees(self):
+        self.request('GET employees', 'employees/')
+
+
+class Command(BaseCommand):
+    help = (
+        'Replay a role mix of concurrent virtual users (employees browsing, starting courses and '
+        'sending progress and heartbeats; managers opening team views) against a running instance, '
+        'ramping through load stages. Reports throughput, error rate and latency percentiles per '
+        'stage and endpoint, and the stage where the instance saturates. Uses the accounts made by '
+        'seed_loadtest; users are told apart by X-Forwarded-For, so run it against an instance with '
+        'NUM_PROXIES=1 and nothing in front of it. Writes real progress.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000')
+        parser.add_argument('--password', default='loadtest123')
+        parser.add_argument('--mix', default='employee=9,manager=1', help='Relative share of each role')
+        parser.add_argument(
+            '--stages', default='20:30,50:30,100:30,200:30',
+            help='Comma-separated users:seconds; users carry over (and stay logged in) between stages',
+        )
+        parser.add_argument('--think', type=float, default=1.0, help='Mean think time between actions in seconds')
+
+    def handle(self, *args, **options):
+        mix = self.parse_mix(options['mix'])
+        stages = self.parse_stages(options['stages'])
+        base_url = options['url'].rstrip('/')
+
+        accounts = {}
+        for role in mix:
+            accounts[role] = list(
+                User.objects.filter(role=ROLES[role], is_active=True, email__endswith=f'@{DOMAIN}')
+                .order_by('id').values_list('email', flat=True)
+            )
+            if not accounts[role]:
+                raise CommandError(f'No {role} load-test accounts; run seed_loadtest first')
+
+        lock = threading.Lock()
+        samples = []
+
+        def record(endpoint, status_code, elapsed_ms):
+            with lock:
+                samples.append((endpoint, status_code, elapsed_ms))
+
+        # Roles are spread evenly through the pool, so every stage has the same mix
+        total = sum(mix.values())
+        used = defaultdict(int)
+        users = []
+        for index in range(max(count for count, _ in stages)):
+            role = max(mix, key=lambda name: mix[name] * (index + 1) / total - used[name])
+            email = accounts[role][used[role] % len(accounts[role])]
+            used[role] += 1
+            ip = f'10.20.{index // 250}.{index % 250 + 1}'
+            users.append(VirtualUser(base_url, role, email, options['password'], ip, record))
+
+        results = []
+        for count, seconds in stages:
+            self.stdout.write(f'Stage: {count} users for {seconds}s ...')
+            samples.clear()
+            started = time.monotonic()
+            deadline = started + seconds
+            with ThreadPoolExecutor(max_workers=count) as pool:
+                futures = [pool.submit(user.run, deadline, options['think']) for user in users[:count]]
+            duration = time.monotonic() - started
+            failures = [future.exception() for future in futures if future.exception()]
+            if failures:
+                self.stdout.write(self.style.WARNING(f'{len(failures)} users stopped early: {failures[0]!r}'))
+            with lock:
+                stage_samples = list(samples)
+            results.append((count, stage_samples, duration))
+
+        self.report(results)
+
+    def parse_mix(self, value):
+        mix = {}
+        try:
+            for part in value.split(','):
+                role, weight = part.split('=')
+                mix[role.strip()] = float(weight)
+        except ValueError:
+            raise CommandError('--mix must look like employee=9,manager=1')
+        unknown = set(mix) - set(ROLES)
+        if unknown:
+            raise CommandError(f"Unknown role(s) in --mix: {', '.join(sorted(unknown))}")
+        mix = {role: weight for role, weight in mix.items() if weight > 0}
+        if not mix:
+            raise CommandError('--mix needs at least one role with a positive weight')
+        return mix
+
+    def parse_stages(self, value):
+        try:
+            stages = [tuple(int(number) for number in part.split(':')) for part in value.split(',')]
+            if any(len(stage) != 2 or min(stage) < 1 for stage in stages):
+                raise ValueError()
+        except ValueError:
+            raise CommandError('--stages must look like 20:30,50:30 (users:seconds, both positive)')
+        return stages
+
+    def report(self, results):
+        header = f"{'':<34}{'req/s':>9}{'errors':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+        summaries = []
+        for count, stage_samples, duration in results:
+            overall = summarize([(status_code, ms) for _, status_code, ms in stage_samples], duration)
+            summaries.append((count, overall))
+
+            by_endpoint = defaultdict(list)
+            for endpoint, status_code, ms in stage_samples:
+                by_endpoint[endpoint].append((status_code, ms))
+
+            self.stdout.write(f'\n{count} users ({duration:.0f}s)')
+            self.stdout.write(header)
+            rows = [('all', overall)] + [
+                (endpoint, summarize(endpoint_samples, duration))
+                for endpoint, endpoint_samples in sorted(by_endpoint.items())
+            ]
+            for label, r in rows:
+                if not r['requests']:
+                    continue
+                self.stdout.write(
+                    f"{label:<34}{r['throughput']:>9.1f}{r['error_rate']:>9.1%}"
+                    f"{r['p50']:>9.1f}{r['p95']:>9.1f}{r['p99']:>9.1f}"
+                )
+
+        self.stdout.write('\nRamp')
+        self.stdout.write(f"{'users':>7}{'req/s':>9}{'errors':>9}{'p95 ms':>9}  verdict")
+        baseline_p95 = summaries[0][1]['p95']
+        best, saturated_at = None, None
+        previous = None
+        for count, r in summaries:
+            reasons = []
+            if r['error_rate'] > 0.01:
+                reasons.append('errors > 1%')
+            if baseline_p95 and r['p95'] and r['p95'] > 3 * baseline_p95:
+                reasons.append('p95 > 3x first stage')
+            if previous and count > previous[0]:
+                # Below a quarter of the throughput the extra users should have brought
+                expected_gain = previous[1]['throughput'] * (count / previous[0] - 1)
+                if r['throughput'] - previous[1]['throughput'] < 0.25 * expected_gain:
+                    reasons.append('throughput flat')
+            if reasons and saturated_at is None:
+                saturated_at = count
+            if not reasons and saturated_at is None:
+                best = (count, r)
+            p95 = f"{r['p95']:>9.1f}" if r['p95'] is not None else f"{'-':>9}"
+            self.stdout.write(
+                f"{count:>7}{r['throughput']:>9.1f}{r['error_rate']:>9.1%}{p95}  {', '.join(reasons) or 'ok'}"
+            )
+            previous = (count, r)
+
+        if best:
+            self.stdout.write(self.style.SUCCESS(
+                f"\nSustained: {best[0]} users at {best[1]['throughput']:.1f} req/s, p95 {best[1]['p95']:.1f} ms"
+            ))
+        if saturated_at:
+            self.stdout.write(self.style.WARNING(f'Saturation reached at {saturated_at} users'))
+        else:
+            self.stdout.write('No saturation within these stages; add larger ones')
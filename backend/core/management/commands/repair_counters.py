@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from core import counters
+
+
+KINDS = ['courses', 'learners', 'teams']
+
+
+class Command(BaseCommand):
+    help = 'Recompute stored course, learner and team counters from the source tables and report drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Only report drifted rows')
+        parser.add_argument('--kind', choices=KINDS, action='append', help='Limit to one kind (repeatable)')
+        parser.add_argument('--show', type=int, default=20, help='Drifted rows to print per kind')
+
+    def handle(self, *args, **options):
+        for kind in options['kind'] or KINDS:
+            drift = counters.find_drift(kind)
+            if not drift:
+                self.stdout.write(self.style.SUCCESS(f'{kind}: no drift'))
+                continue
+
+            self.stdout.write(self.style.WARNING(f'{kind}: {len(drift)} row(s) drifted'))
+            for row in drift[:options['show']]:
+                values = len(row) // 2
+                stored, expected = row[1:1 + values], row[1 + values:]
+                self.stdout.write(f'  id={row[0]} stored={stored} expected={expected}')
+
+            if not options['dry_run']:
+                repaired = counters.repair(kind)
+                self.stdout.write(self.style.SUCCESS(f'{kind}: repaired {len(repaired)} row(s)'))
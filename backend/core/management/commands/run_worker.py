@@ -0,0 +1,75 @@
+import os
+import signal
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from core import jobs
+
+
+class Command(BaseCommand):
+    help = 'Run background jobs from the Postgres job queue'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queues', default='default', help='Comma-separated queue names')
+        parser.add_argument('--concurrency', type=int, default=4, help='Jobs run in parallel')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds between polls when idle')
+        parser.add_argument('--burst', action='store_true', help='Exit once the queues are empty')
+
+    def handle(self, *args, **options):
+        queues = [queue.strip() for queue in options['queues'].split(',') if queue.strip()]
+        concurrency = options['concurrency']
+        worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        stopping = threading.Event()
+        slots = threading.Semaphore(concurrency)
+
+        def stop(signum, frame):
+            self.stdout.write('Stopping after running jobs finish...')
+            stopping.set()
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        def execute(job):
+            close_old_connections()
+            try:
+                ok = jobs.run(job)
+                style = self.style.SUCCESS if ok else self.style.ERROR
+                self.stdout.write(style(f'{job.task} #{job.id}: {"done" if ok else "failed"}'))
+            finally:
+                close_old_connections()
+                slots.release()
+
+        jobs.schedule_all_periodic()
+        self.stdout.write(f'Worker {worker_id} on queues {", ".join(queues)} (concurrency {concurrency})')
+
+        last_stale_check = 0
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='job') as pool:
+            while not stopping.is_set():
+                if time.monotonic() - last_stale_check > 60:
+                    requeued = jobs.requeue_stale()
+                    if requeued:
+                        self.stdout.write(self.style.WARNING(f'Requeued {requeued} stale jobs'))
+                    last_stale_check = time.monotonic()
+
+                # Only claim as many jobs as there are free slots
+                free = 0
+                while free < concurrency and slots.acquire(blocking=False):
+                    free += 1
+                if not free:
+                    slots.acquire()
+                    free = 1
+
+                claimed = jobs.claim(worker_id, queues, free)
+                for _ in range(free - len(claimed)):
+                    slots.release()
+                for job in claimed:
+                    pool.submit(execute, job)
+
+                if not claimed:
+                    if options['burst'] and free == concurrency:
+                        break
+                    close_old_connections()
+                    stopping.wait(options['poll_interval'])
@@ -0,0 +1,80 @@
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from core import counters
+from core.cache_utils import bump_versions
+from core.models import User, Team, Course, Assignment
+
+
+DOMAIN = 'loadtest.local'
+
+
+class Command(BaseCommand):
+    help = (
+        f'Create load-test accounts (loadtest-emp-N@{DOMAIN}, loadtest-mgr-N@{DOMAIN}) in their own '
+        'teams, each employee assigned some published courses. Safe to run again; existing accounts are kept.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--employees', type=int, default=1000)
+        parser.add_argument('--managers', type=int, default=50, help='One team per manager')
+        parser.add_argument('--courses-per-user', type=int, default=3)
+        parser.add_argument('--password', default='loadtest123')
+
+    def handle(self, *args, **options):
+        courses = list(Course.objects.filter(status='published').order_by('id')[:options['courses_per_user']])
+        if not courses:
+            raise CommandError('No published courses; run seed_demo first')
+        if options['managers'] < 1:
+            raise CommandError('At least one manager (team) is needed')
+
+        # Hashing is deliberately slow; every account gets the same hash
+        password = make_password(options['password'])
+
+        teams = []
+        for index in range(options['managers']):
+            team, _ = Team.objects.get_or_create(name=f'Load Team {index + 1}', defaults={'description': 'Load test'})
+            teams.append(team)
+
+        User.objects.bulk_create([
+            User(
+                email=f'loadtest-mgr-{index + 1}@{DOMAIN}', password=password, role='MANAGER',
+                first_name='Load', last_name=f'Manager {index + 1}', team=teams[index],
+            )
+            for index in range(options['managers'])
+        ] + [
+            User(
+                email=f'loadtest-emp-{index + 1}@{DOMAIN}', password=password, role='EMPLOYEE',
+                first_name='Load', last_name=f'Employee {index + 1}', team=teams[index % len(teams)],
+            )
+            for index in range(options['employees'])
+        ], batch_size=1000, ignore_conflicts=True)
+
+        for team in teams:
+            manager = User.objects.filter(team=team, role='MANAGER', email__endswith=f'@{DOMAIN}').first()
+            if manager and team.manager_id != manager.id:
+                team.manager = manager
+                team.save(update_fields=['manager'])
+
+        employee_ids = list(
+            User.objects.filter(email__startswith='loadtest-emp-', email__endswith=f'@{DOMAIN}').values_list('id', flat=True)
+        )
+        Assignment.objects.bulk_create([
+            Assignment(user_id=user_id, course=course, status='not_started', progress_pct=0)
+            for user_id in employee_ids
+            for course in courses
+        ], batch_size=1000, ignore_conflicts=True)
+
+        # bulk_create skipped the signal handlers
+        counters.repair('teams', [team.id for team in teams])
+        counters.recompute(course_ids=[course.id for course in courses], user_ids=employee_ids)
+        bump_versions(
+            'courses',
+            *[f'team:{team.id}' for team in teams],
+            *[f'assignments:team:{team.id}' for team in teams],
+            *[f'assignments:user:{user_id}' for user_id in employee_ids],
+        )
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(employee_ids)} employees and {len(teams)} managers/teams ready, '
+            f'password "{options["password"]}"'
+        ))
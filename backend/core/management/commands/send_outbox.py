@@ -0,0 +1,34 @@
+import signal
+import time
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from core import outbox
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued emails from the outbox over a reused SMTP connection'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=50)
+        parser.add_argument('--rate', type=float, default=None, help='Messages per second (default EMAIL_RATE_LIMIT)')
+        parser.add_argument('--poll-interval', type=float, default=5.0, help='Seconds between polls when idle')
+        parser.add_argument('--once', action='store_true', help='Send what is due and exit')
+
+    def handle(self, *args, **options):
+        stopping = False
+
+        def stop(signum, frame):
+            nonlocal stopping
+            stopping = True
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        while not stopping:
+            close_old_connections()
+            sent, failed = outbox.drain(batch_size=options['batch_size'], rate=options['rate'])
+            if sent or failed:
+                self.stdout.write(f'Sent {sent}, failed {failed}')
+            if options['once']:
+                break
+            time.sleep(options['poll_interval'])
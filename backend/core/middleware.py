@@ -0,0 +1,205 @@
+import gzip
+import random
+import re
+from types import SimpleNamespace
+import brotli
+from django.conf import settings
+from django.utils.cache import patch_vary_headers
+from whitenoise.middleware import WhiteNoiseMiddleware
+from rest_framework.exceptions import AuthenticationFailed
+from . import profiling, slow_queries
+from .authentication import JWTAuthentication
+from .db_routing import replica_configured, replica_reads
+from .permissions import IsAdmin
+
+
+class SPAStaticFilesMiddleware(WhiteNoiseMiddleware):
+    """
+    WhiteNoise, plus far-future immutable caching for the Vite bundle.
+
+    WhiteNoise only recognises names hashed by the manifest storage. Vite
+    already fingerprints everything it emits under assets/ (index-<hash>.js),
+    and index.html references those names, so they are immutable as well.
+    """
+
+    def __init__(self, get_response=None, settings=settings):
+        super().__init__(get_response, settings=settings)
+        self.vite_asset_pattern = re.compile(
+            r'^' + re.escape(settings.STATIC_URL) + r'frontend/assets/.+-[A-Za-z0-9_-]{8}\.[A-Za-z0-9]+$'
+        )
+
+    def immutable_file_test(self, path, url):
+        if super().immutable_file_test(path, url):
+            return True
+        return bool(self.vite_asset_pattern.match(url))
+
+
+class APICompressionMiddleware:
+    """
+    Compress /api/ responses larger than API_COMPRESSION_MIN_BYTES.
+
+    Brotli is preferred when the client accepts it, then gzip. Levels are kept
+    moderate because API payloads are compressed on every request, unlike the
+    static bundle which is precompressed at collectstatic time.
+    """
+    accepts_brotli = re.compile(r'\bbr\b')
+    accepts_gzip = re.compile(r'\bgzip\b')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.min_bytes = getattr(settings, 'API_COMPRESSION_MIN_BYTES', 1024)
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        if not request.path.startswith('/api/'):
+            return response
+        if response.streaming or response.has_header('Content-Encoding'):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+
+        if len(response.content) < self.min_bytes:
+            return response
+
+        accept_encoding = request.META.get('HTTP_ACCEPT_ENCODING', '')
+        if self.accepts_brotli.search(accept_encoding):
+            encoding, compressed = 'br', brotli.compress(response.content, quality=5)
+        elif self.accepts_gzip.search(accept_encoding):
+            encoding, compressed = 'gzip', gzip.compress(response.content, compresslevel=6)
+        else:
+            return response
+
+        if len(compressed) >= len(response.content):
+            return response
+
+        response.content = compressed
+        response['Content-Length'] = str(len(compressed))
+        response['Content-Encoding'] = encoding
+
+        # The body is no longer byte-identical to the uncompressed one
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response['ETag'] = 'W/' + etag
+
+        return response
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Serve safe GETs under REPLICA_READ_PATHS from the read replica.
+
+    A successful write (any other method) sets a short-lived cookie; while it
+    is present the client's reads stay on the primary, so they always see
+    their own writes despite replication lag. Endpoints under
+    REPLICA_PIN_EXEMPT_PATHS accept writes without touching the database and
+    leave the client where it was.
+    """
+    cookie_name = 'pin_primary'
+    safe_methods = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.read_paths = tuple(settings.REPLICA_READ_PATHS)
+        self.pin_exempt_paths = [re.compile(pattern) for pattern in settings.REPLICA_PIN_EXEMPT_PATHS]
+        self.pin_seconds = settings.READ_YOUR_WRITES_SECONDS
+
+    def __call__(self, request):
+        if not replica_configured():
+            return self.get_response(request)
+
+        if request.method not in self.safe_methods:
+            response = self.get_response(request)
+            if response.status_code < 400 and not self.is_pin_exempt(request.path):
+                response.set_cookie(
+                    self.cookie_name, '1', max_age=self.pin_seconds, httponly=True, samesite='Lax'
+                )
+            return response
+
+        if self.cookie_name in request.COOKIES or not request.path.startswith(self.read_paths):
+            return self.get_response(request)
+
+        with replica_reads():
+            return self.get_response(request)
+
+    def is_pin_exempt(self, path):
+        return any(pattern.match(path) for pattern in self.pin_exempt_paths)
+
+
+class RequestProfilerMiddleware:
+    """
+    Profile API requests on demand (see core.profiling).
+
+    An admin asks for a profile with the X-Profile: 1 header or ?_profile=1;
+    the JWT is checked against IsAdmin here, and anyone else's flag is ignored.
+    Independently, PROFILE_SAMPLE_RATE of all API requests are profiled.
+    The response carries the stored profile's id in X-Profile-Id.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.sample_rate = settings.PROFILE_SAMPLE_RATE
+
+    def __call__(self, request):
+        if not request.path.startswith('/api/'):
+            return self.get_response(request)
+
+        trigger, user = None, None
+        if request.headers.get('X-Profile') == '1' or request.GET.get('_profile') == '1':
+            user = self.admin_user(request)
+            trigger = 'admin' if user else None
+        if trigger is None and self.sample_rate and random.random() < self.sample_rate:
+            trigger = 'sampled'
+        if trigger is None:
+            return self.get_response(request)
+
+        with profiling.RequestProfile() as profile:
+            response = self.get_response(request)
+
+        profile_id = profiling.new_profile_id()
+        profiling.save(profile_id, {
+            'id': profile_id,
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'trigger': trigger,
+            'user_id': user.id if user else None,
+            **profile.to_dict(),
+        })
+        response['X-Profile-Id'] = profile_id
+        return response
+
+    def admin_user(self, request):
+        try:
+            authenticated = JWTAuthentication().authenticate(request)
+        except AuthenticationFailed:
+            return None
+        user = authenticated[0] if authenticated else None
+        if user is None or not IsAdmin().has_permission(SimpleNamespace(user=user), None):
+            return None
+        return user
+
+
+class QuerySourceMiddleware:
+    """
+    Attribute the queries of a request to its view (ViewSet.action or view
+    function) for the slow query log.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        with slow_queries.source('request'):
+            return self.get_response(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'cls', None)
+        if view_class is None:
+            name = f'{view_func.__module__}.{view_func.__qualname__}'
+        else:
+            name = f'{view_class.__module__}.{view_class.__name__}'
+            actions = getattr(view_func, 'actions', None) or {}
+            if request.method.lower() in actions:
+                name += f'.{actions[request.method.lower()]}'
+        slow_queries.set_source(name)
@@ -0,0 +1,27 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_user_job_title'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='approval',
+            name='claimed_by',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='approvals_claimed', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddField(
+            model_name='approval',
+            name='claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='approval',
+            index=models.Index(condition=models.Q(('status', 'pending')), fields=['requested_at', 'id'], name='approvals_pending_queue_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_outboundemail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ThrottleBucket',
+            fields=[
+                ('key', models.CharField(max_length=150, primary_key=True, serialize=False)),
+                ('tokens', models.FloatField()),
+                ('allowed', models.BooleanField(default=True)),
+                ('updated_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'throttle_buckets',
+            },
+        ),
+        # Hot, disposable rows: skip the WAL
+        migrations.RunSQL(
+            'ALTER TABLE throttle_buckets SET UNLOGGED',
+            reverse_sql='ALTER TABLE throttle_buckets SET LOGGED',
+        ),
+    ]
@@ -0,0 +1,24 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_throttlebucket'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='team',
+            name='member_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunSQL(
+            '''
+            UPDATE teams SET member_count = counts.members
+            FROM (SELECT team_id, count(*) AS members FROM users WHERE team_id IS NOT NULL GROUP BY team_id) AS counts
+            WHERE teams.id = counts.team_id
+            ''',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
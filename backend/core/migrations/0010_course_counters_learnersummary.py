@@ -0,0 +1,70 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_team_member_count'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='enrolled_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='completed_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='course',
+            name='progress_sum',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.CreateModel(
+            name='LearnerSummary',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='learning_summary', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('assigned_count', models.IntegerField(default=0)),
+                ('in_progress_count', models.IntegerField(default=0)),
+                ('completed_count', models.IntegerField(default=0)),
+                ('progress_sum', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'db_table': 'learner_summaries',
+            },
+        ),
+        migrations.RunSQL(
+            '''
+            UPDATE courses SET
+                enrolled_count = counts.enrolled,
+                completed_count = counts.completed,
+                progress_sum = counts.progress
+            FROM (
+                SELECT course_id, count(*) AS enrolled,
+                       count(*) FILTER (WHERE status = 'completed') AS completed,
+                       sum(progress_pct) AS progress
+                FROM assignments GROUP BY course_id
+            ) AS counts
+            WHERE courses.id = counts.course_id
+            ''',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.RunSQL(
+            '''
+            INSERT INTO learner_summaries (user_id, assigned_count, in_progress_count, completed_count, progress_sum)
+            SELECT users.id,
+                   count(assignments.id),
+                   count(assignments.id) FILTER (WHERE assignments.status = 'in_progress'),
+                   count(assignments.id) FILTER (WHERE assignments.status = 'completed'),
+                   COALESCE(sum(assignments.progress_pct), 0)
+            FROM users LEFT JOIN assignments ON assignments.user_id = users.id
+            GROUP BY users.id
+            ''',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,39 @@
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_course_counters_learnersummary'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='progressevent',
+            index=models.Index(fields=['created_at'], name='progress_events_created_idx'),
+        ),
+        migrations.CreateModel(
+            name='LeaderboardEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(max_length=30)),
+                ('period', models.CharField(choices=[('7d', 'Last 7 days'), ('30d', 'Last 30 days'), ('all', 'All time')], max_length=10)),
+                ('completions', models.IntegerField()),
+                ('activity', models.IntegerField()),
+                ('rank', models.IntegerField()),
+                ('computed_at', models.DateTimeField()),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='leaderboard_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'db_table': 'leaderboard_entries',
+                'indexes': [
+                    models.Index(fields=['scope', 'period', 'rank'], name='leaderboard_top_idx'),
+                ],
+                'constraints': [
+                    models.UniqueConstraint(fields=('scope', 'period', 'user'), name='leaderboard_unique_user'),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,25 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_leaderboards'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assignment',
+            name='due_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='assignment',
+            name='reminder_stage',
+            field=models.SmallIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='assignment',
+            index=models.Index(condition=models.Q(('due_at__isnull', False), models.Q(('status', 'completed'), _negated=True), ('reminder_stage__lt', 2)), fields=['due_at'], name='assignments_due_scan_idx'),
+        ),
+    ]
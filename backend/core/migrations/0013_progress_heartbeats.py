@@ -0,0 +1,42 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0012_assignment_due_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='assignment',
+            name='position_seconds',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='assignment',
+            name='watch_seconds',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.CreateModel(
+            name='ProgressHeartbeat',
+            fields=[
+                ('assignment', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='core.assignment')),
+                ('progress_pct', models.IntegerField(null=True)),
+                ('position_seconds', models.IntegerField()),
+                ('watch_seconds', models.IntegerField()),
+                ('beats', models.IntegerField()),
+                ('first_beat_at', models.DateTimeField()),
+                ('last_beat_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'progress_heartbeats',
+            },
+        ),
+        # Write-behind buffer: skip the WAL, a crash only loses unflushed heartbeats
+        migrations.RunSQL(
+            'ALTER TABLE progress_heartbeats SET UNLOGGED',
+            reverse_sql='ALTER TABLE progress_heartbeats SET LOGGED',
+        ),
+    ]
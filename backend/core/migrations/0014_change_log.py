@@ -0,0 +1,91 @@
+from django.db import migrations, models
+
+
+# Columns whose changes clients do not need to resync for (maintained counters)
+TRACKED_TABLES = [
+    ('courses', 'course', '{enrolled_count,completed_count,progress_sum}'),
+    ('assignments', 'assignment', '{reminder_stage}'),
+    ('notifications', 'notification', '{}'),
+]
+
+CREATE_FUNCTION = '''
+    CREATE FUNCTION change_log_record() RETURNS trigger LANGUAGE plpgsql AS $$
+    DECLARE
+        ignored text[] := TG_ARGV[1]::text[];
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            INSERT INTO change_log (entity, object_id, owner_id, deleted, txid, changed_at)
+            SELECT TG_ARGV[0], n.id, (to_jsonb(n) ->> 'user_id')::bigint, false,
+                   pg_current_xact_id()::text::bigint, now()
+            FROM new_rows n;
+        ELSIF TG_OP = 'UPDATE' THEN
+            INSERT INTO change_log (entity, object_id, owner_id, deleted, txid, changed_at)
+            SELECT TG_ARGV[0], n.id, (to_jsonb(n) ->> 'user_id')::bigint, false,
+                   pg_current_xact_id()::text::bigint, now()
+            FROM new_rows n JOIN old_rows o ON o.id = n.id
+            WHERE to_jsonb(n) - ignored IS DISTINCT FROM to_jsonb(o) - ignored;
+        ELSE
+            INSERT INTO change_log (entity, object_id, owner_id, deleted, txid, changed_at)
+            SELECT TG_ARGV[0], o.id, (to_jsonb(o) ->> 'user_id')::bigint, true,
+                   pg_current_xact_id()::text::bigint, now()
+            FROM old_rows o;
+        END IF;
+        RETURN NULL;
+    END;
+    $$
+'''
+
+
+def create_triggers_sql():
+    statements = [CREATE_FUNCTION]
+    for table, entity, ignored in TRACKED_TABLES:
+        args = f"'{entity}', '{ignored}'"
+        statements += [
+            f'CREATE TRIGGER {table}_change_log_insert AFTER INSERT ON {table} '
+            f'REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION change_log_record({args})',
+            f'CREATE TRIGGER {table}_change_log_update AFTER UPDATE ON {table} '
+            f'REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE FUNCTION change_log_record({args})',
+            f'CREATE TRIGGER {table}_change_log_delete AFTER DELETE ON {table} '
+            f'REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE FUNCTION change_log_record({args})',
+        ]
+    return statements
+
+
+def drop_triggers_sql():
+    statements = []
+    for table, _, _ in TRACKED_TABLES:
+        statements += [
+            f'DROP TRIGGER IF EXISTS {table}_change_log_{op} ON {table}'
+            for op in ('insert', 'update', 'delete')
+        ]
+    return statements + ['DROP FUNCTION IF EXISTS change_log_record()']
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0013_progress_heartbeats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('entity', models.CharField(max_length=20)),
+                ('object_id', models.BigIntegerField()),
+                ('owner_id', models.BigIntegerField(null=True)),
+                ('deleted', models.BooleanField(default=False)),
+                ('txid', models.BigIntegerField()),
+                ('changed_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'change_log',
+                'indexes': [
+                    models.Index(fields=['txid'], name='change_log_txid_idx'),
+                    models.Index(fields=['changed_at'], name='change_log_changed_at_idx'),
+                ],
+            },
+        ),
+        migrations.RunSQL(create_triggers_sql(), reverse_sql=drop_triggers_sql()),
+    ]
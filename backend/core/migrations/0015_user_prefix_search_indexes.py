@@ -0,0 +1,25 @@
+import django.db.models.functions.text
+from django.contrib.postgres.indexes import OpClass
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0014_change_log'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(OpClass(django.db.models.functions.text.Upper('email'), name='text_pattern_ops'), name='users_email_upper_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(OpClass(django.db.models.functions.text.Upper('first_name'), name='text_pattern_ops'), name='users_first_upper_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(OpClass(django.db.models.functions.text.Upper('last_name'), name='text_pattern_ops'), name='users_last_upper_idx'),
+        ),
+    ]
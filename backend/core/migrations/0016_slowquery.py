@@ -0,0 +1,31 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0015_user_prefix_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowQuery',
+            fields=[
+                ('fingerprint', models.CharField(max_length=40, primary_key=True, serialize=False)),
+                ('source', models.CharField(blank=True, max_length=200)),
+                ('normalized_sql', models.TextField()),
+                ('example_sql', models.TextField()),
+                ('calls', models.BigIntegerField()),
+                ('total_ms', models.FloatField()),
+                ('max_ms', models.FloatField()),
+                ('plan', models.TextField(blank=True, default='')),
+                ('plan_captured_at', models.DateTimeField(blank=True, null=True)),
+                ('first_seen', models.DateTimeField()),
+                ('last_seen', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'slow_queries',
+                'verbose_name_plural': 'slow queries',
+            },
+        ),
+    ]
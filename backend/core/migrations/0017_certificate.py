@@ -0,0 +1,26 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0016_slowquery'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Certificate',
+            fields=[
+                ('assignment', models.OneToOneField(
+                    on_delete=django.db.models.deletion.CASCADE, primary_key=True,
+                    related_name='certificate', serialize=False, to='core.assignment',
+                )),
+                ('digest', models.CharField(db_index=True, max_length=64)),
+                ('generated_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'certificates',
+            },
+        ),
+    ]
@@ -0,0 +1,27 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0017_certificate'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CourseSimilarity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('computed_at', models.DateTimeField()),
+                ('neighbor_count', models.IntegerField()),
+                ('course_ids', models.BinaryField()),
+                ('neighbors', models.BinaryField()),
+                ('scores', models.BinaryField()),
+                ('popularity', models.BinaryField()),
+            ],
+            options={
+                'db_table': 'course_similarity',
+                'verbose_name_plural': 'course similarity',
+            },
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0018_coursesimilarity'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='changelog',
+            index=models.Index(fields=['owner_id', 'txid'], name='change_log_owner_txid_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='changelog',
+            index=models.Index(condition=models.Q(('entity', 'course')), fields=['txid'], name='change_log_course_txid_idx'),
+        ),
+        migrations.RemoveIndex(
+            model_name='changelog',
+            name='change_log_txid_idx',
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """Blank the bodies (and their live links) of emails already sent or given up on"""
+
+    dependencies = [
+        ('core', '0019_change_log_sync_indexes'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            "UPDATE outbound_emails SET body = '' WHERE status <> 'pending' AND body <> ''",
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
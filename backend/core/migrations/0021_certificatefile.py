@@ -0,0 +1,22 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0020_scrub_outbound_email_bodies'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CertificateFile',
+            fields=[
+                ('digest', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('content', models.BinaryField()),
+                ('created_at', models.DateTimeField()),
+            ],
+            options={
+                'db_table': 'certificate_files',
+            },
+        ),
+    ]
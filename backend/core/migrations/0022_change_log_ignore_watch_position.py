@@ -0,0 +1,26 @@
+from django.db import migrations
+
+
+# Heartbeat flushes rewrite these every HEARTBEAT_FLUSH_SECONDS while a video
+# plays; clients pick them up with the next real change instead of every flush
+def recreate_update_trigger_sql(ignored):
+    return [
+        'DROP TRIGGER IF EXISTS assignments_change_log_update ON assignments',
+        f'CREATE TRIGGER assignments_change_log_update AFTER UPDATE ON assignments '
+        f'REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT '
+        f"EXECUTE FUNCTION change_log_record('assignment', '{ignored}')",
+    ]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0021_certificatefile'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            recreate_update_trigger_sql('{reminder_stage,position_seconds,watch_seconds}'),
+            reverse_sql=recreate_update_trigger_sql('{reminder_stage}'),
+        ),
+    ]
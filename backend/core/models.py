@@ -1,8 +1,27 @@
 from django.db import models
+from django.db.models.functions import Upper
 from django.contrib.auth.models import AbstractBaseUser, BaseUserManager, PermissionsMixin
+from django.contrib.postgres.indexes import OpClass
 from django.utils import timezone
 
 
+class StoredCountersMixin:
+    """
+    For models with counter columns maintained by F() updates: a full save()
+    of an existing row leaves the columns in `counter_fields` alone, so a
+    stale in-memory value never overwrites the stored count.
+    """
+    counter_fields = ()
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and kwargs.get('update_fields') is None:
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.counter_fields
+            ]
+        super().save(*args, **kwargs)
+
+
 class UserManager(BaseUserManager):
     def create_user(self, email, password=None, **extra_fields):
         if not email:
@@ -46,12 +65,38 @@ class User(AbstractBaseUser, PermissionsMixin):
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = ['first_name', 'last_name']
 
+    # Fields shown in the cached user, team and team-assignment payloads; saves
+    # that change none of them (last_login, password) leave those caches alone
+    CACHED_FIELDS = ('email', 'first_name', 'last_name', 'job_title', 'role', 'team_id', 'is_active')
+
     class Meta:
         db_table = 'users'
+        indexes = [
+            # Prefix search (admin '^field' search and autocomplete: UPPER(col) LIKE 'X%')
+            models.Index(OpClass(Upper('email'), name='text_pattern_ops'), name='users_email_upper_idx'),
+            models.Index(OpClass(Upper('first_name'), name='text_pattern_ops'), name='users_first_upper_idx'),
+            models.Index(OpClass(Upper('last_name'), name='text_pattern_ops'), name='users_last_upper_idx'),
+        ]
 
     def __str__(self):
         return self.email
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # Remember the team as loaded, so a save can tell which team the user left
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_team_id = instance.__dict__.get('team_id')
+        # and the name, so a rename can refresh the user's certificates
+        if 'first_name' in instance.__dict__ and 'last_name' in instance.__dict__:
+            instance._loaded_name = (instance.first_name, instance.last_name)
+        # and what the caches show of it, so a save only bumps their versions on a change
+        if all(field in instance.__dict__ for field in cls.CACHED_FIELDS):
+            instance._loaded_cached = instance.cached_values()
+        return instance
+
+    def cached_values(self):
+        return tuple(getattr(self, field) for field in self.CACHED_FIELDS)
+
     def get_full_name(self):
         """Return full name or email local part if name is empty"""
         full_name = f"{self.first_name} {self.last_name}".strip()
@@ -64,10 +109,13 @@ class User(AbstractBaseUser, PermissionsMixin):
         return f"{self.first_name} {self.last_name}".strip()
 
 
-class Team(models.Model):
+class Team(StoredCountersMixin, models.Model):
     name = models.CharField(max_length=255)
     description = models.TextField(blank=True)
     manager = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='managed_teams')
+    # Maintained with F() updates by core.teams and the User signal handler
+    member_count = models.IntegerField(default=0, editable=False)
+    counter_fields = ('member_count',)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -78,7 +126,7 @@ class Team(models.Model):
         return self.name
 
 
-class Course(models.Model):
+class Course(StoredCountersMixin, models.Model):
     STATUS_CHOICES = [
         ('draft', 'Draft'),
         ('published', 'Published'),
@@ -100,6 +148,11 @@ class Course(models.Model):
     level = models.CharField(max_length=20, choices=LEVEL_CHOICES, default='beginner')
     duration = models.CharField(max_length=50, blank=True)
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='created_courses')
+    # Maintained by core.counters; progress_sum / enrolled_count is the average progress
+    enrolled_count = models.IntegerField(default=0, editable=False)
+    completed_count = models.IntegerField(default=0, editable=False)
+    progress_sum = models.BigIntegerField(default=0, editable=False)
+    counter_fields = ('enrolled_count', 'completed_count', 'progress_sum')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -110,6 +163,14 @@ class Course(models.Model):
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # Remember the title as loaded, so a rename can refresh the course's certificates
+        instance = super().from_db(db, field_names, values)
+        if 'title' in instance.__dict__:
+            instance._loaded_title = instance.title
+        return instance
+
 
 class Resource(models.Model):
     RESOURCE_TYPE_CHOICES = [
@@ -126,6 +187,9 @@ class Resource(models.Model):
 
     class Meta:
         db_table = 'resources'
+        indexes = [
+            models.Index(fields=['course', 'created_at'], name='resources_course_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.title} ({self.resource_type})"
@@ -146,14 +210,38 @@ class Assignment(models.Model):
     last_activity_at = models.DateTimeField(null=True, blank=True)
     assigned_at = models.DateTimeField(auto_now_add=True)
     completed_at = models.DateTimeField(null=True, blank=True)
+    due_at = models.DateTimeField(null=True, blank=True)
+    # Video resume point and total watch time, merged in from heartbeats (see core.heartbeats)
+    position_seconds = models.IntegerField(default=0)
+    watch_seconds = models.IntegerField(default=0)
+    # Last reminder sent for the current due_at (see core.reminders); reset when due_at changes
+    reminder_stage = models.SmallIntegerField(default=0)
 
     class Meta:
         db_table = 'assignments'
         unique_together = ['user', 'course']
+        indexes = [
+            # Open assignments that may still need a reminder, by due date
+            models.Index(
+                fields=['due_at'],
+                name='assignments_due_scan_idx',
+                condition=(
+                    models.Q(due_at__isnull=False) & ~models.Q(status='completed') & models.Q(reminder_stage__lt=2)
+                ),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.user.email} - {self.course.title}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # Remember status and progress as loaded, so a save can adjust the counters by the difference
+        instance = super().from_db(db, field_names, values)
+        if 'status' in instance.__dict__ and 'progress_pct' in instance.__dict__:
+            instance._loaded_progress = (instance.status, instance.progress_pct)
+        return instance
+
 
 class ProgressEvent(models.Model):
     assignment = models.ForeignKey(Assignment, on_delete=models.CASCADE, related_name='progress_events')
@@ -163,6 +251,10 @@ class ProgressEvent(models.Model):
     class Meta:
         db_table = 'progress_events'
         ordering = ['-created_at']
+        indexes = [
+            # Time-windowed activity scans (leaderboards)
+            models.Index(fields=['created_at'], name='progress_events_created_idx'),
+        ]
 
     def __str__(self):
         return f"{self.assignment} - {self.progress_pct}%"
@@ -197,10 +289,20 @@ class Approval(models.Model):
     rejection_note = models.TextField(blank=True)
     requested_at = models.DateTimeField(auto_now_add=True)
     reviewed_at = models.DateTimeField(null=True, blank=True)
+    claimed_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='approvals_claimed')
+    claimed_at = models.DateTimeField(null=True, blank=True)
 
     class Meta:
         db_table = 'approvals'
         ordering = ['-requested_at']
+        indexes = [
+            # Review queue: pending work, oldest first
+            models.Index(
+                fields=['requested_at', 'id'],
+                name='approvals_pending_queue_idx',
+                condition=models.Q(status='pending'),
+            ),
+        ]
 
     def __str__(self):
         return f"{self.course.title} - {self.status}"
@@ -232,3 +334,308 @@ class PasswordResetToken(models.Model):
 
     def __str__(self):
         return f"{self.user.email} - {self.token[:20]}..."
+
+
+class Job(models.Model):
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('dead', 'Dead'),
+    ]
+
+    queue = models.CharField(max_length=50, default='default')
+    task = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    priority = models.SmallIntegerField(default=0)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=5)
+    run_at = models.DateTimeField(default=timezone.now)
+    unique_key = models.CharField(max_length=150, blank=True)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    result = models.JSONField(null=True, blank=True)
+    created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='jobs')
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'jobs'
+        ordering = ['-created_at']
+        indexes = [
+            # Claim order: highest priority, then earliest run_at
+            models.Index(
+                fields=['queue', '-priority', 'run_at', 'id'],
+                name='jobs_ready_idx',
+                condition=models.Q(status='queued'),
+            ),
+            models.Index(
+                fields=['locked_at'],
+                name='jobs_running_idx',
+                condition=models.Q(status='running'),
+            ),
+        ]
+        constraints = [
+            # At most one pending instance per unique_key (used by periodic tasks)
+            models.UniqueConstraint(
+                fields=['unique_key'],
+                name='jobs_unique_pending_key',
+                condition=models.Q(status__in=['queued', 'running']) & ~models.Q(unique_key=''),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.task} #{self.id} ({self.status})"
+
+
+class OutboundEmail(models.Model):
+    """
+    Transactional outbox: emails are written in the same transaction as the
+    change that triggers them and delivered later by `manage.py send_outbox`.
+    """
+    KIND_CHOICES = [
+        ('password_reset', 'Password Reset'),
+        ('invite', 'Invite'),
+    ]
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    to_email = models.EmailField()
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.IntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'outbound_emails'
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['next_attempt_at', 'id'],
+                name='outbound_emails_due_idx',
+                condition=models.Q(status='pending'),
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} to {self.to_email} ({self.status})"
+
+
+class ThrottleBucket(models.Model):
+    """
+    Token bucket state for core.throttling, shared by every worker and instance.
+    The table is UNLOGGED (see migration 0008): losing it on a crash only resets limits.
+    """
+    key = models.CharField(max_length=150, primary_key=True)
+    tokens = models.FloatField()
+    allowed = models.BooleanField(default=True)
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'throttle_buckets'
+
+    def __str__(self):
+        return f"{self.key} ({self.tokens:.2f})"
+
+
+class ProgressHeartbeat(models.Model):
+    """
+    Video heartbeats buffered per assignment until core.heartbeats.flush() merges
+    them into assignments. The table is UNLOGGED (see migration 0013): a crash
+    loses at most one flush interval of watch time.
+    """
+    assignment = models.OneToOneField(Assignment, on_delete=models.CASCADE, primary_key=True, related_name='+')
+    progress_pct = models.IntegerField(null=True)
+    position_seconds = models.IntegerField()
+    watch_seconds = models.IntegerField()
+    beats = models.IntegerField()
+    first_beat_at = models.DateTimeField()
+    last_beat_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'progress_heartbeats'
+
+    def __str__(self):
+        return f"{self.assignment_id} ({self.beats} beats)"
+
+
+class ChangeLog(models.Model):
+    """
+    One row per inserted, updated or deleted course, assignment and notification,
+    written by statement-level triggers (see migration 0014) so queryset updates
+    and bulk inserts are captured too. txid is the writing transaction's id;
+    core.sync reads the rows newer than a client's sync token.
+    """
+    entity = models.CharField(max_length=20)
+    object_id = models.BigIntegerField()
+    # Owning user for assignments and notifications, NULL for courses
+    owner_id = models.BigIntegerField(null=True)
+    deleted = models.BooleanField(default=False)
+    txid = models.BigIntegerField()
+    changed_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'change_log'
+        indexes = [
+            # One per branch of core.sync.CHANGES_SQL
+            models.Index(fields=['owner_id', 'txid'], name='change_log_owner_txid_idx'),
+            models.Index(
+                fields=['txid'],
+                name='change_log_course_txid_idx',
+                condition=models.Q(entity='course'),
+            ),
+            models.Index(fields=['changed_at'], name='change_log_changed_at_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.entity} {self.object_id} ({'deleted' if self.deleted else 'changed'})"
+
+
+class SlowQuery(models.Model):
+    """
+    Queries over SLOW_QUERY_MS, aggregated per fingerprint (normalized SQL and
+    the view or job that ran it) by core.slow_queries.
+    """
+    fingerprint = models.CharField(max_length=40, primary_key=True)
+    source = models.CharField(max_length=200, blank=True)
+    normalized_sql = models.TextField()
+    # The slowest occurrence so far
+    example_sql = models.TextField()
+    calls = models.BigIntegerField()
+    total_ms = models.FloatField()
+    max_ms = models.FloatField()
+    plan = models.TextField(blank=True, default='')
+    plan_captured_at = models.DateTimeField(null=True, blank=True)
+    first_seen = models.DateTimeField()
+    last_seen = models.DateTimeField()
+
+    class Meta:
+        db_table = 'slow_queries'
+        verbose_name_plural = 'slow queries'
+
+    def __str__(self):
+        return f"{self.source or '?'}: {self.normalized_sql[:80]}"
+
+    @property
+    def avg_ms(self):
+        return self.total_ms / self.calls if self.calls else 0.0
+
+
+class Certificate(models.Model):
+    """
+    Completion certificate of an assignment, rendered by the certificates.generate
+    job (see core.certificates). digest is the SHA-256 of the SVG, which is stored
+    in CertificateFile and served under that immutable name.
+    """
+    assignment = models.OneToOneField(
+        Assignment, on_delete=models.CASCADE, primary_key=True, related_name='certificate'
+    )
+    digest = models.CharField(max_length=64, db_index=True)
+    generated_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'certificates'
+
+    def __str__(self):
+        return f"{self.assignment_id}: {self.digest[:12]}"
+
+    @property
+    def file_name(self):
+        return f'{self.digest}.svg'
+
+
+class CertificateFile(models.Model):
+    """
+    A rendered certificate SVG, keyed by its SHA-256. Kept in Postgres so every
+    web instance can serve what the worker rendered; identical certificates
+    share one row.
+    """
+    digest = models.CharField(max_length=64, primary_key=True)
+    content = models.BinaryField()
+    created_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'certificate_files'
+
+    def __str__(self):
+        return f'{self.digest}.svg'
+
+
+class CourseSimilarity(models.Model):
+    """
+    Snapshot of the course recommendation model, rebuilt by the
+    recommendations.refresh job (see core.recommendations). Arrays are stored
+    as raw NumPy buffers: course_ids (int64, n), neighbors (int32, n x
+    neighbor_count, indices into course_ids), scores (float32, same shape)
+    and popularity (float32, n).
+    """
+    computed_at = models.DateTimeField()
+    neighbor_count = models.IntegerField()
+    course_ids = models.BinaryField()
+    neighbors = models.BinaryField()
+    scores = models.BinaryField()
+    popularity = models.BinaryField()
+
+    class Meta:
+        db_table = 'course_similarity'
+        verbose_name_plural = 'course similarity'
+
+    def __str__(self):
+        return f"Course similarity computed {self.computed_at:%Y-%m-%d %H:%M}"
+
+
+class LearnerSummary(models.Model):
+    """Per-user assignment counters, maintained by core.counters"""
+    user = models.OneToOneField(User, on_delete=models.CASCADE, primary_key=True, related_name='learning_summary')
+    assigned_count = models.IntegerField(default=0)
+    in_progress_count = models.IntegerField(default=0)
+    completed_count = models.IntegerField(default=0)
+    progress_sum = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table = 'learner_summaries'
+
+    def __str__(self):
+        return f"{self.user_id}: {self.completed_count}/{self.assigned_count} completed"
+
+
+class LeaderboardEntry(models.Model):
+    """
+    Precomputed leaderboard rows, rebuilt by the leaderboards.refresh job.
+    scope is 'org' or 'team:<id>'; rank is RANK() by completions, then activity.
+    """
+    PERIOD_CHOICES = [
+        ('7d', 'Last 7 days'),
+        ('30d', 'Last 30 days'),
+        ('all', 'All time'),
+    ]
+
+    scope = models.CharField(max_length=30)
+    period = models.CharField(max_length=10, choices=PERIOD_CHOICES)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='leaderboard_entries')
+    completions = models.IntegerField()
+    activity = models.IntegerField()
+    rank = models.IntegerField()
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'leaderboard_entries'
+        indexes = [
+            models.Index(fields=['scope', 'period', 'rank'], name='leaderboard_top_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['scope', 'period', 'user'], name='leaderboard_unique_user'),
+        ]
+
+    def __str__(self):
+        return f"{self.scope} {self.period} #{self.rank}: {self.user_id}"
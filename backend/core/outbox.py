@@ -0,0 +1,162 @@
+"""
+Transactional email outbox.
+
+Request handlers never talk to SMTP. They call queue_email() inside the
+transaction that creates the token the email refers to, so an email exists if
+and only if its token does. `manage.py send_outbox` (or the periodic
+email.send_outbox job) drains pending rows in batches over one SMTP
+connection. A batch is claimed with SELECT ... FOR UPDATE SKIP LOCKED and
+committed right away (its next_attempt_at moved CLAIM_TIMEOUT ahead), so no
+transaction or row lock is held while talking to SMTP; each message is then
+marked sent in its own short transaction. A sender that dies mid-batch only
+leaves its unsent claims, which fall due again after CLAIM_TIMEOUT.
+
+Bodies carry live reset and invite links, so they are blanked once a message
+is sent or has failed for good.
+"""
+import logging
+import random
+import time
+from datetime import timedelta
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from .models import OutboundEmail
+
+
+logger = logging.getLogger(__name__)
+
+MAX_ATTEMPTS = 6
+
+# How long a claimed batch is kept from other senders; far longer than a batch takes
+CLAIM_TIMEOUT = timedelta(minutes=10)
+BACKOFF_BASE_SECONDS = 30
+BACKOFF_MAX_SECONDS = 60 * 60
+
+
+def queue_email(kind, to_email, subject, body):
+    return OutboundEmail.objects.create(kind=kind, to_email=to_email, subject=subject, body=body)
+
+
+def reset_link(token):
+    return f'{settings.PASSWORD_RESET_URL}?token={token}'
+
+
+def queue_password_reset(user, token):
+    body = (
+        f'Hi {user.first_name or user.email},\n\n'
+        f'Use the link below to reset your password. It expires in one hour.\n\n'
+        f'{reset_link(token)}\n\n'
+        f'If you did not ask for this, you can ignore this email.\n'
+    )
+    return queue_email('password_reset', user.email, 'Reset your password', body)
+
+
+def queue_invite(user, token, invited_by):
+    body = (
+        f'Hi {user.first_name or user.email},\n\n'
+        f'{invited_by.get_full_name()} has invited you to the learning platform.\n'
+        f'Choose a password to activate your account. The link expires in 7 days.\n\n'
+        f'{reset_link(token)}\n'
+    )
+    return queue_email('invite', user.email, "You're invited to the learning platform", body)
+
+
+def backoff(attempts):
+    delay = min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS)
+    return timedelta(seconds=delay * random.uniform(0.8, 1.2))
+
+
+class RateLimiter:
+    """Space sends so that at most `per_second` messages go out per second"""
+
+    def __init__(self, per_second):
+        self.interval = 1.0 / per_second if per_second else 0
+        self.next_send = time.monotonic()
+
+    def wait(self):
+        if not self.interval:
+            return
+        now = time.monotonic()
+        if self.next_send > now:
+            time.sleep(self.next_send - now)
+        self.next_send = max(now, self.next_send) + self.interval
+
+
+def claim_batch(limit):
+    """Claim up to `limit` due emails for this sender and commit the claim"""
+    now = timezone.now()
+    with transaction.atomic():
+        email_ids = list(
+            OutboundEmail.objects.filter(status='pending', next_attempt_at__lte=now)
+            .order_by('next_attempt_at', 'id')
+            .select_for_update(skip_locked=True)
+            .values_list('id', flat=True)[:limit]
+        )
+        if email_ids:
+            OutboundEmail.objects.filter(id__in=email_ids).update(next_attempt_at=now + CLAIM_TIMEOUT)
+    return list(OutboundEmail.objects.filter(id__in=email_ids).order_by('id'))
+
+
+def send_batch(connection, limit, limiter):
+    """
+    Deliver up to `limit` due emails over `connection`, recording each
+    outcome as soon as it is known. Returns (sent, failed).
+    """
+    sent = failed = 0
+    for email in claim_batch(limit):
+        limiter.wait()
+        message = EmailMessage(
+            email.subject, email.body, settings.DEFAULT_FROM_EMAIL, [email.to_email],
+            connection=connection,
+        )
+        try:
+            # No-op while the connection is up; send() only closes connections it opened itself
+            connection.open()
+            message.send()
+        except Exception as exc:
+            failed += 1
+            _record_failure(email, exc)
+            # The server may have dropped us; reconnect for the rest of the batch
+            connection.close()
+            continue
+
+        OutboundEmail.objects.filter(id=email.id, status='pending').update(
+            status='sent', sent_at=timezone.now(), attempts=F('attempts') + 1, last_error='', body=''
+        )
+        sent += 1
+    return sent, failed
+
+
+def _record_failure(email, exc):
+    attempts = email.attempts + 1
+    logger.warning('Sending email %s to %s failed (attempt %s): %s', email.id, email.to_email, attempts, exc)
+    changes = {'attempts': attempts, 'last_error': str(exc)}
+    if attempts >= MAX_ATTEMPTS:
+        changes.update(status='failed', body='')
+    else:
+        changes['next_attempt_at'] = timezone.now() + backoff(attempts)
+    OutboundEmail.objects.filter(id=email.id).update(**changes)
+
+
+def drain(batch_size=50, rate=None, max_batches=None):
+    """
+    Send due emails until none are left (or max_batches is reached),
+    reusing one SMTP connection. Returns (sent, failed).
+    """
+    limiter = RateLimiter(settings.EMAIL_RATE_LIMIT if rate is None else rate)
+    total_sent = total_failed = batches = 0
+    connection = get_connection()
+    try:
+        while max_batches is None or batches < max_batches:
+            sent, failed = send_batch(connection, batch_size, limiter)
+            batches += 1
+            total_sent += sent
+            total_failed += failed
+            if sent + failed < batch_size:
+                break
+    finally:
+        connection.close()
+    return total_sent, total_failed
@@ -0,0 +1,170 @@
+"""
+On-demand request profiling.
+
+RequestProfilerMiddleware profiles a request when an admin asks for it
+(X-Profile: 1 header or ?_profile=1) or when it is picked by
+PROFILE_SAMPLE_RATE. A profile is a statistical one - a background thread
+samples the request thread's stack every PROFILE_INTERVAL_MS - plus every SQL
+query with its timing. Profiles are written as JSON to PROFILES_ROOT, newest
+PROFILE_MAX_FILES kept, and served by GET /profiles.
+"""
+import json
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextlib import ExitStack
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+
+PROFILE_ID_RE = re.compile(r'^\d{8}T\d{6}-[0-9a-f]{8}$')
+
+
+class SamplingProfiler:
+    """Sample one thread's call stack at a fixed interval into collapsed stacks"""
+
+    def __init__(self, thread_id, interval):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='profiler', daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[self._collapse(frame)] += 1
+
+    @staticmethod
+    def _collapse(frame):
+        names = []
+        while frame is not None:
+            code = frame.f_code
+            module = frame.f_globals.get('__name__', '?')
+            names.append(f'{module}.{getattr(code, "co_qualname", code.co_name)}:{frame.f_lineno}')
+            frame = frame.f_back
+        return ';'.join(reversed(names))
+
+
+class QueryRecorder:
+    """Database execute wrapper collecting every query with its duration"""
+
+    def __init__(self, alias):
+        self.alias = alias
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append({
+                'alias': self.alias,
+                'sql': sql,
+                'many': many,
+                'duration_ms': round((time.perf_counter() - started) * 1000, 3),
+            })
+
+
+class RequestProfile:
+    """Profile the block it wraps; to_dict() gives the stored result"""
+
+    def __init__(self, interval=None):
+        self.interval = (interval or settings.PROFILE_INTERVAL_MS) / 1000
+        self.recorders = [QueryRecorder(alias) for alias in connections]
+        self._stack = ExitStack()
+
+    def __enter__(self):
+        for recorder in self.recorders:
+            self._stack.enter_context(connections[recorder.alias].execute_wrapper(recorder))
+        self.profiler = SamplingProfiler(threading.get_ident(), self.interval)
+        self.started_at = timezone.now()
+        self._wall = time.perf_counter()
+        self._cpu = time.thread_time()
+        self.profiler.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.profiler.stop()
+        self.duration_ms = (time.perf_counter() - self._wall) * 1000
+        self.cpu_ms = (time.thread_time() - self._cpu) * 1000
+        self._stack.close()
+
+    def to_dict(self):
+        queries = [query for recorder in self.recorders for query in recorder.queries]
+        return {
+            'started_at': self.started_at.isoformat(),
+            'duration_ms': round(self.duration_ms, 1),
+            'cpu_ms': round(self.cpu_ms, 1),
+            'interval_ms': self.interval * 1000,
+            'samples': sum(self.profiler.stacks.values()),
+            'stacks': [
+                {'stack': stack, 'count': count}
+                for stack, count in self.profiler.stacks.most_common()
+            ],
+            'sql_count': len(queries),
+            'sql_ms': round(sum(query['duration_ms'] for query in queries), 1),
+            'sql': queries,
+        }
+
+
+def new_profile_id():
+    return f"{timezone.now():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+
+
+def profile_path(profile_id):
+    """Path of a stored profile, or None for an invalid id"""
+    if not PROFILE_ID_RE.match(profile_id or ''):
+        return None
+    return settings.PROFILES_ROOT / f'{profile_id}.json'
+
+
+def save(profile_id, data):
+    """Write one profile and drop the oldest beyond PROFILE_MAX_FILES"""
+    root = settings.PROFILES_ROOT
+    root.mkdir(parents=True, exist_ok=True)
+    with open(root / f'{profile_id}.json', 'w') as f:
+        json.dump(data, f)
+
+    # Ids start with a timestamp, so name order is age order
+    stored = sorted(root.glob('*.json'))
+    for path in stored[:-settings.PROFILE_MAX_FILES]:
+        path.unlink(missing_ok=True)
+
+
+SUMMARY_FIELDS = (
+    'id', 'method', 'path', 'status', 'trigger', 'user_id', 'started_at', 'duration_ms', 'sql_count', 'sql_ms'
+)
+
+
+def list_profiles():
+    """Summaries of the stored profiles, newest first"""
+    root = settings.PROFILES_ROOT
+    if not root.exists():
+        return []
+    summaries = []
+    for path in sorted(root.glob('*.json'), reverse=True):
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            continue
+        summaries.append({field: data.get(field) for field in SUMMARY_FIELDS})
+    return summaries
+
+
+def collapsed(data):
+    """Stacks in the collapsed format read by flamegraph.pl and speedscope"""
+    return ''.join(f"{entry['stack']} {entry['count']}\n" for entry in data['stacks'])
@@ -0,0 +1,94 @@
+"""
+Assignment progress updates.
+
+apply_progress() applies a progress report in a single statement: it locks the
+assignment row, keeps the larger of the stored and reported progress, derives
+status and completed_at in SQL, inserts the progress event (the value as
+reported) and returns the learner's team, all in the same round trip. Concurrent reports from several tabs or devices therefore never
+lose an update or move progress backwards.
+
+The statement bypasses signals, so the counters and cache versions are updated
+here explicitly, and a completion queues its certificate (core.certificates).
+"""
+from django.db import connection, transaction
+from django.utils import timezone
+from . import certificates
+from .cache_utils import bump_versions
+from .counters import record_transition
+
+
+STATUSES = ('not_started', 'in_progress', 'completed')
+
+APPLY_SQL = '''
+    WITH locked AS (
+        SELECT id, status, progress_pct, completed_at, last_activity_at,
+               GREATEST(progress_pct, %(pct)s::integer) AS new_pct
+        FROM assignments
+        WHERE id = %(id)s
+        FOR UPDATE
+    ), target AS (
+        SELECT locked.*, CASE
+            WHEN %(status)s::varchar IS NOT NULL THEN %(status)s::varchar
+            WHEN %(pct)s::integer IS NOT NULL AND new_pct >= 100 THEN 'completed'
+            WHEN %(pct)s::integer IS NOT NULL AND new_pct > 0 AND status = 'not_started' THEN 'in_progress'
+            ELSE status
+        END AS new_status
+        FROM locked
+    ), updated AS (
+        UPDATE assignments SET
+            progress_pct = target.new_pct,
+            status = target.new_status,
+            completed_at = CASE WHEN target.new_status = 'completed'
+                                THEN COALESCE(target.completed_at, %(now)s) ELSE target.completed_at END,
+            last_activity_at = CASE WHEN %(pct)s::integer IS NULL
+                                    THEN target.last_activity_at ELSE %(now)s END
+        FROM target
+        WHERE assignments.id = target.id
+        RETURNING assignments.id, assignments.user_id, assignments.course_id,
+                  assignments.status, assignments.progress_pct,
+                  assignments.completed_at, assignments.last_activity_at,
+                  target.status AS previous_status, target.progress_pct AS previous_pct
+    ), event AS (
+        INSERT INTO progress_events (assignment_id, progress_pct, created_at)
+        SELECT id, %(pct)s::integer, %(now)s FROM updated
+        WHERE %(pct)s::integer IS NOT NULL
+    )
+    SELECT updated.user_id, users.team_id, updated.course_id, updated.status, updated.progress_pct,
+           updated.completed_at, updated.last_activity_at, updated.previous_status, updated.previous_pct
+    FROM updated
+    JOIN users ON users.id = updated.user_id
+'''
+
+
+def apply_progress(assignment_id, progress_pct=None, status=None):
+    """
+    Record a progress report (0-100, or None) and/or an explicit status for one
+    assignment. Progress only ever increases; reaching 100 completes the
+    assignment. Returns the new {'status', 'progress_pct', 'completed_at',
+    'last_activity_at'}, or None when the assignment does not exist.
+    """
+    params = {'id': assignment_id, 'pct': progress_pct, 'status': status, 'now': timezone.now()}
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(APPLY_SQL, params)
+            row = cursor.fetchone()
+        if row is None:
+            return None
+
+        (user_id, team_id, course_id, new_status, new_pct, completed_at, last_activity_at,
+         previous_status, previous_pct) = row
+        record_transition(user_id, course_id, (previous_status, previous_pct), (new_status, new_pct))
+        if new_status == 'completed' and previous_status != 'completed':
+            certificates.queue(assignment_ids=[assignment_id])
+
+        names = [f'assignments:user:{user_id}']
+        if team_id:
+            names.append(f'assignments:team:{team_id}')
+        bump_versions(*names)
+
+    return {
+        'status': new_status,
+        'progress_pct': new_pct,
+        'completed_at': completed_at,
+        'last_activity_at': last_activity_at,
+    }
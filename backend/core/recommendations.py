@@ -0,0 +1,239 @@
+"""
+Course recommendations.
+
+The recommendations.refresh job builds an item-item similarity over the
+published courses from two signals: TF-IDF vectors of title, description and
+level (text), and co-enrollment weighted by how far learners got (behaviour):
+two courses are similar when the same people take and finish both. Both are
+cosine similarities computed with NumPy matrix products. Only each course's
+top NEIGHBORS are kept - int32 neighbor indices and float32 scores, a few KB
+per hundred courses - in one course_similarity row.
+
+Each process keeps the latest snapshot in memory (reloaded when the
+'recommendations' cache version changes), so recommend() only gathers the
+neighbors of the courses a learner already has and takes the top K; nothing
+is computed over the catalog at request time.
+"""
+import math
+import re
+import threading
+from collections import Counter
+from datetime import timedelta
+import numpy as np
+from django.db import connection, transaction
+from django.utils import timezone
+from .cache_utils import bump_versions, get_versions
+from .models import Course, CourseSimilarity
+
+
+REFRESH_INTERVAL = timedelta(hours=6)
+
+NEIGHBORS = 20
+
+# Share of the text similarity in the blend; the rest is co-enrollment
+TEXT_WEIGHT = 0.4
+
+# Added to every score, so ties (and learners without history) go to popular courses
+POPULARITY_WEIGHT = 0.05
+
+# How much an assignment in each state says about the learner's interest
+STATUS_WEIGHTS = {'not_started': 1.0, 'in_progress': 1.5, 'completed': 2.0}
+
+MAX_TERMS = 5000
+
+# Users per block when accumulating co-enrollment
+USER_BLOCK = 2000
+
+STOP_WORDS = frozenset(
+    'a an and are as at be by for from has have how in into is it its of on or our that the this to '
+    'was we what when with you your'.split()
+)
+
+TOKEN_RE = re.compile(r'[a-z0-9][a-z0-9+#]+')
+
+ENROLLMENTS_SQL = '''
+    SELECT a.user_id, a.course_id, a.status
+    FROM assignments a JOIN courses c ON c.id = a.course_id
+    WHERE c.status = 'published'
+    ORDER BY a.user_id
+'''
+
+_lock = threading.Lock()
+_snapshot = {'version': None, 'data': None}
+
+
+def _tokens(course):
+    # The title counts twice: it says more about the course than the description
+    words = [word for word in TOKEN_RE.findall(f'{course.title} {course.title} {course.description}'.lower())
+             if word not in STOP_WORDS]
+    return words + [f'level:{course.level}']
+
+
+def text_similarity(courses):
+    """Cosine similarity of the courses' TF-IDF vectors (n x n)"""
+    documents = [Counter(_tokens(course)) for course in courses]
+    document_frequency = Counter(term for document in documents for term in document)
+    # A term in a single course cannot make two courses similar
+    vocabulary = [term for term, count in document_frequency.most_common(MAX_TERMS) if count > 1]
+    if not vocabulary:
+        return np.zeros((len(courses), len(courses)), dtype=np.float32)
+    columns = {term: index for index, term in enumerate(vocabulary)}
+
+    tf = np.zeros((len(courses), len(vocabulary)), dtype=np.float32)
+    for row, document in enumerate(documents):
+        for term, count in document.items():
+            if term in columns:
+                tf[row, columns[term]] = 1 + math.log(count)
+    df = np.array([document_frequency[term] for term in vocabulary], dtype=np.float32)
+    idf = np.log((1 + len(courses)) / (1 + df)) + 1
+    return _cosine(tf * idf)
+
+
+def _cosine(vectors):
+    norms = np.linalg.norm(vectors, axis=1)
+    norms[norms == 0] = 1
+    unit = vectors / norms[:, None]
+    return unit @ unit.T
+
+
+def co_enrollment(course_ids):
+    """
+    Cosine similarity of the courses' learner vectors (n x n), weighted by
+    STATUS_WEIGHTS, and each course's enrollment count.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(ENROLLMENTS_SQL)
+        rows = cursor.fetchall()
+    n = len(course_ids)
+    if not rows:
+        return np.zeros((n, n), dtype=np.float32), np.zeros(n, dtype=np.float32)
+
+    user_ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+    enrolled_ids = np.fromiter((row[1] for row in rows), dtype=np.int64, count=len(rows))
+    weights = np.fromiter((STATUS_WEIGHTS.get(row[2], 1.0) for row in rows), dtype=np.float32, count=len(rows))
+    columns = np.minimum(np.searchsorted(course_ids, enrolled_ids), n - 1)
+    # Drop courses published after the course list was read
+    known = course_ids[columns] == enrolled_ids
+    user_ids, columns, weights = user_ids[known], columns[known], weights[known]
+    if not len(user_ids):
+        return np.zeros((n, n), dtype=np.float32), np.zeros(n, dtype=np.float32)
+    _, users = np.unique(user_ids, return_inverse=True)
+
+    # Rows are ordered by user: accumulate learners x courses blocks instead of one huge matrix
+    gram = np.zeros((n, n), dtype=np.float32)
+    bounds = np.searchsorted(users, np.arange(0, users.max() + 1 + USER_BLOCK, USER_BLOCK))
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        if start == end:
+            continue
+        block = np.zeros((users[end - 1] - users[start] + 1, n), dtype=np.float32)
+        block[users[start:end] - users[start], columns[start:end]] = weights[start:end]
+        gram += block.T @ block
+
+    norms = np.sqrt(np.diag(gram))
+    norms[norms == 0] = 1
+    return gram / np.outer(norms, norms), np.bincount(columns, minlength=n).astype(np.float32)
+
+
+def build(courses):
+    """(course_ids, neighbors, scores, popularity) for the courses, which are ordered by id"""
+    course_ids = np.array([course.id for course in courses], dtype=np.int64)
+    behaviour, enrollments = co_enrollment(course_ids)
+    similarity = TEXT_WEIGHT * text_similarity(courses) + (1 - TEXT_WEIGHT) * behaviour
+    # Below any real similarity, so a course is never its own neighbor
+    np.fill_diagonal(similarity, -1)
+
+    k = min(NEIGHBORS, len(courses) - 1)
+    if k > 0:
+        neighbors = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+    else:
+        neighbors = np.zeros((len(courses), 0), dtype=np.int64)
+    scores = np.take_along_axis(similarity, neighbors, axis=1)
+    order = np.argsort(-scores, axis=1)
+    neighbors = np.take_along_axis(neighbors, order, axis=1).astype(np.int32)
+    scores = np.take_along_axis(scores, order, axis=1).astype(np.float32)
+
+    popularity = np.log1p(enrollments)
+    if popularity.max() > 0:
+        popularity /= popularity.max()
+    return course_ids, neighbors, scores, popularity.astype(np.float32)
+
+
+def refresh():
+    """Recompute the similarity snapshot; returns the number of courses in it"""
+    courses = list(
+        Course.objects.filter(status='published').order_by('id').only('id', 'title', 'description', 'level')
+    )
+    if courses:
+        course_ids, neighbors, scores, popularity = build(courses)
+    else:
+        course_ids, neighbors = np.zeros(0, np.int64), np.zeros((0, 0), np.int32)
+        scores, popularity = np.zeros((0, 0), np.float32), np.zeros(0, np.float32)
+    with transaction.atomic():
+        CourseSimilarity.objects.all().delete()
+        CourseSimilarity.objects.create(
+            computed_at=timezone.now(),
+            neighbor_count=neighbors.shape[1],
+            course_ids=course_ids.tobytes(),
+            neighbors=neighbors.tobytes(),
+            scores=scores.tobytes(),
+            popularity=popularity.tobytes(),
+        )
+        bump_versions('recommendations')
+    return len(courses)
+
+
+def _load():
+    row = CourseSimilarity.objects.order_by('-computed_at').first()
+    if row is None:
+        return None
+    course_ids = np.frombuffer(bytes(row.course_ids), dtype=np.int64)
+    k = row.neighbor_count
+    return {
+        'computed_at': row.computed_at,
+        'course_ids': course_ids,
+        'index': {course_id: index for index, course_id in enumerate(course_ids.tolist())},
+        'neighbors': np.frombuffer(bytes(row.neighbors), dtype=np.int32).reshape(len(course_ids), k),
+        'scores': np.frombuffer(bytes(row.scores), dtype=np.float32).reshape(len(course_ids), k),
+        'popularity': np.frombuffer(bytes(row.popularity), dtype=np.float32),
+    }
+
+
+def snapshot():
+    """The similarity snapshot in this process's memory, reloaded after a refresh"""
+    version = get_versions(['recommendations'])['recommendations']
+    if _snapshot['version'] != version:
+        with _lock:
+            if _snapshot['version'] != version:
+                _snapshot['data'] = _load()
+                _snapshot['version'] = version
+    return _snapshot['data']
+
+
+def recommend(history, allowed_ids, limit):
+    """
+    Up to `limit` (course_id, score) for a learner whose assignments are
+    `history` [(course_id, status)], best first, among `allowed_ids` and
+    excluding courses they already have.
+    """
+    data = snapshot()
+    if data is None or not len(data['course_ids']):
+        return []
+
+    index = data['index']
+    taken = [(index[course_id], STATUS_WEIGHTS.get(assignment_status, 1.0))
+             for course_id, assignment_status in history if course_id in index]
+    total = POPULARITY_WEIGHT * data['popularity']
+    if taken:
+        rows = np.array([row for row, _ in taken])
+        weights = np.array([weight for _, weight in taken], dtype=np.float32)
+        np.add.at(total, data['neighbors'][rows].ravel(), (data['scores'][rows] * weights[:, None]).ravel())
+
+    eligible = np.isin(data['course_ids'], list(allowed_ids))
+    eligible[[row for row, _ in taken]] = False
+    candidates = np.flatnonzero(eligible)
+    if not len(candidates):
+        return []
+    if len(candidates) > limit:
+        candidates = candidates[np.argpartition(-total[candidates], limit - 1)[:limit]]
+    candidates = candidates[np.argsort(-total[candidates], kind='stable')]
+    return [(int(data['course_ids'][row]), float(total[row])) for row in candidates]
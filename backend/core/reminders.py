@@ -0,0 +1,73 @@
+"""
+Due-date reminders.
+
+scan() finds open assignments that are due soon or overdue in one pass over
+assignments_due_scan_idx, advances their reminder_stage in the same
+statement, and creates the reminder notifications in bulk. A stage is only
+ever advanced, so each threshold is reminded at most once per due date, and
+rows locked by a concurrent scan are skipped rather than reminded twice.
+"""
+from datetime import timedelta
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+from .cache_utils import bump_versions
+from .models import Course, Notification
+
+
+DUE_SOON = 1
+OVERDUE = 2
+
+SCAN_SQL = '''
+    WITH due AS (
+        SELECT id, CASE WHEN due_at <= %(now)s THEN 2 ELSE 1 END AS stage
+        FROM assignments
+        WHERE due_at IS NOT NULL AND NOT (status = 'completed') AND reminder_stage < 2
+          AND due_at <= %(soon)s
+        FOR UPDATE SKIP LOCKED
+    )
+    UPDATE assignments SET reminder_stage = due.stage
+    FROM due
+    WHERE assignments.id = due.id AND assignments.reminder_stage < due.stage
+    RETURNING assignments.user_id, assignments.course_id, assignments.due_at, due.stage
+'''
+
+
+def set_due_dates(assignments, due_at):
+    """
+    Give every assignment in the queryset the same due date (None clears it),
+    in one UPDATE. Reminders start over for rows whose date changed.
+    Returns the number of assignments changed.
+    """
+    return assignments.exclude(due_at=due_at).update(due_at=due_at, reminder_stage=0)
+
+
+def _reminder_text(title, due_at, stage):
+    due = timezone.localtime(due_at).strftime('%b %d, %H:%M')
+    if stage == OVERDUE:
+        return f'Overdue: "{title}" was due {due}.'
+    return f'Reminder: "{title}" is due {due}.'
+
+
+def scan(now=None):
+    """Send due-soon and overdue reminders; returns the number sent"""
+    now = now or timezone.now()
+    soon = now + timedelta(hours=settings.REMINDER_DUE_SOON_HOURS)
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(SCAN_SQL, {'now': now, 'soon': soon})
+            reminders = cursor.fetchall()
+        if not reminders:
+            return 0
+
+        titles = dict(
+            Course.objects.filter(id__in={course_id for _, course_id, _, _ in reminders})
+            .values_list('id', 'title')
+        )
+        Notification.objects.bulk_create([
+            Notification(user_id=user_id, text=_reminder_text(titles.get(course_id, 'A course'), due_at, stage))
+            for user_id, course_id, due_at, stage in reminders
+        ], batch_size=1000)
+        bump_versions(*{f'notifications:user:{user_id}' for user_id, _, _, _ in reminders})
+    return len(reminders)
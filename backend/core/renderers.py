@@ -0,0 +1,49 @@
+"""
+Alternative wire formats for the JSON API, chosen by the Accept header.
+
+- application/msgpack: MessagePack encoding of the same data
+- application/vnd.lms.columnar+json: lists of objects are sent as one list of
+  column names plus a list of row arrays, so keys are not repeated per row
+"""
+import msgpack
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, use_bin_type=True, default=str)
+
+
+def to_columns(data):
+    """
+    [{"id": 1, "title": "a"}, {"id": 2, "title": "b"}]
+    -> {"columns": ["id", "title"], "rows": [[1, "a"], [2, "b"]]}
+    Lists of anything else, and non-list data, are left alone.
+    """
+    if isinstance(data, list):
+        if data and all(isinstance(row, dict) for row in data):
+            columns = list(data[0].keys())
+            if all(list(row.keys()) == columns for row in data):
+                return {
+                    'columns': columns,
+                    'rows': [[to_columns(row[column]) for column in columns] for row in data],
+                }
+        return [to_columns(item) for item in data]
+    if isinstance(data, dict):
+        return {key: to_columns(value) for key, value in data.items()}
+    return data
+
+
+class ColumnarJSONRenderer(JSONRenderer):
+    media_type = 'application/vnd.lms.columnar+json'
+    format = 'columnar'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return super().render(to_columns(data), accepted_media_type, renderer_context)
@@ -1,17 +1,127 @@
 from rest_framework import serializers
-from .models import User, Team, Course, Resource, Assignment, ProgressEvent, Notification, Approval
+from .models import (
+    User, Team, Course, Resource, Assignment, ProgressEvent, Notification, Approval, Job, LearnerSummary,
+    LeaderboardEntry
+)
 
 
-class UserSerializer(serializers.ModelSerializer):
+def _param_set(value):
+    return {part.strip() for part in value.split(',') if part.strip()}
+
+
+def _parse_fieldset(value):
+    """'id,course.title,course.level' -> {'id': {}, 'course': {'title': {}, 'level': {}}}"""
+    spec = {}
+    for path in _param_set(value):
+        node = spec
+        for name in path.split('.'):
+            node = node.setdefault(name, {})
+    return spec
+
+
+def _restrict_fields(serializer, spec):
+    for name in list(serializer.fields):
+        if name not in spec and name != 'id':
+            serializer.fields.pop(name)
+        elif spec.get(name):
+            nested = serializer.fields[name]
+            nested = getattr(nested, 'child', nested)
+            if isinstance(nested, serializers.BaseSerializer):
+                _restrict_fields(nested, spec[name])
+
+
+def is_compact(request):
+    return request is not None and request.query_params.get('compact') in ('1', 'true')
+
+
+class SparseFieldsetMixin:
+    """
+    Sparse fieldsets for GET requests.
+
+    - ?fields=id,status,course.title keeps only the listed fields; dotted names
+      reach into nested serializers. `id` is always kept.
+    - ?expand=course,user embeds the relations named in Meta.expandable_fields.
+      Without the parameter Meta.default_expand applies; relations that are not
+      expanded are sent as primary keys.
+    - ?compact=1 expands nothing and drops Meta.side_loaded_fields, so the view
+      can send each referenced object once (see side_load in views).
+
+    Meta.field_columns maps computed fields to the model columns they read, so
+    required_columns() can tell the view what to load with QuerySet.only().
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get('request')
+        if request is None or request.method != 'GET':
+            return
+
+        params = request.query_params
+        meta = self.Meta
+        expandable = getattr(meta, 'expandable_fields', {})
+
+        if is_compact(request):
+            expand = set()
+            for name in getattr(meta, 'side_loaded_fields', []):
+                self.fields.pop(name, None)
+        elif 'expand' in params:
+            expand = _param_set(params['expand'])
+        else:
+            expand = set(getattr(meta, 'default_expand', []))
+
+        for name, serializer_class in expandable.items():
+            if name not in self.fields:
+                continue
+            if name in expand:
+                if not isinstance(self.fields[name], serializers.BaseSerializer):
+                    self.fields[name] = serializer_class(read_only=True)
+            elif isinstance(self.fields[name], serializers.BaseSerializer):
+                self.fields[name] = serializers.PrimaryKeyRelatedField(read_only=True)
+
+        if 'fields' in params:
+            _restrict_fields(self, _parse_fieldset(params['fields']))
+
+    def required_columns(self, prefix=''):
+        """
+        Model paths (for QuerySet.only) read by the remaining fields,
+        or None if some field needs the whole row.
+        """
+        field_columns = getattr(self.Meta, 'field_columns', {})
+        concrete = {field.name for field in self.Meta.model._meta.concrete_fields}
+        columns = {prefix + 'id'}
+
+        for name, field in self.fields.items():
+            if field.write_only:
+                continue
+            if name in field_columns:
+                columns.update(prefix + column for column in field_columns[name])
+            elif isinstance(field, serializers.ListSerializer):
+                # Reverse relations are prefetched separately
+                continue
+            elif isinstance(field, SparseFieldsetMixin):
+                nested = field.required_columns(prefix + field.source + '__')
+                if nested is None:
+                    return None
+                columns.add(prefix + field.source)
+                columns.update(nested)
+            elif field.source.split('.')[0] in concrete:
+                columns.add(prefix + field.source.split('.')[0])
+            else:
+                return None
+        return columns
+
+
+class UserSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     full_name = serializers.ReadOnlyField()
     
     class Meta:
         model = User
         fields = ['id', 'email', 'first_name', 'last_name', 'full_name', 'role', 'team', 'date_joined']
         read_only_fields = ['id', 'date_joined']
+        field_columns = {'full_name': ['first_name', 'last_name']}
 
 
-class EmployeeSerializer(serializers.ModelSerializer):
+class EmployeeSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     name = serializers.SerializerMethodField()
     designation = serializers.CharField(source='job_title', read_only=True)
     firstName = serializers.CharField(source='first_name', read_only=True)
@@ -21,48 +131,105 @@ class EmployeeSerializer(serializers.ModelSerializer):
         model = User
         fields = ['id', 'name', 'email', 'designation', 'firstName', 'lastName', 'role']
         read_only_fields = ['id', 'name', 'email', 'designation', 'firstName', 'lastName']
+        field_columns = {'name': ['first_name', 'last_name', 'email']}
     
     def get_name(self, obj):
         return obj.get_full_name()
 
 
-class TeamSerializer(serializers.ModelSerializer):
+class UserSummarySerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """Compact user reference used for expanded and side-loaded users"""
+    name = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = User
+        fields = ['id', 'name', 'email']
+        field_columns = {'name': ['first_name', 'last_name', 'email']}
+    
+    def get_name(self, obj):
+        return obj.get_full_name()
+
+
+class TeamSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     manager_name = serializers.SerializerMethodField()
-    member_count = serializers.SerializerMethodField()
     
     class Meta:
         model = Team
         fields = ['id', 'name', 'description', 'manager', 'manager_name', 'member_count', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'member_count', 'created_at', 'updated_at']
+        field_columns = {
+            'manager_name': ['manager__first_name', 'manager__last_name'],
+        }
     
     def get_manager_name(self, obj):
         return obj.manager.full_name if obj.manager else None
-    
-    def get_member_count(self, obj):
-        return obj.members.count()
 
 
-class CourseSerializer(serializers.ModelSerializer):
+def _average(total, count):
+    return round(total / count, 1) if count else 0
+
+
+def live_course_counters(courses):
+    """
+    Current counter fields of the courses in a queryset, {id: {field: value}}.
+    Counters change on every progress report without touching updated_at or
+    the 'courses' version, so cached course payloads take them from here.
+    """
+    return {
+        course_id: {
+            'enrolled_count': enrolled,
+            'completed_count': completed,
+            'average_progress': _average(progress_sum, enrolled),
+        }
+        for course_id, enrolled, completed, progress_sum in courses.values_list(
+            'id', 'enrolled_count', 'completed_count', 'progress_sum'
+        )
+    }
+
+
+def with_course_counters(item, counters):
+    """A serialized course with its counter fields replaced by the live ones"""
+    live = counters.get(item['id'], {})
+    return {**item, **{field: value for field, value in live.items() if field in item}}
+
+
+class CourseSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     created_by_name = serializers.SerializerMethodField()
+    average_progress = serializers.SerializerMethodField()
     
     class Meta:
         model = Course
         fields = ['id', 'title', 'description', 'video_url', 'thumbnail_url', 'status', 
-                  'level', 'duration', 'created_by', 'created_by_name', 'created_at', 'updated_at']
-        read_only_fields = ['id', 'created_at', 'updated_at']
+                  'level', 'duration', 'created_by', 'created_by_name', 'enrolled_count',
+                  'completed_count', 'average_progress', 'created_at', 'updated_at']
+        read_only_fields = ['id', 'enrolled_count', 'completed_count', 'created_at', 'updated_at']
+        field_columns = {
+            'created_by_name': ['created_by__first_name', 'created_by__last_name'],
+            'average_progress': ['progress_sum', 'enrolled_count'],
+        }
     
     def get_created_by_name(self, obj):
         return obj.created_by.full_name if obj.created_by else None
+    
+    def get_average_progress(self, obj):
+        return _average(obj.progress_sum, obj.enrolled_count)
 
 
-class ResourceSerializer(serializers.ModelSerializer):
+class ResourceSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Resource
         fields = ['id', 'course', 'title', 'resource_type', 'viewer_url', 'created_at']
         read_only_fields = ['id', 'created_at']
 
 
-class MinimalCourseSerializer(serializers.ModelSerializer):
+class CourseDetailSerializer(CourseSerializer):
+    resources = ResourceSerializer(many=True, read_only=True)
+    
+    class Meta(CourseSerializer.Meta):
+        fields = CourseSerializer.Meta.fields + ['resources']
+
+
+class MinimalCourseSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     created_by_name = serializers.SerializerMethodField()
     duration_minutes = serializers.SerializerMethodField()
     
@@ -71,6 +238,10 @@ class MinimalCourseSerializer(serializers.ModelSerializer):
         fields = ['id', 'title', 'description', 'thumbnail_url', 'video_url', 'status', 
                   'level', 'duration', 'duration_minutes', 'created_by_name', 'updated_at']
         read_only_fields = ['id', 'updated_at']
+        field_columns = {
+            'created_by_name': ['created_by__first_name', 'created_by__last_name', 'created_by__email'],
+            'duration_minutes': ['duration'],
+        }
     
     def get_created_by_name(self, obj):
         return obj.created_by.get_full_name() if obj.created_by else None
@@ -84,7 +255,7 @@ class MinimalCourseSerializer(serializers.ModelSerializer):
         return None
 
 
-class AssignmentSerializer(serializers.ModelSerializer):
+class AssignmentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     user_name = serializers.SerializerMethodField()
     course_title = serializers.SerializerMethodField()
     assigned_by_name = serializers.SerializerMethodField()
@@ -105,8 +276,20 @@ class AssignmentSerializer(serializers.ModelSerializer):
         model = Assignment
         fields = ['id', 'user', 'user_id', 'user_name', 'course', 'course_id', 'course_title', 
                   'assigned_by', 'assigned_by_name', 'status', 'progress_pct', 'last_activity_at', 
-                  'assigned_at', 'completed_at']
-        read_only_fields = ['id', 'assigned_at', 'assigned_by', 'user']
+                  'assigned_at', 'completed_at', 'due_at', 'position_seconds', 'watch_seconds']
+        read_only_fields = ['id', 'assigned_at', 'assigned_by', 'user', 'position_seconds', 'watch_seconds']
+        field_columns = {
+            'user_name': ['user__first_name', 'user__last_name', 'user__email'],
+            'course_title': ['course__title'],
+            'assigned_by_name': ['assigned_by__first_name', 'assigned_by__last_name', 'assigned_by__email'],
+        }
+        expandable_fields = {
+            'course': MinimalCourseSerializer,
+            'user': UserSummarySerializer,
+            'assigned_by': UserSummarySerializer,
+        }
+        default_expand = ['course']
+        side_loaded_fields = ['user_name', 'course_title', 'assigned_by_name']
     
     def get_user_name(self, obj):
         return obj.user.get_full_name() if obj.user else None
@@ -118,21 +301,33 @@ class AssignmentSerializer(serializers.ModelSerializer):
         return obj.assigned_by.get_full_name() if obj.assigned_by else None
 
 
-class ProgressEventSerializer(serializers.ModelSerializer):
+class LearnerSummarySerializer(serializers.ModelSerializer):
+    average_progress = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = LearnerSummary
+        fields = ['user', 'assigned_count', 'in_progress_count', 'completed_count', 'average_progress']
+        read_only_fields = fields
+    
+    def get_average_progress(self, obj):
+        return _average(obj.progress_sum, obj.assigned_count)
+
+
+class ProgressEventSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = ProgressEvent
         fields = ['id', 'assignment', 'progress_pct', 'created_at']
         read_only_fields = ['id', 'created_at']
 
 
-class NotificationSerializer(serializers.ModelSerializer):
+class NotificationSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Notification
         fields = ['id', 'user', 'text', 'read_at', 'created_at']
         read_only_fields = ['id', 'created_at']
 
 
-class ApprovalSerializer(serializers.ModelSerializer):
+class ApprovalSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     course_title = serializers.SerializerMethodField()
     requested_by_name = serializers.SerializerMethodField()
     approved_by_name = serializers.SerializerMethodField()
@@ -141,8 +336,13 @@ class ApprovalSerializer(serializers.ModelSerializer):
         model = Approval
         fields = ['id', 'course', 'course_title', 'requested_by', 'requested_by_name', 
                   'approved_by', 'approved_by_name', 'status', 'notes', 'rejection_note', 
-                  'requested_at', 'reviewed_at']
-        read_only_fields = ['id', 'requested_at']
+                  'requested_at', 'reviewed_at', 'claimed_by', 'claimed_at']
+        read_only_fields = ['id', 'requested_at', 'claimed_by', 'claimed_at']
+        field_columns = {
+            'course_title': ['course__title'],
+            'requested_by_name': ['requested_by__first_name', 'requested_by__last_name'],
+            'approved_by_name': ['approved_by__first_name', 'approved_by__last_name'],
+        }
     
     def get_course_title(self, obj):
         return obj.course.title if obj.course else None
@@ -152,3 +352,30 @@ class ApprovalSerializer(serializers.ModelSerializer):
     
     def get_approved_by_name(self, obj):
         return obj.approved_by.full_name if obj.approved_by else None
+
+
+class JobSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    class Meta:
+        model = Job
+        fields = ['id', 'queue', 'task', 'status', 'priority', 'attempts', 'max_attempts',
+                  'run_at', 'last_error', 'result', 'created_at', 'finished_at']
+        read_only_fields = fields
+
+
+class LeaderboardEntrySerializer(serializers.ModelSerializer):
+    """
+    Learners see each other by display name only; the id and email of the user
+    are included for admins and for the caller's own row (context 'show_user').
+    """
+    user = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = LeaderboardEntry
+        fields = ['rank', 'user', 'completions', 'activity']
+        read_only_fields = fields
+    
+    def get_user(self, obj):
+        if self.context.get('show_user'):
+            return UserSummarySerializer(obj.user).data
+        # Not get_full_name(): it falls back to the email's local part
+        return {'name': f'{obj.user.first_name} {obj.user.last_name}'.strip() or 'Learner'}
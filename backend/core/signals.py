@@ -0,0 +1,84 @@
+"""
+Model signal handlers.
+
+Writes that go through Model.save()/delete() bump the shared cache versions
+of the data they touch and keep stored counters in step. Queryset .update()
+calls bypass signals, so code that uses them does both explicitly.
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from . import certificates
+from .cache_utils import bump_versions
+from .counters import record_transition
+from .teams import adjust_member_counts
+from .models import User, Course, Assignment, Notification, Approval, LearnerSummary
+
+
+def _team_of(assignment):
+    if 'user' in assignment._state.fields_cache:
+        return assignment.user.team_id
+    return User.objects.filter(pk=assignment.user_id).values_list('team_id', flat=True).first()
+
+
+@receiver([post_save, post_delete], sender=User)
+def user_changed(sender, instance, signal, **kwargs):
+    previous_team_id = getattr(instance, '_loaded_team_id', None)
+    if signal is post_delete:
+        adjust_member_counts({previous_team_id: -1})
+    elif previous_team_id != instance.team_id:
+        adjust_member_counts({previous_team_id: -1, instance.team_id: 1})
+
+    cached = instance.cached_values()
+    if signal is post_delete or kwargs.get('created') or getattr(instance, '_loaded_cached', None) != cached:
+        names = [f'user:{instance.pk}']
+        for team_id in {instance.team_id, previous_team_id}:
+            if team_id:
+                names += [f'team:{team_id}', f'assignments:team:{team_id}']
+        bump_versions(*names)
+    instance._loaded_team_id = instance.team_id
+    instance._loaded_cached = cached
+
+    name = (instance.first_name, instance.last_name)
+    if signal is post_save and getattr(instance, '_loaded_name', name) != name:
+        certificates.queue(user_id=instance.pk)
+    instance._loaded_name = name
+
+
+@receiver(post_save, sender=User)
+def create_learner_summary(sender, instance, created, **kwargs):
+    if created:
+        LearnerSummary.objects.get_or_create(user=instance)
+
+
+@receiver([post_save, post_delete], sender=Course)
+def course_changed(sender, instance, signal, **kwargs):
+    bump_versions('courses')
+    if signal is post_save and getattr(instance, '_loaded_title', instance.title) != instance.title:
+        certificates.queue(course_id=instance.pk)
+    instance._loaded_title = instance.title
+
+
+@receiver([post_save, post_delete], sender=Assignment)
+def assignment_changed(sender, instance, signal, **kwargs):
+    before = None if kwargs.get('created') else getattr(instance, '_loaded_progress', None)
+    after = None if signal is post_delete else (instance.status, instance.progress_pct)
+    record_transition(instance.user_id, instance.course_id, before, after)
+    instance._loaded_progress = after
+    if after and after[0] == 'completed' and (before is None or before[0] != 'completed'):
+        certificates.queue(assignment_ids=[instance.pk])
+
+    names = [f'assignments:user:{instance.user_id}']
+    team_id = _team_of(instance)
+    if team_id:
+        names.append(f'assignments:team:{team_id}')
+    bump_versions(*names)
+
+
+@receiver([post_save, post_delete], sender=Notification)
+def notification_changed(sender, instance, **kwargs):
+    bump_versions(f'notifications:user:{instance.user_id}')
+
+
+@receiver([post_save, post_delete], sender=Approval)
+def approval_changed(sender, instance, **kwargs):
+    bump_versions('approvals')
@@ -0,0 +1,195 @@
+"""
+Slow query log.
+
+An execute wrapper installed on every database connection times each query.
+Queries slower than SLOW_QUERY_MS are grouped by fingerprint - the SQL with
+literals and IN-list lengths normalized, plus the view or job that ran it -
+and accumulated in slow_queries (calls, total, max). For SELECTs it also
+captures an EXPLAIN (ANALYZE, BUFFERS) plan: always with
+SLOW_QUERY_EXPLAIN=always (development), for SLOW_QUERY_EXPLAIN_SAMPLE_RATE
+of slow queries with =sample, never with =off (the default); each fingerprint
+at most once per EXPLAIN_INTERVAL per process. ANALYZE runs the query again,
+so locking reads and SELECTs calling functions with side effects are never
+explained. The admin ranks fingerprints by total time.
+"""
+import contextvars
+import hashlib
+import logging
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.backends.signals import connection_created
+from django.utils import timezone
+
+
+logger = logging.getLogger(__name__)
+
+EXPLAIN_INTERVAL = timedelta(hours=1)
+
+_source = contextvars.ContextVar('slow_query_source', default='')
+# Set while this module runs its own statements, so they are not timed
+_busy = threading.local()
+_explained_at = {}
+
+UPSERT_SQL = '''
+    INSERT INTO slow_queries (fingerprint, source, normalized_sql, example_sql, calls, total_ms, max_ms,
+                              plan, plan_captured_at, first_seen, last_seen)
+    VALUES (%(fingerprint)s, %(source)s, %(normalized)s, %(sql)s, 1, %(ms)s, %(ms)s,
+            %(plan)s, CASE WHEN %(plan)s <> '' THEN %(now)s END, %(now)s, %(now)s)
+    ON CONFLICT (fingerprint) DO UPDATE SET
+        calls = slow_queries.calls + 1,
+        total_ms = slow_queries.total_ms + EXCLUDED.total_ms,
+        max_ms = GREATEST(slow_queries.max_ms, EXCLUDED.max_ms),
+        example_sql = CASE WHEN EXCLUDED.max_ms >= slow_queries.max_ms
+                           THEN EXCLUDED.example_sql ELSE slow_queries.example_sql END,
+        plan = CASE WHEN EXCLUDED.plan <> '' THEN EXCLUDED.plan ELSE slow_queries.plan END,
+        plan_captured_at = COALESCE(EXCLUDED.plan_captured_at, slow_queries.plan_captured_at),
+        last_seen = EXCLUDED.last_seen
+'''
+
+_NORMALIZE = [
+    (re.compile(r"'(?:[^']|'')*'"), '?'),
+    (re.compile(r'\b\d+(?:\.\d+)?\b'), '?'),
+    (re.compile(r'%s'), '?'),
+    # IN lists of any length, including one, and multi-row VALUES fold to one shape
+    (re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.IGNORECASE), 'IN (...)'),
+    (re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)'), '(...)'),
+    (re.compile(r'\((?:\.\.\.|\?)\)(?:\s*,\s*\((?:\.\.\.|\?)\))+'), '(...)'),
+    (re.compile(r'\s+'), ' '),
+]
+
+_LOCKING_RE = re.compile(r'\bFOR (?:NO KEY |KEY )?(?:UPDATE|SHARE)\b', re.IGNORECASE)
+
+# Functions whose second run would change something: sequences, locks, notifications, settings
+_SIDE_EFFECT_RE = re.compile(
+    r'\b(?:nextval|setval|pg_(?:try_)?advisory_(?:xact_)?lock(?:_shared)?|pg_notify|set_config'
+    r'|pg_(?:cancel|terminate)_backend|lo_\w+)\s*\(',
+    re.IGNORECASE,
+)
+
+
+@contextmanager
+def source(name):
+    """Attribute queries run in this block to `name` (a view or job)"""
+    token = _source.set(name)
+    try:
+        yield
+    finally:
+        _source.reset(token)
+
+
+def set_source(name):
+    """Attribute the rest of the current source() block to `name`"""
+    _source.set(name)
+
+
+def normalize(sql):
+    for pattern, replacement in _NORMALIZE:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+def fingerprint(normalized, source_name):
+    return hashlib.sha1(f'{source_name}\n{normalized}'.encode()).hexdigest()
+
+
+def _should_explain(sql, many, digest):
+    mode = settings.SLOW_QUERY_EXPLAIN
+    if mode == 'off' or many or not sql.lstrip()[:6].upper() == 'SELECT':
+        return False
+    # ANALYZE runs the query again: a locking read would lock more rows (SKIP LOCKED takes the next ones),
+    # and nextval() and friends would take effect twice
+    if _LOCKING_RE.search(sql) or _SIDE_EFFECT_RE.search(sql):
+        return False
+    if mode == 'sample' and random.random() >= settings.SLOW_QUERY_EXPLAIN_SAMPLE_RATE:
+        return False
+    last = _explained_at.get(digest)
+    return last is None or timezone.now() - last >= EXPLAIN_INTERVAL
+
+
+def _explain(connection, sql, params):
+    """EXPLAIN (ANALYZE, BUFFERS) the query again; '' if that fails"""
+    try:
+        # Savepoint, so a failing EXPLAIN cannot break the caller's transaction
+        with transaction.atomic(using=connection.alias):
+            with connection.cursor() as cursor:
+                cursor.execute(f'EXPLAIN (ANALYZE, BUFFERS) {sql}', params)
+                return '\n'.join(row[0] for row in cursor.fetchall())
+    except Exception:
+        logger.warning('Could not EXPLAIN slow query', exc_info=True)
+        return ''
+
+
+def _record(values):
+    # Always on the primary: the slow query may have run on the read-only replica
+    _busy.active = True
+    try:
+        with connections['default'].cursor() as cursor:
+            cursor.execute(UPSERT_SQL, values)
+    except Exception:
+        logger.warning('Could not record slow query', exc_info=True)
+    finally:
+        _busy.active = False
+
+
+class SlowQueryWrapper:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __call__(self, execute, sql, params, many, context):
+        if getattr(_busy, 'active', False):
+            return execute(sql, params, many, context)
+
+        started = time.perf_counter()
+        result = execute(sql, params, many, context)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if elapsed_ms >= settings.SLOW_QUERY_MS:
+            self.slow(sql, params, many, elapsed_ms)
+        return result
+
+    def slow(self, sql, params, many, elapsed_ms):
+        source_name = _source.get()
+        normalized = normalize(sql)
+        digest = fingerprint(normalized, source_name)
+
+        plan = ''
+        if _should_explain(sql, many, digest):
+            _busy.active = True
+            try:
+                plan = _explain(self.connection, sql, params)
+            finally:
+                _busy.active = False
+            if plan:
+                _explained_at[digest] = timezone.now()
+
+        values = {
+            'fingerprint': digest,
+            'source': source_name[:200],
+            'normalized': normalized,
+            'sql': sql,
+            'ms': elapsed_ms,
+            'plan': plan,
+            'now': timezone.now(),
+        }
+        if connections['default'].in_atomic_block:
+            # Written after commit; a rolled-back transaction's slow queries are dropped
+            transaction.on_commit(lambda: _record(values), using='default')
+        else:
+            _record(values)
+
+
+def _install(sender, connection, **kwargs):
+    if not any(isinstance(wrapper, SlowQueryWrapper) for wrapper in connection.execute_wrappers):
+        # First, not last: connection.execute_wrapper() blocks pop() the last wrapper on exit
+        connection.execute_wrappers.insert(0, SlowQueryWrapper(connection))
+
+
+def install():
+    """Time queries on every connection (called from CoreConfig.ready)"""
+    if settings.SLOW_QUERY_MS > 0:
+        connection_created.connect(_install, dispatch_uid='core.slow_queries')
@@ -0,0 +1,105 @@
+"""
+Process start-up: warm-up and readiness.
+
+warm_up() does the one-time work the first request would otherwise pay for:
+building the URL resolvers, introspecting the serializers, reading the SPA
+shell and opening the database connection. Under gunicorn (gunicorn.conf.py)
+the master runs it without the database before forking, so workers share the
+warmed state, and each worker then connects in post_worker_init before it
+accepts requests. GET /health/ready reports 503 until this process is warm
+and its database answers.
+"""
+import logging
+import threading
+import time
+from django.db import connection
+from django.http import Http404
+from django.urls import get_resolver, resolve, reverse
+from .db_routing import replica_health, replica_status
+
+
+logger = logging.getLogger(__name__)
+
+# Import of this module is close enough to process start for the report
+PROCESS_STARTED = time.monotonic()
+
+_lock = threading.Lock()
+_state = {'ready': False, 'seconds_to_ready': None, 'steps': {}}
+
+
+def _warm_urls():
+    get_resolver().url_patterns
+    resolve('/api/v1/courses/')
+    reverse('health_db')
+
+
+def _warm_serializers():
+    from . import serializers
+    for serializer_class in (
+        serializers.CourseSerializer, serializers.AssignmentSerializer, serializers.NotificationSerializer,
+        serializers.UserSerializer, serializers.TeamSerializer,
+    ):
+        serializer_class().fields
+
+
+def _warm_spa_index():
+    from config.views import _load_index
+    try:
+        _load_index()
+    except Http404:
+        pass
+
+
+def _warm_database():
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT 1')
+    replica_status()
+
+
+def warm_up(connect=True):
+    """
+    Run the warm-up steps (the database one only with connect=True) and
+    return {step: milliseconds}. A failing step is logged, not raised.
+    """
+    steps = [('urls', _warm_urls), ('serializers', _warm_serializers), ('spa_index', _warm_spa_index)]
+    if connect:
+        steps.append(('database', _warm_database))
+
+    timings = {}
+    ok = True
+    with _lock:
+        for name, step in steps:
+            started = time.perf_counter()
+            try:
+                step()
+            except Exception:
+                logger.exception('Warm-up step %s failed', name)
+                ok = False
+            timings[name] = round((time.perf_counter() - started) * 1000, 1)
+        _state['steps'].update(timings)
+        if connect and ok and not _state['ready']:
+            _state['ready'] = True
+            _state['seconds_to_ready'] = round(time.monotonic() - PROCESS_STARTED, 3)
+    return timings
+
+
+def after_fork():
+    """Reset state a forked worker must not share with the master"""
+    replica_health.lock = threading.Lock()
+    replica_health.checked_at = float('-inf')
+
+
+def readiness():
+    """
+    (ready, details) for this process. A process that was never warmed (e.g.
+    runserver) warms up on the first call.
+    """
+    if not _state['ready']:
+        warm_up()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT 1')
+        database = True
+    except Exception:
+        database = False
+    return _state['ready'] and database, {**_state, 'database': database}
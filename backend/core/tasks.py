@@ -0,0 +1,163 @@
+"""
+Background task handlers. See core/jobs.py for the queue itself.
+"""
+import csv
+import uuid
+from datetime import timedelta
+from django.conf import settings
+from django.utils.dateparse import parse_datetime
+from . import (
+    certificates, counters, heartbeats, leaderboards, outbox, recommendations, reminders, sync, throttling
+)
+from .cache_utils import bump_versions
+from .db_routing import replica_reads
+from .jobs import task
+from .models import User, Course, Assignment, Notification
+
+
+BATCH_SIZE = 1000
+
+
+@task('assignments.bulk_assign')
+def bulk_assign(payload):
+    """Assign every course in course_ids to every user in user_ids (upsert)"""
+    user_ids = list(User.objects.filter(id__in=payload['user_ids']).values_list('id', flat=True))
+    course_ids = list(Course.objects.filter(id__in=payload['course_ids']).values_list('id', flat=True))
+    assigned_by_id = payload.get('assigned_by')
+    due_at = parse_datetime(payload['due_at']) if payload.get('due_at') else None
+
+    pairs = Assignment.objects.filter(user_id__in=user_ids, course_id__in=course_ids)
+    existing = set(pairs.values_list('user_id', 'course_id'))
+
+    new_assignments = [
+        Assignment(
+            user_id=user_id,
+            course_id=course_id,
+            assigned_by_id=assigned_by_id,
+            status='not_started',
+            progress_pct=0,
+            due_at=due_at,
+        )
+        for user_id in user_ids
+        for course_id in course_ids
+        if (user_id, course_id) not in existing
+    ]
+    Assignment.objects.bulk_create(new_assignments, batch_size=BATCH_SIZE, ignore_conflicts=True)
+    # bulk_create skips signals: recount the touched courses and learners exactly
+    counters.recompute(course_ids=course_ids, user_ids=user_ids)
+
+    # Reassigning updates assigned_by, as the single-assignment endpoint does
+    reassigned = pairs.exclude(assigned_by_id=assigned_by_id).update(assigned_by_id=assigned_by_id)
+    if due_at:
+        reminders.set_due_dates(pairs, due_at)
+
+    team_ids = set(User.objects.filter(id__in=user_ids, team__isnull=False).values_list('team_id', flat=True))
+    bump_versions(
+        *[f'assignments:user:{user_id}' for user_id in user_ids],
+        *[f'assignments:team:{team_id}' for team_id in team_ids],
+    )
+
+    return {'created': len(new_assignments), 'reassigned': reassigned}
+
+
+@task('assignments.export_csv')
+def export_assignments(payload):
+    """Write the assignments in scope to a CSV file under EXPORTS_ROOT"""
+    assignments = Assignment.objects.all()
+    if payload.get('team_id'):
+        assignments = assignments.filter(user__team_id=payload['team_id'])
+
+    rows = assignments.order_by('id').values_list(
+        'user__email', 'user__first_name', 'user__last_name', 'course__title',
+        'status', 'progress_pct', 'assigned_at', 'last_activity_at', 'completed_at',
+    )
+
+    settings.EXPORTS_ROOT.mkdir(parents=True, exist_ok=True)
+    file_name = f'assignments-{uuid.uuid4().hex}.csv'
+    count = 0
+    # A long sequential scan: keep it off the primary when a replica is available
+    with replica_reads(), open(settings.EXPORTS_ROOT / file_name, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow([
+            'email', 'first_name', 'last_name', 'course', 'status', 'progress_pct',
+            'assigned_at', 'last_activity_at', 'completed_at',
+        ])
+        for row in rows.iterator(chunk_size=BATCH_SIZE):
+            writer.writerow(row)
+            count += 1
+
+    return {'file': file_name, 'rows': count}
+
+
+@task('notifications.broadcast')
+def broadcast_notification(payload):
+    """Send one notification text to every active user in scope"""
+    users = User.objects.filter(is_active=True)
+    if payload.get('team_id'):
+        users = users.filter(team_id=payload['team_id'])
+    if payload.get('role'):
+        users = users.filter(role=payload['role'])
+
+    sent = 0
+    batch = []
+    for user_id in users.values_list('id', flat=True).iterator(chunk_size=BATCH_SIZE):
+        batch.append(Notification(user_id=user_id, text=payload['text']))
+        if len(batch) >= BATCH_SIZE:
+            Notification.objects.bulk_create(batch)
+            sent += len(batch)
+            batch = []
+    if batch:
+        Notification.objects.bulk_create(batch)
+        sent += len(batch)
+
+    bump_versions('notifications:broadcast')
+    return {'sent': sent}
+
+
+@task('email.send_outbox', every=timedelta(seconds=30))
+def send_outbox(payload):
+    """Deliver pending outbox emails; bounded so one run cannot hold a worker slot for long"""
+    sent, failed = outbox.drain(max_batches=10)
+    return {'sent': sent, 'failed': failed}
+
+
+@task('throttle.prune_buckets', every=timedelta(minutes=15))
+def prune_throttle_buckets(payload):
+    return {'deleted': throttling.prune_buckets()}
+
+
+@task('counters.repair', every=timedelta(hours=24))
+def repair_counters(payload):
+    """Safety net for the stored counters; returns how many rows had drifted"""
+    return {kind: len(counters.repair(kind)) for kind in ('courses', 'learners', 'teams')}
+
+
+@task('leaderboards.refresh', every=leaderboards.REFRESH_INTERVAL)
+def refresh_leaderboards(payload):
+    return {'entries': leaderboards.refresh()}
+
+
+@task('recommendations.refresh', every=recommendations.REFRESH_INTERVAL)
+def refresh_recommendations(payload):
+    return {'courses': recommendations.refresh()}
+
+
+@task('assignments.send_reminders', every=timedelta(minutes=15))
+def send_due_reminders(payload):
+    return {'sent': reminders.scan()}
+
+
+@task('progress.flush_heartbeats', every=timedelta(seconds=settings.HEARTBEAT_FLUSH_SECONDS))
+def flush_heartbeats(payload):
+    return heartbeats.flush()
+
+
+@task('sync.prune_change_log', every=timedelta(hours=24))
+def prune_change_log(payload):
+    return {'deleted': sync.prune()}
+
+
+@task('certificates.generate')
+def generate_certificates(payload):
+    """Render the certificates of the completed assignments in the payload's scope"""
+    return certificates.generate(certificates.scope(payload))
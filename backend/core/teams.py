@@ -0,0 +1,55 @@
+"""
+Team membership changes.
+
+Team.member_count is stored, not counted: every change of users.team_id goes
+either through move_members() (bulk, one UPDATE) or through User.save()/delete(),
+whose signal handler calls adjust_member_counts().
+"""
+from collections import Counter
+from django.db import transaction
+from django.db.models import F
+from .cache_utils import bump_versions
+from .models import User, Team
+
+
+def adjust_member_counts(deltas):
+    """Apply {team_id: delta} to Team.member_count atomically"""
+    # Fixed order so concurrent moves lock team rows in the same order
+    for team_id in sorted(team_id for team_id, delta in deltas.items() if team_id and delta):
+        Team.objects.filter(id=team_id).update(member_count=F('member_count') + deltas[team_id])
+
+
+def move_members(user_ids, team):
+    """
+    Move the given users into `team` (None removes them from their team) with
+    one UPDATE, adjusting the member count of every team involved.
+    Users already in `team` are left alone. Returns the ids of moved users.
+    """
+    team_id = team.id if team else None
+    with transaction.atomic():
+        # Lock the rows so the teams they leave are known exactly
+        moved = list(
+            User.objects.filter(id__in=user_ids)
+            .exclude(team_id=team_id)
+            .select_for_update()
+            .values_list('id', 'team_id')
+        )
+        if not moved:
+            return []
+
+        moved_ids = [user_id for user_id, _ in moved]
+        User.objects.filter(id__in=moved_ids).update(team_id=team_id)
+
+        deltas = Counter()
+        for _, old_team_id in moved:
+            deltas[old_team_id] -= 1
+        deltas[team_id] += len(moved)
+        adjust_member_counts(deltas)
+
+        team_ids = {old_team_id for _, old_team_id in moved} | {team_id}
+        bump_versions(
+            *[f'user:{user_id}' for user_id in moved_ids],
+            *[f'team:{changed}' for changed in team_ids if changed],
+            *[f'assignments:team:{changed}' for changed in team_ids if changed],
+        )
+    return moved_ids
@@ -0,0 +1,102 @@
+from django.test import TestCase
+from django.utils import timezone
+from core.approvals import CLAIM_TIMEOUT
+from core.jwt_utils import create_access_token
+from core.models import User, Course, Approval
+
+
+class ApprovalClaimTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.alice = User.objects.create_user('alice@example.com', 'secret', role='ADMIN')
+        cls.bob = User.objects.create_user('bob@example.com', 'secret', role='ADMIN')
+        cls.manager = User.objects.create_user('manager@example.com', 'secret', role='MANAGER')
+
+    def request_approval(self, title):
+        course = Course.objects.create(title=title, status='awaiting_approval', created_by=self.manager)
+        return Approval.objects.create(course=course, requested_by=self.manager)
+
+    def post(self, user, path, data=None):
+        return self.client.post(
+            path, data or {}, content_type='application/json',
+            HTTP_AUTHORIZATION=f'Bearer {create_access_token(user)}',
+        )
+
+    def claim(self, user, limit=10):
+        response = self.post(user, '/api/v1/approvals/claim/', {'limit': limit})
+        self.assertEqual(response.status_code, 200)
+        return [approval['id'] for approval in response.json()]
+
+    def bulk_decide(self, user, approval_ids, decision='approve'):
+        return self.post(user, '/api/v1/approvals/bulk_decide/', {'decision': decision, 'approval_ids': approval_ids})
+
+    def test_claimed_approvals_are_not_handed_out_twice(self):
+        first, second = self.request_approval('One'), self.request_approval('Two')
+
+        self.assertEqual(self.claim(self.alice, limit=1), [first.id])
+        self.assertEqual(self.claim(self.bob), [second.id])
+        self.assertEqual(self.claim(self.bob), [second.id])
+
+    def test_only_the_claimant_can_decide(self):
+        approval = self.request_approval('Claimed')
+        self.claim(self.alice)
+
+        response = self.bulk_decide(self.bob, [approval.id])
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['skipped'], [approval.id])
+        approval.refresh_from_db()
+        self.assertEqual(approval.status, 'pending')
+
+        response = self.bulk_decide(self.alice, [approval.id])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'decided': [approval.id], 'courses': [approval.course_id], 'skipped': []})
+        approval.course.refresh_from_db()
+        self.assertEqual(approval.course.status, 'published')
+
+    def test_mixed_batch_decides_the_unclaimed_rows(self):
+        claimed, free = self.request_approval('Claimed'), self.request_approval('Free')
+        self.claim(self.alice, limit=1)
+
+        response = self.bulk_decide(self.bob, [claimed.id, free.id], decision='reject')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['decided'], [free.id])
+        self.assertEqual(response.json()['skipped'], [claimed.id])
+
+    def test_expired_claim_can_be_taken_over(self):
+        approval = self.request_approval('Abandoned')
+        self.claim(self.alice)
+        Approval.objects.filter(id=approval.id).update(claimed_at=timezone.now() - CLAIM_TIMEOUT - CLAIM_TIMEOUT)
+
+        self.assertEqual(self.claim(self.bob), [approval.id])
+        self.assertEqual(self.bulk_decide(self.bob, [approval.id]).status_code, 200)
+
+    def test_publish_respects_the_claim(self):
+        approval = self.request_approval('Claimed')
+        self.claim(self.alice)
+        path = f'/api/v1/courses/{approval.course_id}/publish/'
+
+        response = self.client.patch(path, HTTP_AUTHORIZATION=f'Bearer {create_access_token(self.bob)}')
+        self.assertEqual(response.status_code, 409)
+
+        response = self.client.patch(path, HTTP_AUTHORIZATION=f'Bearer {create_access_token(self.alice)}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], 'published')
+
+    def test_course_awaiting_approval_without_a_request_is_decided_directly(self):
+        approve = Course.objects.create(title='Orphan', status='awaiting_approval', created_by=self.manager)
+        reject = Course.objects.create(title='Orphan too', status='awaiting_approval', created_by=self.manager)
+
+        response = self.client.patch(
+            f'/api/v1/courses/{approve.id}/publish/', HTTP_AUTHORIZATION=f'Bearer {create_access_token(self.alice)}'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], 'published')
+
+        response = self.post(self.alice, f'/api/v1/courses/{reject.id}/reject/', {'note': 'Too short'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], 'draft')
+
+    def test_rejecting_a_published_course_conflicts(self):
+        course = Course.objects.create(title='Live', status='published', created_by=self.manager)
+        response = self.post(self.alice, f'/api/v1/courses/{course.id}/reject/')
+        self.assertEqual(response.status_code, 409)
@@ -0,0 +1,64 @@
+from django.test import TestCase
+from django.utils import timezone
+from core import certificates
+from core.jwt_utils import create_access_token
+from core.models import Assignment, Certificate, CertificateFile, Course, User
+
+
+class CertificateTests(TestCase):
+    def setUp(self):
+        self.learner = User.objects.create_user(
+            'learner@example.com', 'secret', first_name='Ada', last_name='Lovelace', role='EMPLOYEE'
+        )
+        self.course = Course.objects.create(title='Analytical Engines', status='published', created_by=self.learner)
+        self.assignment = Assignment.objects.create(
+            user=self.learner, course=self.course, status='completed', progress_pct=100, completed_at=timezone.now(),
+        )
+
+    def get(self, path):
+        return self.client.get(path, HTTP_AUTHORIZATION=f'Bearer {create_access_token(self.learner)}')
+
+    def test_generate_stores_content_and_skips_unchanged(self):
+        self.assertEqual(certificates.generate(Assignment.objects.all()), {'generated': 1, 'unchanged': 0})
+        certificate = Certificate.objects.get(assignment=self.assignment)
+        content = bytes(CertificateFile.objects.get(digest=certificate.digest).content)
+        self.assertIn(b'Ada Lovelace', content)
+        self.assertIn(b'Analytical Engines', content)
+
+        self.assertEqual(certificates.generate(Assignment.objects.all()), {'generated': 0, 'unchanged': 1})
+
+    def test_rename_rewrites_and_prune_drops_the_old_file(self):
+        certificates.generate(Assignment.objects.all())
+        old_digest = Certificate.objects.get(assignment=self.assignment).digest
+
+        User.objects.filter(id=self.learner.id).update(last_name='King')
+        self.assertEqual(certificates.generate(Assignment.objects.all()), {'generated': 1, 'unchanged': 0})
+        new_digest = Certificate.objects.get(assignment=self.assignment).digest
+        self.assertNotEqual(new_digest, old_digest)
+
+        self.assertEqual(certificates.prune_files(), 1)
+        self.assertEqual(list(CertificateFile.objects.values_list('digest', flat=True)), [new_digest])
+
+    def test_incomplete_assignments_get_no_certificate(self):
+        Assignment.objects.filter(id=self.assignment.id).update(status='in_progress', completed_at=None)
+        self.assertEqual(certificates.generate(Assignment.objects.all()), {'generated': 0, 'unchanged': 0})
+
+    def test_certificate_is_served_immutable(self):
+        certificates.generate(Assignment.objects.all())
+        ready = self.get(f'/api/v1/assignments/{self.assignment.id}/certificate/')
+        self.assertEqual(ready.status_code, 200)
+        self.assertEqual(ready.json()['status'], 'ready')
+
+        response = self.get(ready.json()['url'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/svg+xml')
+        self.assertIn('immutable', response['Cache-Control'])
+        self.assertIn(b'Ada Lovelace', response.content)
+
+    def test_missing_file_is_queued_again(self):
+        certificates.generate(Assignment.objects.all())
+        CertificateFile.objects.all().delete()
+
+        response = self.get(f'/api/v1/assignments/{self.assignment.id}/certificate/')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json(), {'status': 'pending'})
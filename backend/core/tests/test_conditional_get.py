@@ -0,0 +1,49 @@
+from django.test import TestCase
+from core.jwt_utils import create_access_token
+from core.models import User, Course
+
+
+class CompressedConditionalGetTests(TestCase):
+    """Compressed responses carry weak ETags; sending one back must still give 304"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('learner@example.com', 'secret', role='EMPLOYEE')
+        # Well over API_COMPRESSION_MIN_BYTES, so the detail response is compressed
+        cls.course = Course.objects.create(
+            title='Compression', description='Long description. ' * 200, status='published', created_by=cls.user,
+        )
+
+    def get(self, encoding, **headers):
+        return self.client.get(
+            f'/api/v1/courses/{self.course.id}/',
+            HTTP_AUTHORIZATION=f'Bearer {create_access_token(self.user)}',
+            HTTP_ACCEPT_ENCODING=encoding,
+            **headers,
+        )
+
+    def assert_revalidates(self, encoding):
+        first = self.get(encoding)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first['Content-Encoding'], encoding)
+        self.assertTrue(first['ETag'].startswith('W/"'))
+
+        second = self.get(encoding, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, 304)
+
+    def test_brotli_response_revalidates(self):
+        self.assert_revalidates('br')
+
+    def test_gzip_response_revalidates(self):
+        self.assert_revalidates('gzip')
+
+    def test_strong_tag_matches_compressed_response(self):
+        first = self.get('gzip')
+        strong = first['ETag'][2:]
+        self.assertEqual(self.get('identity', HTTP_IF_NONE_MATCH=strong).status_code, 304)
+
+    def test_wildcard_matches(self):
+        self.assertEqual(self.get('br', HTTP_IF_NONE_MATCH='*').status_code, 304)
+
+    def test_other_tag_does_not_match(self):
+        self.assertEqual(self.get('br', HTTP_IF_NONE_MATCH='W/"other", "another"').status_code, 200)
@@ -0,0 +1,45 @@
+from django.test import TestCase
+from core.jwt_utils import create_access_token
+from core.models import User, Course, Resource
+
+
+class CourseLookupTests(TestCase):
+    """Malformed ids in the URL or query string are client errors, not 500s"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('learner@example.com', 'secret', role='EMPLOYEE')
+        cls.course = Course.objects.create(title='Lookups', status='published', created_by=cls.user)
+        cls.resource = Resource.objects.create(
+            course=cls.course, title='Intro', resource_type='pdf', viewer_url='https://example.com/intro',
+        )
+
+    def get(self, path):
+        return self.client.get(path, HTTP_AUTHORIZATION=f'Bearer {create_access_token(self.user)}')
+
+    def test_course_detail_with_non_integer_id_is_404(self):
+        self.assertEqual(self.get('/api/v1/courses/abc/').status_code, 404)
+        self.assertEqual(self.get('/api/v1/courses/abc/resources/').status_code, 404)
+
+    def test_course_detail_with_unknown_id_is_404(self):
+        self.assertEqual(self.get(f'/api/v1/courses/{self.course.id + 1000}/').status_code, 404)
+
+    def test_course_detail(self):
+        response = self.get(f'/api/v1/courses/{self.course.id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['id'], self.course.id)
+
+    def test_resources_filtered_by_course(self):
+        other = Course.objects.create(title='Other', status='published', created_by=self.user)
+        Resource.objects.create(
+            course=other, title='Elsewhere', resource_type='pdf', viewer_url='https://example.com/elsewhere',
+        )
+
+        response = self.get(f'/api/v1/resources/?course={self.course.id}')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([resource['id'] for resource in response.json()], [self.resource.id])
+
+    def test_resources_with_non_integer_course_is_400(self):
+        response = self.get('/api/v1/resources/?course=abc')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': 'course must be an integer'})
@@ -0,0 +1,66 @@
+import unittest
+from django.db import connection
+from django.test import TestCase
+from core import heartbeats
+from core.jwt_utils import create_access_token
+from core.models import User, Course, Assignment, ProgressEvent, ProgressHeartbeat
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', 'the heartbeat buffer is Postgres SQL')
+class HeartbeatTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.learner = User.objects.create_user('learner@example.com', 'secret', role='EMPLOYEE')
+        cls.other = User.objects.create_user('other@example.com', 'secret', role='EMPLOYEE')
+        cls.course = Course.objects.create(title='Video', status='published', created_by=cls.learner)
+        cls.assignment = Assignment.objects.create(user=cls.learner, course=cls.course)
+
+    def beat(self, user=None, **data):
+        return self.client.post(
+            f'/api/v1/assignments/{self.assignment.id}/heartbeat/', data, content_type='application/json',
+            HTTP_AUTHORIZATION=f'Bearer {create_access_token(user or self.learner)}',
+        )
+
+    def test_heartbeats_are_buffered_then_merged_by_the_flush(self):
+        self.assertEqual(self.beat(position_seconds=15, watched_seconds=15, progress_pct=10).status_code, 204)
+        self.assertEqual(self.beat(position_seconds=30, watched_seconds=15, progress_pct=20).status_code, 204)
+        self.assertEqual(self.beat(position_seconds=25, watched_seconds=500, progress_pct=15).status_code, 204)
+
+        self.assignment.refresh_from_db()
+        self.assertEqual((self.assignment.progress_pct, self.assignment.watch_seconds), (0, 0))
+        self.assertEqual(ProgressHeartbeat.objects.get(assignment=self.assignment).beats, 3)
+
+        self.assertEqual(heartbeats.flush()['assignments'], 1)
+
+        self.assignment.refresh_from_db()
+        self.assertEqual(self.assignment.progress_pct, 20)
+        self.assertEqual(self.assignment.status, 'in_progress')
+        self.assertEqual(self.assignment.position_seconds, 25)
+        self.assertEqual(self.assignment.watch_seconds, 15 + 15 + heartbeats.MAX_WATCH_PER_BEAT)
+        events = ProgressEvent.objects.filter(assignment=self.assignment).values_list('progress_pct', flat=True)
+        self.assertEqual(list(events), [20])
+        self.assertFalse(ProgressHeartbeat.objects.exists())
+        self.assertEqual(heartbeats.flush()['assignments'], 0)
+
+    def test_flush_completes_the_assignment(self):
+        self.beat(position_seconds=600, watched_seconds=15, progress_pct=100)
+        heartbeats.flush()
+
+        self.assignment.refresh_from_db()
+        self.assertEqual(self.assignment.status, 'completed')
+        self.assertIsNotNone(self.assignment.completed_at)
+
+    def test_out_of_range_values_are_rejected(self):
+        for data in (
+            {'position_seconds': 2 ** 31, 'watched_seconds': 15},
+            {'position_seconds': 10, 'watched_seconds': 2 ** 31},
+            {'position_seconds': -1, 'watched_seconds': 15},
+            {'position_seconds': 10, 'watched_seconds': 15, 'progress_pct': 101},
+            {'watched_seconds': 15},
+        ):
+            self.assertEqual(self.beat(**data).status_code, 400, data)
+        self.assertEqual(self.beat(position_seconds=heartbeats.MAX_SECONDS, watched_seconds=15).status_code, 204)
+
+    def test_only_the_assigned_learner_can_report(self):
+        self.assertEqual(self.beat(self.other, position_seconds=10, watched_seconds=10).status_code, 404)
+        self.assertFalse(ProgressHeartbeat.objects.exists())
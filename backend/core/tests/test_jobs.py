@@ -0,0 +1,168 @@
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase
+from django.utils import timezone
+from core import jobs
+from core.models import Job
+
+
+QUEUE = 'tests'
+
+_seen_locks = []
+
+
+@jobs.task('tests.succeed')
+def succeed(payload):
+    return {'echo': payload}
+
+
+@jobs.task('tests.fail')
+def fail(payload):
+    raise RuntimeError('boom')
+
+
+@jobs.task('tests.slow')
+def slow(payload):
+    # Long enough for several lease renewals; records the lock as the worker saw it
+    deadline = time.monotonic() + payload['seconds']
+    while time.monotonic() < deadline:
+        _seen_locks.append(Job.objects.filter(id=payload['job_id']).values_list('locked_at', flat=True).first())
+        time.sleep(0.05)
+
+
+def enqueue(task_name, **kwargs):
+    return jobs.enqueue(task_name, queue=QUEUE, **kwargs)
+
+
+class QueueTests(TestCase):
+    def test_claim_takes_highest_priority_ready_jobs(self):
+        low = enqueue('tests.succeed', priority=0)
+        high = enqueue('tests.succeed', priority=5)
+        enqueue('tests.succeed', run_at=timezone.now() + timedelta(hours=1))
+
+        claimed = jobs.claim('worker-1', [QUEUE], limit=10)
+
+        self.assertEqual([job.id for job in claimed], [high.id, low.id])
+        for job in claimed:
+            self.assertEqual((job.status, job.locked_by, job.attempts), ('running', 'worker-1', 1))
+        self.assertEqual(jobs.claim('worker-2', [QUEUE], limit=10), [])
+
+    def test_success_stores_the_result(self):
+        enqueue('tests.succeed', payload={'n': 1})
+        job = jobs.claim('worker-1', [QUEUE], limit=1)[0]
+
+        self.assertTrue(jobs.run(job))
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'succeeded')
+        self.assertEqual(job.result, {'echo': {'n': 1}})
+        self.assertIsNotNone(job.finished_at)
+
+    def test_failure_is_retried_with_backoff_then_dead(self):
+        enqueue('tests.fail', max_attempts=2)
+        job = jobs.claim('worker-1', [QUEUE], limit=1)[0]
+
+        before = timezone.now()
+        self.assertFalse(jobs.run(job))
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'queued')
+        self.assertIn('RuntimeError: boom', job.last_error)
+        self.assertEqual(job.locked_by, '')
+        # First retry waits BACKOFF_BASE_SECONDS, +-20% jitter
+        delay = (job.run_at - before).total_seconds()
+        self.assertGreaterEqual(delay, jobs.BACKOFF_BASE_SECONDS * 0.8 - 1)
+        self.assertLessEqual(delay, jobs.BACKOFF_BASE_SECONDS * 1.2 + 1)
+
+        Job.objects.filter(id=job.id).update(run_at=timezone.now())
+        job = jobs.claim('worker-1', [QUEUE], limit=1)[0]
+        self.assertEqual(job.attempts, 2)
+        self.assertFalse(jobs.run(job))
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'dead')
+        self.assertEqual(jobs.claim('worker-1', [QUEUE], limit=1), [])
+
+        self.assertEqual(jobs.retry_dead([job.id]), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ('queued', 0))
+
+    def test_backoff_grows_and_is_capped(self):
+        for attempts in range(1, 6):
+            delay = jobs.backoff(attempts)
+            expected = jobs.BACKOFF_BASE_SECONDS * 2 ** (attempts - 1)
+            self.assertTrue(expected * 0.8 <= delay <= expected * 1.2)
+        self.assertLessEqual(jobs.backoff(50), jobs.BACKOFF_MAX_SECONDS * 1.2)
+
+    def test_unique_key_deduplicates_pending_jobs(self):
+        first = enqueue('tests.succeed', unique_key='tests:once')
+        self.assertEqual(enqueue('tests.succeed', unique_key='tests:once').id, first.id)
+
+        job = jobs.claim('worker-1', [QUEUE], limit=1)[0]
+        self.assertEqual(enqueue('tests.succeed', unique_key='tests:once').id, first.id)
+
+        jobs.run(job)
+        again = enqueue('tests.succeed', unique_key='tests:once')
+        self.assertNotEqual(again.id, first.id)
+        self.assertEqual(again.status, 'queued')
+
+    def test_unknown_task_is_rejected(self):
+        with self.assertRaises(ValueError):
+            enqueue('tests.missing')
+
+    def test_stale_running_jobs_are_requeued_or_dead(self):
+        retried = enqueue('tests.succeed')
+        exhausted = enqueue('tests.succeed', max_attempts=1)
+        fresh = enqueue('tests.succeed')
+        jobs.claim('worker-1', [QUEUE], limit=3)
+        stale_at = timezone.now() - jobs.LOCK_TIMEOUT - timedelta(minutes=1)
+        Job.objects.filter(id__in=[retried.id, exhausted.id]).update(locked_at=stale_at)
+
+        self.assertEqual(jobs.requeue_stale(), 2)
+
+        statuses = dict(Job.objects.filter(queue=QUEUE).values_list('id', 'status'))
+        self.assertEqual(statuses, {retried.id: 'queued', exhausted.id: 'dead', fresh.id: 'running'})
+
+
+class ConcurrentQueueTests(TransactionTestCase):
+    def test_claim_skips_rows_locked_by_another_worker(self):
+        locked = enqueue('tests.succeed', priority=5)
+        free = enqueue('tests.succeed')
+        holding, release = threading.Event(), threading.Event()
+
+        def hold_lock():
+            try:
+                with transaction.atomic():
+                    list(Job.objects.select_for_update().filter(id=locked.id))
+                    holding.set()
+                    release.wait(10)
+            finally:
+                connection.close()
+
+        holder = threading.Thread(target=hold_lock)
+        holder.start()
+        try:
+            self.assertTrue(holding.wait(10))
+            claimed = jobs.claim('worker-1', [QUEUE], limit=10)
+        finally:
+            release.set()
+            holder.join()
+
+        self.assertEqual([job.id for job in claimed], [free.id])
+        self.assertEqual([job.id for job in jobs.claim('worker-2', [QUEUE], limit=10)], [locked.id])
+
+    def test_lease_is_renewed_while_the_handler_runs(self):
+        _seen_locks.clear()
+        job = enqueue('tests.slow', payload={'seconds': 0.6})
+        Job.objects.filter(id=job.id).update(payload={'seconds': 0.6, 'job_id': job.id})
+        job = jobs.claim('worker-1', [QUEUE], limit=1)[0]
+        claimed_at = job.locked_at
+
+        with mock.patch.object(jobs, 'LEASE_RENEW_INTERVAL', timedelta(milliseconds=100)):
+            self.assertTrue(jobs.run(job))
+
+        renewed = {locked_at for locked_at in _seen_locks if locked_at and locked_at > claimed_at}
+        self.assertGreaterEqual(len(renewed), 2)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'succeeded')
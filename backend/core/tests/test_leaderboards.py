@@ -0,0 +1,55 @@
+import unittest
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+from core import leaderboards
+from core.jwt_utils import create_access_token
+from core.models import User, Team, Course, Assignment
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', 'rankings are built with Postgres SQL')
+class LeaderboardTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.team = Team.objects.create(name='Blue')
+        cls.other_team = Team.objects.create(name='Red')
+        cls.admin = User.objects.create_user('admin@example.com', 'secret', role='ADMIN')
+        cls.first = User.objects.create_user('first@example.com', 'secret', role='EMPLOYEE', team=cls.team)
+        cls.second = User.objects.create_user('second@example.com', 'secret', role='EMPLOYEE', team=cls.team)
+        cls.loner = User.objects.create_user('loner@example.com', 'secret', role='EMPLOYEE')
+        courses = [
+            Course.objects.create(title=f'Course {n}', status='published', created_by=cls.admin) for n in range(2)
+        ]
+        completed = {'status': 'completed', 'progress_pct': 100, 'completed_at': timezone.now()}
+        for course in courses:
+            Assignment.objects.create(user=cls.first, course=course, **completed)
+        Assignment.objects.create(user=cls.second, course=courses[0], **completed)
+        leaderboards.refresh()
+
+    def get(self, user, **params):
+        return self.client.get('/api/v1/leaderboard', params, HTTP_AUTHORIZATION=f'Bearer {create_access_token(user)}')
+
+    def test_team_ranking(self):
+        response = self.get(self.second)
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual(payload['scope'], f'team:{self.team.id}')
+        self.assertEqual([(entry['rank'], entry['completions']) for entry in payload['top']], [(1, 2), (2, 1)])
+        self.assertEqual(payload['me']['user']['id'], self.second.id)
+
+    def test_admin_picks_a_team(self):
+        response = self.get(self.admin, team_id=self.team.id)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['scope'], f'team:{self.team.id}')
+
+    def test_admin_team_id_must_be_an_existing_team(self):
+        self.assertEqual(self.get(self.admin, team_id='abc').status_code, 400)
+        self.assertEqual(self.get(self.admin, team_id=self.other_team.id + 1000).status_code, 400)
+
+    def test_team_id_is_ignored_for_learners(self):
+        response = self.get(self.first, team_id=self.other_team.id)
+        self.assertEqual(response.json()['scope'], f'team:{self.team.id}')
+
+    def test_learner_without_a_team(self):
+        self.assertEqual(self.get(self.loner).status_code, 400)
+        self.assertEqual(self.get(self.loner, scope='org').status_code, 200)
@@ -0,0 +1,60 @@
+from smtplib import SMTPException
+from django.core import mail
+from django.core.mail.backends.base import BaseEmailBackend
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from core import outbox
+from core.models import OutboundEmail, User
+
+
+class RefusingBackend(BaseEmailBackend):
+    """An SMTP server that is down"""
+
+    def send_messages(self, email_messages):
+        raise SMTPException('Connection refused')
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class OutboxTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('learner@example.com', 'secret', first_name='Ada')
+
+    def test_drain_sends_due_emails_and_blanks_their_bodies(self):
+        outbox.queue_password_reset(self.user, 'reset-token')
+        outbox.queue_invite(self.user, 'invite-token', self.user)
+        later = outbox.queue_email('invite', 'later@example.com', 'Later', 'body')
+        OutboundEmail.objects.filter(id=later.id).update(next_attempt_at=timezone.now() + outbox.CLAIM_TIMEOUT)
+
+        self.assertEqual(outbox.drain(rate=0), (2, 0))
+
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertEqual(mail.outbox[0].to, ['learner@example.com'])
+        self.assertIn('token=reset-token', mail.outbox[0].body)
+        sent = OutboundEmail.objects.filter(status='sent')
+        self.assertEqual(sent.count(), 2)
+        self.assertEqual(set(sent.values_list('body', flat=True)), {''})
+        self.assertEqual(set(sent.values_list('attempts', flat=True)), {1})
+        self.assertEqual(OutboundEmail.objects.get(id=later.id).status, 'pending')
+
+    def test_claimed_emails_are_not_handed_to_another_sender(self):
+        outbox.queue_password_reset(self.user, 'reset-token')
+
+        self.assertEqual(len(outbox.claim_batch(10)), 1)
+        self.assertEqual(outbox.claim_batch(10), [])
+
+    def test_failures_back_off_then_give_up(self):
+        email = outbox.queue_password_reset(self.user, 'reset-token')
+        connection = RefusingBackend()
+
+        self.assertEqual(outbox.send_batch(connection, 10, outbox.RateLimiter(0)), (0, 1))
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), ('pending', 1))
+        self.assertIn('Connection refused', email.last_error)
+        self.assertGreater(email.next_attempt_at, timezone.now())
+        self.assertIn('token=reset-token', email.body)
+
+        OutboundEmail.objects.filter(id=email.id).update(attempts=outbox.MAX_ATTEMPTS - 1, next_attempt_at=timezone.now())
+        outbox.send_batch(connection, 10, outbox.RateLimiter(0))
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.body), ('failed', ''))
+        self.assertEqual(mail.outbox, [])
@@ -0,0 +1,85 @@
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from django.db import connection
+from django.test import TransactionTestCase
+from core.models import User, Course, Assignment, LearnerSummary, ProgressEvent
+from core.progress import apply_progress
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', 'apply_progress is Postgres SQL')
+class ConcurrentProgressTests(TransactionTestCase):
+    """Reports racing on one assignment, each in its own thread and connection"""
+
+    def setUp(self):
+        self.learner = User.objects.create_user('learner@example.com', 'secret', role='EMPLOYEE')
+        self.course = Course.objects.create(title='Concurrency', status='published', created_by=self.learner)
+        self.assignment = Assignment.objects.create(user=self.learner, course=self.course)
+
+    def report_concurrently(self, reports):
+        barrier = threading.Barrier(len(reports))
+
+        def report(pct):
+            try:
+                barrier.wait()
+                return apply_progress(self.assignment.id, pct)
+            finally:
+                connection.close()
+
+        with ThreadPoolExecutor(max_workers=len(reports)) as pool:
+            return list(pool.map(report, reports))
+
+    def assert_events_and_results(self, reports, results):
+        # One event per report holding the value as reported; the stored progress is the running maximum
+        events = list(
+            ProgressEvent.objects.filter(assignment=self.assignment).order_by('id').values_list('progress_pct', flat=True)
+        )
+        self.assertEqual(sorted(events), sorted(reports))
+        for pct, result in zip(reports, results):
+            self.assertGreaterEqual(result['progress_pct'], pct)
+        # Events are inserted under the row lock, so id order is the order the reports applied in
+        maxima = [max(events[:index + 1]) for index in range(len(events))]
+        self.assertEqual(sorted(result['progress_pct'] for result in results), maxima)
+
+    def test_reports_complete_once(self):
+        reports = [10, 40, 25, 100, 60, 80, 5, 100]
+        results = self.report_concurrently(reports)
+        self.assert_events_and_results(reports, results)
+
+        self.assignment.refresh_from_db()
+        self.assertEqual(self.assignment.progress_pct, 100)
+        self.assertEqual(self.assignment.status, 'completed')
+        self.assertIsNotNone(self.assignment.completed_at)
+        # completed_at is set by the first report that completed and kept afterwards
+        completed = {result['completed_at'] for result in results if result['status'] == 'completed'}
+        self.assertEqual(completed, {self.assignment.completed_at})
+
+        self.course.refresh_from_db()
+        self.assertEqual(
+            (self.course.enrolled_count, self.course.completed_count, self.course.progress_sum), (1, 1, 100)
+        )
+        summary = LearnerSummary.objects.get(user=self.learner)
+        self.assertEqual(
+            (summary.assigned_count, summary.in_progress_count, summary.completed_count, summary.progress_sum),
+            (1, 0, 1, 100),
+        )
+
+    def test_partial_reports_keep_the_highest(self):
+        reports = [10, 35, 20, 30, 5, 15]
+        results = self.report_concurrently(reports)
+        self.assert_events_and_results(reports, results)
+
+        self.assignment.refresh_from_db()
+        self.assertEqual(self.assignment.progress_pct, 35)
+        self.assertEqual(self.assignment.status, 'in_progress')
+        self.assertIsNone(self.assignment.completed_at)
+
+        self.course.refresh_from_db()
+        self.assertEqual(
+            (self.course.enrolled_count, self.course.completed_count, self.course.progress_sum), (1, 0, 35)
+        )
+        summary = LearnerSummary.objects.get(user=self.learner)
+        self.assertEqual(
+            (summary.assigned_count, summary.in_progress_count, summary.completed_count, summary.progress_sum),
+            (1, 1, 0, 35),
+        )
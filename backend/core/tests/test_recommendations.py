@@ -0,0 +1,92 @@
+from types import SimpleNamespace
+from django.test import SimpleTestCase, TestCase
+from core import recommendations
+from core.models import User, Course, Assignment
+
+
+def fake_course(course_id, title, description='', level='beginner'):
+    return SimpleNamespace(id=course_id, title=title, description=description, level=level)
+
+
+class TextSimilarityTests(SimpleTestCase):
+    def test_shared_terms_make_courses_similar(self):
+        courses = [
+            fake_course(1, 'Python basics', 'Variables, loops and functions in Python'),
+            fake_course(2, 'Advanced Python', 'Decorators and generators in Python', level='advanced'),
+            fake_course(3, 'Pasta cooking', 'Fresh pasta by hand'),
+            fake_course(4, 'Italian pasta', 'Sauces for every pasta shape', level='advanced'),
+        ]
+        similarity = recommendations.text_similarity(courses)
+
+        self.assertEqual(similarity.shape, (4, 4))
+        self.assertAlmostEqual(float(similarity[0, 0]), 1.0, places=5)
+        self.assertAlmostEqual(float(similarity[0, 1]), float(similarity[1, 0]), places=6)
+        self.assertGreater(similarity[0, 1], similarity[0, 2])
+        self.assertGreater(similarity[2, 3], similarity[2, 0])
+
+    def test_no_shared_terms(self):
+        courses = [fake_course(1, 'Python', level='beginner'), fake_course(2, 'Pasta', level='advanced')]
+        self.assertEqual(recommendations.text_similarity(courses).tolist(), [[0.0, 0.0], [0.0, 0.0]])
+
+
+class RecommendationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('author@example.com', 'secret', role='ADMIN')
+        cls.python = cls.course('Python basics', 'Loops and functions in Python')
+        cls.advanced = cls.course('Advanced Python', 'Generators and decorators in Python')
+        cls.pasta = cls.course('Pasta cooking', 'Fresh pasta by hand')
+        cls.sauces = cls.course('Italian sauces', 'Sauces for fresh pasta')
+        cls.draft = cls.course('Python drafts', 'Python in progress', status='draft')
+        # Whoever finishes the Python basics goes on to the advanced course
+        for n in range(4):
+            learner = User.objects.create_user(f'learner{n}@example.com', 'secret', role='EMPLOYEE')
+            Assignment.objects.create(user=learner, course=cls.python, status='completed', progress_pct=100)
+            Assignment.objects.create(user=learner, course=cls.advanced, status='in_progress', progress_pct=40)
+        cook = User.objects.create_user('cook@example.com', 'secret', role='EMPLOYEE')
+        Assignment.objects.create(user=cook, course=cls.pasta)
+        Assignment.objects.create(user=cook, course=cls.sauces)
+
+    @classmethod
+    def course(cls, title, description, status='published'):
+        return Course.objects.create(title=title, description=description, status=status, created_by=cls.author)
+
+    def published_ids(self):
+        return {self.python.id, self.advanced.id, self.pasta.id, self.sauces.id}
+
+    def test_build_keeps_the_nearest_neighbors_best_first(self):
+        courses = list(Course.objects.filter(status='published').order_by('id'))
+        course_ids, neighbors, scores, popularity = recommendations.build(courses)
+
+        self.assertEqual(course_ids.tolist(), sorted(self.published_ids()))
+        self.assertEqual(neighbors.shape, (4, 3))
+        index = {course_id: row for row, course_id in enumerate(course_ids.tolist())}
+        self.assertEqual(int(course_ids[neighbors[index[self.python.id], 0]]), self.advanced.id)
+        self.assertEqual(int(course_ids[neighbors[index[self.pasta.id], 0]]), self.sauces.id)
+        for row in range(4):
+            self.assertNotIn(row, neighbors[row].tolist())
+            self.assertEqual(scores[row].tolist(), sorted(scores[row].tolist(), reverse=True))
+        self.assertEqual(float(popularity.max()), 1.0)
+
+    def test_recommend_from_history(self):
+        self.assertEqual(recommendations.refresh(), 4)
+
+        results = recommendations.recommend([(self.python.id, 'completed')], self.published_ids(), limit=2)
+        self.assertEqual(len(results), 2)
+        self.assertEqual(results[0][0], self.advanced.id)
+        self.assertNotIn(self.python.id, [course_id for course_id, _ in results])
+
+    def test_recommend_only_allowed_courses(self):
+        recommendations.refresh()
+        results = recommendations.recommend([(self.python.id, 'completed')], {self.pasta.id}, limit=5)
+        self.assertEqual([course_id for course_id, _ in results], [self.pasta.id])
+
+    def test_without_history_popular_courses_come_first(self):
+        recommendations.refresh()
+        results = recommendations.recommend([], self.published_ids(), limit=1)
+        self.assertIn(results[0][0], {self.python.id, self.advanced.id})
+
+    def test_empty_catalog(self):
+        Course.objects.update(status='draft')
+        self.assertEqual(recommendations.refresh(), 0)
+        self.assertEqual(recommendations.recommend([], set(), limit=5), [])
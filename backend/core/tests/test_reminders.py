@@ -0,0 +1,71 @@
+import unittest
+from datetime import timedelta
+from django.conf import settings
+from django.db import connection
+from django.test import TestCase
+from django.utils import timezone
+from core import reminders
+from core.models import User, Course, Assignment, Notification
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', 'the reminder scan is Postgres SQL')
+class ReminderScanTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.learner = User.objects.create_user('learner@example.com', 'secret', role='EMPLOYEE')
+        cls.course = Course.objects.create(title='Safety', status='published', created_by=cls.learner)
+
+    def setUp(self):
+        self.now = timezone.now()
+        self.assignment = Assignment.objects.create(user=self.learner, course=self.course)
+
+    def set_due(self, due_at):
+        reminders.set_due_dates(Assignment.objects.filter(id=self.assignment.id), due_at)
+
+    def texts(self):
+        return list(Notification.objects.filter(user=self.learner).order_by('id').values_list('text', flat=True))
+
+    def test_due_soon_then_overdue_each_once(self):
+        self.set_due(self.now + timedelta(hours=1))
+
+        self.assertEqual(reminders.scan(self.now), 1)
+        self.assertEqual(reminders.scan(self.now), 0)
+        self.assertTrue(self.texts()[0].startswith('Reminder: "Safety" is due'))
+
+        later = self.now + timedelta(hours=2)
+        self.assertEqual(reminders.scan(later), 1)
+        self.assertEqual(reminders.scan(later), 0)
+        self.assertTrue(self.texts()[1].startswith('Overdue: "Safety" was due'))
+        self.assignment.refresh_from_db()
+        self.assertEqual(self.assignment.reminder_stage, reminders.OVERDUE)
+
+    def test_already_overdue_skips_the_due_soon_reminder(self):
+        self.set_due(self.now - timedelta(hours=1))
+
+        self.assertEqual(reminders.scan(self.now), 1)
+        self.assertEqual(len(self.texts()), 1)
+        self.assertTrue(self.texts()[0].startswith('Overdue'))
+
+    def test_far_off_and_completed_assignments_are_left_alone(self):
+        self.set_due(self.now + timedelta(hours=settings.REMINDER_DUE_SOON_HOURS + 1))
+        completed = Assignment.objects.create(
+            user=User.objects.create_user('done@example.com', 'secret', role='EMPLOYEE'),
+            course=self.course, status='completed', progress_pct=100, completed_at=self.now,
+        )
+        reminders.set_due_dates(Assignment.objects.filter(id=completed.id), self.now - timedelta(hours=1))
+
+        self.assertEqual(reminders.scan(self.now), 0)
+        self.assertFalse(Notification.objects.exists())
+
+    def test_moving_the_due_date_starts_reminders_over(self):
+        self.set_due(self.now + timedelta(hours=1))
+        reminders.scan(self.now)
+
+        self.set_due(self.now + timedelta(hours=3))
+        self.assignment.refresh_from_db()
+        self.assertEqual(self.assignment.reminder_stage, 0)
+        self.assertEqual(reminders.scan(self.now), 1)
+
+        # Setting the same date again is not a change
+        self.set_due(self.now + timedelta(hours=3))
+        self.assertEqual(reminders.scan(self.now), 0)
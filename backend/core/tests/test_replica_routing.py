@@ -0,0 +1,68 @@
+from unittest import mock
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase
+from core import db_routing
+from core.middleware import ReplicaRoutingMiddleware
+
+
+@mock.patch('core.middleware.replica_configured', return_value=True)
+class ReplicaRoutingMiddlewareTests(SimpleTestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.used_replica = None
+
+    def call(self, request, status=200):
+        def get_response(request):
+            self.used_replica = db_routing._replica_reads.get()
+            return HttpResponse(status=status)
+        return ReplicaRoutingMiddleware(get_response)(request)
+
+    def test_reads_under_read_paths_use_the_replica(self, _):
+        self.call(self.factory.get('/api/v1/courses/'))
+        self.assertTrue(self.used_replica)
+
+    def test_other_reads_use_the_primary(self, _):
+        self.call(self.factory.get('/api/v1/sync'))
+        self.assertFalse(self.used_replica)
+
+    def test_successful_write_pins_the_client(self, _):
+        response = self.call(self.factory.post('/api/v1/courses/'), status=201)
+        self.assertFalse(self.used_replica)
+        self.assertEqual(response.cookies['pin_primary']['max-age'], 10)
+
+        request = self.factory.get('/api/v1/courses/')
+        request.COOKIES['pin_primary'] = '1'
+        self.call(request)
+        self.assertFalse(self.used_replica)
+
+    def test_failed_write_does_not_pin(self, _):
+        response = self.call(self.factory.post('/api/v1/courses/'), status=400)
+        self.assertNotIn('pin_primary', response.cookies)
+
+    def test_heartbeat_does_not_pin(self, _):
+        response = self.call(self.factory.post('/api/v1/assignments/42/heartbeat/'), status=202)
+        self.assertNotIn('pin_primary', response.cookies)
+
+    def test_options_does_not_pin(self, _):
+        response = self.call(self.factory.options('/api/v1/courses/'))
+        self.assertNotIn('pin_primary', response.cookies)
+
+
+class ReadAliasTests(SimpleTestCase):
+    @mock.patch('core.db_routing.replica_configured', return_value=True)
+    def test_replica_is_used_only_inside_replica_reads_while_healthy(self, _):
+        with mock.patch.object(db_routing.replica_health, 'is_healthy', return_value=True):
+            self.assertEqual(db_routing.read_alias(), 'default')
+            with db_routing.replica_reads():
+                self.assertEqual(db_routing.read_alias(), db_routing.REPLICA)
+            self.assertEqual(db_routing.read_alias(), 'default')
+
+        with mock.patch.object(db_routing.replica_health, 'is_healthy', return_value=False):
+            with db_routing.replica_reads():
+                self.assertEqual(db_routing.read_alias(), 'default')
+
+    def test_cache_tables_always_use_the_primary(self):
+        model = mock.Mock()
+        model._meta.app_label = 'django_cache'
+        with db_routing.replica_reads():
+            self.assertEqual(db_routing.ReplicaRouter().db_for_read(model), 'default')
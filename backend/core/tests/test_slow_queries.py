@@ -0,0 +1,68 @@
+from django.test import SimpleTestCase, override_settings
+from core import slow_queries
+
+
+class NormalizeTests(SimpleTestCase):
+    def test_literals_and_placeholders_become_question_marks(self):
+        self.assertEqual(
+            slow_queries.normalize("SELECT * FROM users WHERE email = 'o''brien@example.com' AND id > 42 LIMIT %s"),
+            'SELECT * FROM users WHERE email = ? AND id > ? LIMIT ?',
+        )
+
+    def test_identifiers_with_digits_are_kept(self):
+        self.assertEqual(
+            slow_queries.normalize('SELECT t2.col_1 FROM t2 WHERE x = 1.5'), 'SELECT t2.col_1 FROM t2 WHERE x = ?'
+        )
+
+    def test_in_lists_fold_whatever_their_length(self):
+        one = slow_queries.normalize('SELECT * FROM "courses" WHERE "courses"."id" IN (%s)')
+        many = slow_queries.normalize('SELECT * FROM "courses" WHERE "courses"."id" IN (%s, %s, %s)')
+        self.assertEqual(one, 'SELECT * FROM "courses" WHERE "courses"."id" IN (...)')
+        self.assertEqual(one, many)
+
+    def test_multi_row_values_fold(self):
+        one = slow_queries.normalize('INSERT INTO "t" ("a", "b") VALUES (%s, %s)')
+        many = slow_queries.normalize('INSERT INTO "t" ("a", "b") VALUES (%s, %s), (%s, %s),\n (%s, %s)')
+        self.assertEqual(one, 'INSERT INTO "t" ("a", "b") VALUES (...)')
+        self.assertEqual(one, many)
+
+    def test_whitespace_is_collapsed(self):
+        self.assertEqual(slow_queries.normalize('  SELECT\n\t1,\n  2  '), 'SELECT ?, ?')
+
+
+class FingerprintTests(SimpleTestCase):
+    def test_same_shape_same_fingerprint(self):
+        first = slow_queries.normalize("SELECT * FROM t WHERE id IN (1, 2) AND name = 'a'")
+        second = slow_queries.normalize("SELECT * FROM t WHERE id IN (3) AND name = 'b'")
+        self.assertEqual(slow_queries.fingerprint(first, 'view'), slow_queries.fingerprint(second, 'view'))
+
+    def test_source_is_part_of_the_fingerprint(self):
+        normalized = slow_queries.normalize('SELECT 1')
+        self.assertNotEqual(slow_queries.fingerprint(normalized, 'a'), slow_queries.fingerprint(normalized, 'b'))
+
+
+@override_settings(SLOW_QUERY_EXPLAIN='always')
+class ShouldExplainTests(SimpleTestCase):
+    def should_explain(self, sql, many=False):
+        return slow_queries._should_explain(sql, many, slow_queries.fingerprint(sql, 'tests'))
+
+    def test_plain_select_is_explained(self):
+        self.assertTrue(self.should_explain('SELECT * FROM courses WHERE id = %s'))
+
+    def test_writes_and_executemany_are_not(self):
+        self.assertFalse(self.should_explain('UPDATE courses SET title = %s'))
+        self.assertFalse(self.should_explain('SELECT %s', many=True))
+
+    def test_locking_reads_are_not(self):
+        self.assertFalse(self.should_explain('SELECT id FROM jobs FOR UPDATE SKIP LOCKED'))
+        self.assertFalse(self.should_explain('SELECT id FROM assignments FOR NO KEY UPDATE'))
+
+    def test_side_effecting_functions_are_not(self):
+        self.assertFalse(self.should_explain("SELECT nextval('jobs_id_seq')"))
+        self.assertFalse(self.should_explain('SELECT pg_try_advisory_xact_lock(%s)'))
+        self.assertFalse(self.should_explain("SELECT pg_notify('jobs', %s)"))
+        self.assertTrue(self.should_explain('SELECT next_value FROM sequences_report'))
+
+    @override_settings(SLOW_QUERY_EXPLAIN='off')
+    def test_off_explains_nothing(self):
+        self.assertFalse(self.should_explain('SELECT * FROM courses'))
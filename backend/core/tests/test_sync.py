@@ -0,0 +1,77 @@
+import unittest
+from django.db import connection
+from django.test import TransactionTestCase
+from core import sync
+from core.jwt_utils import create_access_token
+from core.models import User, Course, Assignment, Notification
+
+
+@unittest.skipUnless(connection.vendor == 'postgresql', 'change_log is filled by Postgres triggers')
+class DeltaSyncTests(TransactionTestCase):
+    """Each write commits on its own, as it would between two client syncs"""
+
+    def setUp(self):
+        self.user = User.objects.create_user('learner@example.com', 'secret', role='EMPLOYEE')
+        self.course = Course.objects.create(title='Sync', status='published', created_by=self.user)
+        self.assignment = Assignment.objects.create(user=self.user, course=self.course)
+
+    def sync(self, since=None):
+        params = {'since': since} if since else {}
+        return self.client.get(
+            '/api/v1/sync', params, HTTP_AUTHORIZATION=f'Bearer {create_access_token(self.user)}'
+        )
+
+    def changed_ids(self, payload, entity):
+        return [row['id'] for row in payload[entity]['changed']]
+
+    def test_full_sync_then_nothing_changed(self):
+        full = self.sync().json()
+        self.assertTrue(full['full'])
+        self.assertEqual(self.changed_ids(full, 'courses'), [self.course.id])
+        self.assertEqual(self.changed_ids(full, 'assignments'), [self.assignment.id])
+
+        delta = self.sync(full['token']).json()
+        self.assertFalse(delta['full'])
+        for entity in ('courses', 'assignments', 'notifications'):
+            self.assertEqual(delta[entity], {'changed': [], 'deleted': []})
+
+    def test_changes_and_deletes_since_the_token(self):
+        token = self.sync().json()['token']
+        Assignment.objects.filter(id=self.assignment.id).update(progress_pct=40, status='in_progress')
+        notification = Notification.objects.create(user=self.user, text='Hello')
+
+        delta = self.sync(token).json()
+        self.assertEqual(self.changed_ids(delta, 'assignments'), [self.assignment.id])
+        self.assertEqual(self.changed_ids(delta, 'notifications'), [notification.id])
+
+        token = delta['token']
+        notification.delete()
+        Course.objects.filter(id=self.course.id).update(status='draft')
+
+        delta = self.sync(token).json()
+        self.assertEqual(delta['notifications']['deleted'], [notification.id])
+        # No longer visible to an employee, so it reads as deleted
+        self.assertEqual(delta['courses'], {'changed': [], 'deleted': [self.course.id]})
+
+    def test_other_users_changes_are_not_sent(self):
+        other = User.objects.create_user('other@example.com', 'secret', role='EMPLOYEE')
+        token = self.sync().json()['token']
+        Notification.objects.create(user=other, text='Not yours')
+
+        self.assertEqual(self.sync(token).json()['notifications'], {'changed': [], 'deleted': []})
+
+    def test_counters_and_watch_position_are_not_changes(self):
+        token = self.sync().json()['token']
+        Course.objects.filter(id=self.course.id).update(enrolled_count=5, progress_sum=80)
+        Assignment.objects.filter(id=self.assignment.id).update(position_seconds=310, watch_seconds=300)
+
+        delta = self.sync(token).json()
+        self.assertEqual(delta['courses']['changed'], [])
+        self.assertEqual(delta['assignments']['changed'], [])
+
+    def test_bad_and_expired_tokens(self):
+        self.assertEqual(self.sync('garbage').status_code, 400)
+
+        xmin, _ = sync.decode_token(self.sync().json()['token'])
+        expired = f'{xmin}.{int(sync.retention_cutoff().timestamp()) - 60}'
+        self.assertEqual(self.sync(expired).status_code, 410)
@@ -0,0 +1,42 @@
+from unittest import mock
+from django.test import TestCase
+from core.models import User
+from core.throttling import TokenBucketThrottle
+
+
+RATES = {'auth_ip': '300/min', 'auth_account': '3/min', 'auth_refresh': '600/min'}
+
+
+@mock.patch.object(TokenBucketThrottle, 'THROTTLE_RATES', RATES)
+class AuthThrottleTests(TestCase):
+    def setUp(self):
+        User.objects.create_user('learner@example.com', 'secret')
+
+    def login(self, password, ip='10.0.0.1'):
+        return self.client.post(
+            '/api/v1/auth/login', {'email': 'learner@example.com', 'password': password},
+            content_type='application/json', REMOTE_ADDR=ip,
+        )
+
+    def test_account_bucket_answers_429_with_retry_after(self):
+        for _ in range(3):
+            self.assertEqual(self.login('wrong').status_code, 401)
+
+        response = self.login('wrong')
+        self.assertEqual(response.status_code, 429)
+        self.assertGreaterEqual(int(response['Retry-After']), 1)
+
+    def test_flooding_someone_elses_email_does_not_lock_them_out(self):
+        for _ in range(5):
+            self.login('wrong', ip='10.6.6.6')
+        self.assertEqual(self.login('wrong', ip='10.6.6.6').status_code, 429)
+
+        self.assertEqual(self.login('secret', ip='10.0.0.1').status_code, 200)
+
+    def test_forwarded_for_is_ignored_without_proxies(self):
+        for index in range(3):
+            self.client.post(
+                '/api/v1/auth/login', {'email': 'learner@example.com', 'password': 'wrong'},
+                content_type='application/json', REMOTE_ADDR='10.6.6.6', HTTP_X_FORWARDED_FOR=f'10.9.9.{index}',
+            )
+        self.assertEqual(self.login('wrong', ip='10.6.6.6').status_code, 429)
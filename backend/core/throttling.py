@@ -0,0 +1,103 @@
+"""
+Token-bucket throttling for the unauthenticated auth endpoints.
+
+Every login/register/reset attempt costs a PBKDF2 hash, so these endpoints are
+throttled per client IP and per submitted account from that IP. The account
+bucket is keyed on email and IP together: keyed on the email alone, anyone
+could lock a chosen user out of login by sending requests with their email. Bucket state lives in the
+throttle_buckets table and is refilled and spent in one INSERT ... ON CONFLICT
+statement, so all gunicorn workers and instances share the same limits
+without a read-modify-write race.
+
+Rates come from REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']: '10/min' means a
+bucket of 10 tokens refilled at 10 per minute, i.e. bursts of 10 and a
+sustained 10 per minute.
+"""
+import hashlib
+from datetime import timedelta
+from django.db import connection
+from django.utils import timezone
+from rest_framework.throttling import SimpleRateThrottle
+from .models import ThrottleBucket
+
+
+TAKE_TOKEN_SQL = '''
+    INSERT INTO throttle_buckets AS b (key, tokens, allowed, updated_at)
+    VALUES (%(key)s, %(capacity)s - 1, true, now())
+    ON CONFLICT (key) DO UPDATE SET
+        tokens = CASE WHEN {refilled} >= 1 THEN {refilled} - 1 ELSE {refilled} END,
+        allowed = {refilled} >= 1,
+        updated_at = now()
+    RETURNING allowed, tokens
+'''.format(
+    refilled='LEAST(%(capacity)s, b.tokens + EXTRACT(EPOCH FROM now() - b.updated_at)::float8 * %(rate)s)'
+)
+
+
+def take_token(key, capacity, rate):
+    """
+    Spend one token from the bucket `key` (created full on first use).
+    Returns (allowed, tokens_left).
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(TAKE_TOKEN_SQL, {'key': key, 'capacity': float(capacity), 'rate': float(rate)})
+        allowed, tokens = cursor.fetchone()
+    return allowed, tokens
+
+
+def prune_buckets(idle=timedelta(hours=1)):
+    """Delete buckets that have been idle long enough to be full again"""
+    deleted, _ = ThrottleBucket.objects.filter(updated_at__lt=timezone.now() - idle).delete()
+    return deleted
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    SimpleRateThrottle with its cache-held request history replaced by a
+    shared Postgres token bucket. Subclasses set `scope` and get_cache_key().
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        self.refill_rate = self.num_requests / self.duration
+        allowed, self.tokens = take_token(self.key, self.num_requests, self.refill_rate)
+        return allowed
+
+    def wait(self):
+        """Seconds until the next token is available (sent as Retry-After)"""
+        return max(1 - self.tokens, 0) / self.refill_rate
+
+
+class AuthIPThrottle(TokenBucketThrottle):
+    """Per client IP, shared by login, register and password reset"""
+    scope = 'auth_ip'
+
+    def get_cache_key(self, request, view):
+        return f'{self.scope}:{self.get_ident(request)}'
+
+
+class AuthAccountThrottle(TokenBucketThrottle):
+    """Per submitted email and client IP: guessing one account's password is slow from any address"""
+    scope = 'auth_account'
+
+    def get_cache_key(self, request, view):
+        email = request.data.get('email') if hasattr(request.data, 'get') else None
+        if not isinstance(email, str) or not email.strip():
+            return None
+        identity = f'{email.strip().lower()}|{self.get_ident(request)}'
+        digest = hashlib.sha256(identity.encode()).hexdigest()[:32]
+        return f'{self.scope}:{digest}'
+
+
+class RefreshIPThrottle(TokenBucketThrottle):
+    """Per client IP for token refresh, kept apart so refreshes do not use up the login budget"""
+    scope = 'auth_refresh'
+
+    def get_cache_key(self, request, view):
+        return f'{self.scope}:{self.get_ident(request)}'
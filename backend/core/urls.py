@@ -1,3 +1,4 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from . import views
@@ -11,6 +12,7 @@ router.register(r'assignments', views.AssignmentViewSet)
 router.register(r'progress-events', views.ProgressEventViewSet)
 router.register(r'notifications', views.NotificationViewSet)
 router.register(r'approvals', views.ApprovalViewSet)
+router.register(r'jobs', views.JobViewSet)
 
 urlpatterns = [
     path('auth/login', views.login, name='login'),
@@ -20,8 +22,28 @@ urlpatterns = [
     path('auth/password-reset/request', views.request_password_reset, name='request_password_reset'),
     path('auth/password-reset/confirm', views.reset_password, name='reset_password'),
     path('health/db', views.health_db, name='health_db'),
+    path('health/ready', views.health_ready, name='health_ready'),
+    path('me/bootstrap', views.bootstrap, name='bootstrap'),
+    path('leaderboard', views.leaderboard, name='leaderboard'),
+    path('sync', views.sync_changes, name='sync'),
+    path('profiles', views.profiles_list, name='profiles_list'),
+    path('profiles/<str:profile_id>', views.profile_download, name='profile_download'),
+    path('certificates/<str:digest>.svg', views.certificate_file, name='certificate_file'),
     path('employees/', views.employees_list, name='employees_list'),
+    path('employees/invite', views.employee_invite, name='employee_invite'),
     path('employees/<int:user_id>/', views.employee_update, name='employee_update'),
     path('employees/<int:user_id>/delete/', views.employee_delete, name='employee_delete'),
     path('', include(router.urls)),
 ]
+
+# Under ASGI the I/O-bound read endpoints are served by their async versions.
+# They are listed first so they shadow the router routes above.
+if settings.ASYNC_API_VIEWS:
+    from . import async_views
+
+    urlpatterns = [
+        path('health/db', async_views.health_db, name='health_db_async'),
+        path('courses/', async_views.course_list, name='course_list_async'),
+        path('assignments/mine/', async_views.assignments_mine, name='assignments_mine_async'),
+        path('notifications/', async_views.notification_list, name='notification_list_async'),
+    ] + urlpatterns
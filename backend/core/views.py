@@ -1,24 +1,166 @@
 from rest_framework import viewsets, status
-from rest_framework.decorators import api_view, permission_classes, action
+from rest_framework.decorators import api_view, permission_classes, throttle_classes, action
+from rest_framework.exceptions import NotFound
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from django.contrib.auth import authenticate
-from django.db import connection, models
+from django.conf import settings
+from django.core.cache import cache
+from django.http import FileResponse, HttpResponse
+from django.urls import reverse
+from django.utils.cache import patch_cache_control
+from django.db import close_old_connections, connection, models, transaction
 from django.utils import timezone
-from datetime import timedelta
+from django.utils.dateparse import parse_date, parse_datetime
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, time, timedelta
+import contextvars
+import json
+import os
 import secrets
-from .models import User, Team, Course, Resource, Assignment, ProgressEvent, Notification, Approval, PasswordResetToken
+from .models import (
+    User, Team, Course, Resource, Assignment, ProgressEvent, Notification, Approval, PasswordResetToken, Job,
+    LearnerSummary, Certificate, CertificateFile
+)
 from .serializers import (
-    UserSerializer, TeamSerializer, CourseSerializer, ResourceSerializer,
+    UserSerializer, TeamSerializer, CourseSerializer, CourseDetailSerializer, ResourceSerializer,
     AssignmentSerializer, ProgressEventSerializer, NotificationSerializer, ApprovalSerializer,
-    EmployeeSerializer
+    EmployeeSerializer, MinimalCourseSerializer, UserSummarySerializer, JobSerializer,
+    LearnerSummarySerializer, LeaderboardEntrySerializer, is_compact, live_course_counters, with_course_counters
 )
 from .jwt_utils import create_access_token, create_refresh_token, decode_refresh_token, blacklist_refresh_token
 from .permissions import IsAdmin, IsManagerOrAdmin, IsAuthenticated
+from .db_routing import replica_status
+from .cache_utils import (
+    PAYLOAD_TIMEOUT, make_etag, is_not_modified, conditional_response, get_versions, bump_versions
+)
+from .jobs import enqueue, retry_dead
+from .outbox import queue_password_reset, queue_invite
+from .progress import STATUSES, apply_progress
+from .reminders import set_due_dates
+from .throttling import AuthIPThrottle, AuthAccountThrottle, RefreshIPThrottle
+from . import certificates, heartbeats, leaderboards, profiling, recommendations, startup, teams
+from . import sync as delta_sync
+from .approvals import (
+    DECISIONS, pending_queue, encode_cursor, decode_cursor, after_cursor,
+    claim_pending, bulk_decide
+)
+
+
+VALID_ROLES = ['ADMIN', 'MANAGER', 'TL', 'SRMGR', 'EMPLOYEE']
+
+# Invite links are password reset tokens with a longer lifetime
+INVITE_EXPIRY = timedelta(days=7)
+
+
+def visible_courses(user):
+    """Courses the given user may see, shared by the sync and async views"""
+    if user.role == 'ADMIN':
+        # Admin sees all courses
+        return Course.objects.all()
+    elif user.role in ['MANAGER', 'TL', 'SRMGR']:
+        # Manager sees published courses + their own courses
+        return Course.objects.filter(
+            models.Q(status='published') | models.Q(created_by=user)
+        )
+    else:
+        # Employee sees only published courses
+        return Course.objects.filter(status='published')
+
+
+def apply_sparse_fieldset(queryset, serializer):
+    """
+    Load only the columns the (already field-restricted) serializer reads,
+    and join only the relations those columns need.
+    """
+    request = serializer.context.get('request')
+    params = request.query_params if request is not None else {}
+    if not any(name in params for name in ('fields', 'expand', 'compact')):
+        return queryset
+    
+    columns = serializer.required_columns()
+    if columns is None:
+        return queryset
+    
+    relations = set()
+    for column in columns:
+        parts = column.split('__')[:-1]
+        relations.update('__'.join(parts[:i]) for i in range(1, len(parts) + 1))
+    
+    queryset = queryset.select_related(None)
+    if relations:
+        queryset = queryset.select_related(*relations)
+    return queryset.only(*(columns | relations))
+
+
+def side_load(rows):
+    """
+    Compact mode: rows reference courses and users by id, and each referenced
+    object is serialized once in a dictionary keyed by id.
+    """
+    course_ids = {row['course'] for row in rows if row.get('course')}
+    user_ids = {row[key] for row in rows for key in ('user', 'assigned_by') if row.get(key)}
+    
+    courses = Course.objects.filter(id__in=course_ids).select_related('created_by')
+    users = User.objects.filter(id__in=user_ids).only('id', 'first_name', 'last_name', 'email')
+    
+    return {
+        'courses': {course.id: MinimalCourseSerializer(course).data for course in courses},
+        'users': {user.id: UserSummarySerializer(user).data for user in users},
+    }
+
+
+class SparseFieldsetViewMixin:
+    """Applies ?fields= / ?expand= / ?compact= to the querysets a viewset serializes"""
+    
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.request.method != 'GET':
+            return queryset
+        return apply_sparse_fieldset(queryset, self.get_serializer())
+    
+    def list_response(self, queryset):
+        serializer = self.get_serializer(self.filter_queryset(queryset), many=True)
+        if is_compact(self.request):
+            return Response({'results': serializer.data, **side_load(serializer.data)})
+        return Response(serializer.data)
+
+
+def _is_id_list(value):
+    return isinstance(value, list) and bool(value) and all(isinstance(item, int) for item in value)
+
+
+def _parse_due_at(value):
+    """
+    Parse an optional due date: an ISO datetime, or a date meaning the end of that day.
+    Returns (datetime or None, error response or None).
+    """
+    if value in (None, ''):
+        return None, None
+    
+    due_at = parse_datetime(value) if isinstance(value, str) else None
+    if due_at is None and isinstance(value, str) and parse_date(value):
+        due_at = datetime.combine(parse_date(value), time(23, 59, 59))
+    if due_at is None:
+        return None, Response(
+            {'error': 'due_at must be an ISO 8601 date or datetime'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    if timezone.is_naive(due_at):
+        due_at = timezone.make_aware(due_at)
+    return due_at, None
+
+
+def touch_courses(course_ids):
+    """Bump updated_at so cached course payloads are rebuilt"""
+    Course.objects.filter(id__in=set(course_ids)).update(updated_at=timezone.now())
+    bump_versions('courses')
 
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([AuthIPThrottle, AuthAccountThrottle])
 def login(request):
     email = request.data.get('email')
     password = request.data.get('password')
@@ -64,6 +206,7 @@ def login(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([RefreshIPThrottle])
 def refresh(request):
     refresh_token = request.data.get('refresh')
     
@@ -109,6 +252,7 @@ def logout(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([AuthIPThrottle, AuthAccountThrottle])
 def register(request):
     email = request.data.get('email')
     password = request.data.get('password')
@@ -165,6 +309,7 @@ def register(request):
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([AuthIPThrottle, AuthAccountThrottle])
 def request_password_reset(request):
     email = request.data.get('email')
     
@@ -177,20 +322,23 @@ def request_password_reset(request):
     user = User.objects.filter(email=email).first()
     
     if user:
-        PasswordResetToken.objects.filter(
-            user=user,
-            is_used=False,
-            expires_at__gt=timezone.now()
-        ).update(is_used=True)
-        
-        token = secrets.token_urlsafe(32)
-        expires_at = timezone.now() + timedelta(hours=1)
-        
-        PasswordResetToken.objects.create(
-            user=user,
-            token=token,
-            expires_at=expires_at
-        )
+        with transaction.atomic():
+            PasswordResetToken.objects.filter(
+                user=user,
+                is_used=False,
+                expires_at__gt=timezone.now()
+            ).update(is_used=True)
+            
+            token = secrets.token_urlsafe(32)
+            expires_at = timezone.now() + timedelta(hours=1)
+            
+            PasswordResetToken.objects.create(
+                user=user,
+                token=token,
+                expires_at=expires_at
+            )
+            # Delivered by the outbox sender, never inline
+            queue_password_reset(user, token)
     
     return Response({
         'message': 'If the email exists, a password reset link has been sent'
@@ -250,7 +398,9 @@ def health_db(request):
         return Response({
             'status': 'healthy',
             'database': 'connected',
-            'result': result[0] if result else None
+            'result': result[0] if result else None,
+            'replica': replica_status(),
+            'heartbeats': heartbeats.buffer_status()
         })
     except Exception as e:
         return Response({
@@ -260,6 +410,314 @@ def health_db(request):
         }, status=status.HTTP_503_SERVICE_UNAVAILABLE)
 
 
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def health_ready(request):
+    """
+    Readiness gate: 200 once this process has warmed up and its database
+    answers, 503 before that. Also reports how long start-up took.
+    """
+    ready, details = startup.readiness()
+    return Response(
+        {'status': 'ready' if ready else 'starting', **details},
+        status=status.HTTP_200_OK if ready else status.HTTP_503_SERVICE_UNAVAILABLE
+    )
+
+
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+def profiles_list(request):
+    """Stored request profiles, newest first (see core.profiling)"""
+    return Response(profiling.list_profiles())
+
+
+@api_view(['GET'])
+@permission_classes([IsAdmin])
+def profile_download(request, profile_id):
+    """
+    Download one profile as JSON, or with ?format=collapsed as collapsed stacks
+    for flamegraph.pl / speedscope.
+    """
+    path = profiling.profile_path(profile_id)
+    if path is None or not path.exists():
+        return Response({'error': 'Profile not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    if request.query_params.get('format') == 'collapsed':
+        with open(path) as f:
+            text = profiling.collapsed(json.load(f))
+        return HttpResponse(text, content_type='text/plain; charset=utf-8')
+    return FileResponse(open(path, 'rb'), as_attachment=True, filename=path.name)
+
+
+CERTIFICATE_MAX_AGE = 60 * 60 * 24 * 365
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def certificate_file(request, digest):
+    """
+    A certificate SVG by content hash (the url from assignments/{id}/certificate).
+    The content behind a name never changes, so browsers keep it for a year.
+    """
+    user = request.user
+    visible = Certificate.objects.filter(digest=digest)
+    if user.role in MANAGER_ROLES and user.team_id:
+        visible = visible.filter(models.Q(assignment__user=user) | models.Q(assignment__user__team_id=user.team_id))
+    elif user.role != 'ADMIN':
+        visible = visible.filter(assignment__user=user)
+    
+    if not certificates.is_digest(digest) or not visible.exists():
+        return Response({'error': 'Certificate not found'}, status=status.HTTP_404_NOT_FOUND)
+    
+    etag = f'"{digest}"'
+    if is_not_modified(request, etag):
+        response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        content = CertificateFile.objects.filter(digest=digest).values_list('content', flat=True).first()
+        if content is None:
+            return Response({'error': 'Certificate not found'}, status=status.HTTP_404_NOT_FOUND)
+        response = HttpResponse(bytes(content), content_type='image/svg+xml')
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, max_age=CERTIFICATE_MAX_AGE, immutable=True)
+    # Rendered as a document when opened directly: allow nothing but its own styles
+    response['Content-Security-Policy'] = "default-src 'none'; style-src 'unsafe-inline'"
+    return response
+
+
+MANAGER_ROLES = ['MANAGER', 'TL', 'SRMGR']
+
+# Bootstrap sections that miss the cache are built in parallel, each on its own connection
+_bootstrap_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix='bootstrap')
+
+
+def _bootstrap_sections(user):
+    """
+    Role-aware dashboard sections: name -> (cache scope, version names, builder)
+    """
+    course_scope = f'manager:{user.id}' if user.role in MANAGER_ROLES else user.role
+    sections = {
+        'user': (user.id, [f'user:{user.id}'], lambda: {
+            'id': user.id,
+            'email': user.email,
+            'firstName': user.first_name,
+            'lastName': user.last_name,
+            'jobTitle': user.job_title,
+            'role': user.role,
+            'team': user.team_id,
+        }),
+        'courses': (course_scope, ['courses'], lambda: CourseSerializer(
+            visible_courses(user).select_related('created_by'), many=True
+        ).data),
+        'assignments': (user.id, [f'assignments:user:{user.id}'], lambda: AssignmentSerializer(
+            Assignment.objects.filter(user=user).select_related(
+                'user', 'course__created_by', 'assigned_by'
+            ), many=True
+        ).data),
+        'notifications': (user.id, [f'notifications:user:{user.id}', 'notifications:broadcast'], lambda: NotificationSerializer(
+            Notification.objects.filter(user=user)[:50], many=True
+        ).data),
+    }
+    
+    if user.role in MANAGER_ROLES and user.team_id:
+        team_id = user.team_id
+        sections['team_assignments'] = (team_id, [f'assignments:team:{team_id}'], lambda: AssignmentSerializer(
+            Assignment.objects.filter(user__team_id=team_id).select_related(
+                'user', 'course__created_by', 'assigned_by'
+            ), many=True
+        ).data)
+        sections['team_members'] = (team_id, [f'team:{team_id}'], lambda: EmployeeSerializer(
+            User.objects.filter(team_id=team_id), many=True
+        ).data)
+    
+    if user.role == 'ADMIN':
+        sections['approvals'] = ('all', ['approvals'], lambda: ApprovalSerializer(
+            pending_queue().select_related('course', 'requested_by', 'approved_by')[:50], many=True
+        ).data)
+    
+    return sections
+
+
+def _run_on_own_connection(builder):
+    close_old_connections()
+    try:
+        return builder()
+    finally:
+        close_old_connections()
+
+
+@api_view(['GET'])
+def leaderboard(request):
+    """
+    Top learners by completions, then progress activity.
+    Query params:
+    - scope: team (default; your team, or ?team_id= for admins) or org
+    - period: 7d, 30d (default) or all
+    - limit: top N, at most 100 (default 10)
+    Rankings are refreshed every few minutes by a background job.
+    """
+    user = request.user
+    scope = request.query_params.get('scope', 'team')
+    period = request.query_params.get('period', '30d')
+    
+    try:
+        limit = min(max(int(request.query_params.get('limit', 10)), 1), 100)
+    except ValueError:
+        return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    if period not in leaderboards.PERIODS:
+        return Response(
+            {'error': f'period must be one of: {", ".join(leaderboards.PERIODS)}'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    if scope == 'org':
+        scope_key = 'org'
+    elif scope == 'team':
+        team_id = request.query_params.get('team_id') if user.role == 'ADMIN' else None
+        if team_id:
+            try:
+                team_id = int(team_id)
+            except ValueError:
+                return Response({'error': 'team_id must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+            if not Team.objects.filter(id=team_id).exists():
+                return Response({'error': 'Team not found'}, status=status.HTTP_400_BAD_REQUEST)
+        team_id = team_id or user.team_id
+        if not team_id:
+            return Response({'error': 'You are not on a team'}, status=status.HTTP_400_BAD_REQUEST)
+        scope_key = leaderboards.team_scope(team_id)
+    else:
+        return Response({'error': 'scope must be team or org'}, status=status.HTTP_400_BAD_REQUEST)
+    
+    version = get_versions(['leaderboards'])['leaderboards']
+    show_users = user.role == 'ADMIN'
+    top = cache.get_or_set(
+        f'leaderboard:{scope_key}:{period}:{limit}:{"full" if show_users else "names"}:{version}',
+        lambda: LeaderboardEntrySerializer(
+            leaderboards.top_entries(scope_key, period, limit), many=True, context={'show_user': show_users}
+        ).data,
+        PAYLOAD_TIMEOUT,
+    )
+    me = leaderboards.entry_for(scope_key, period, user)
+    
+    return Response({
+        'scope': scope_key,
+        'period': period,
+        'top': top,
+        'me': LeaderboardEntrySerializer(me, context={'show_user': True}).data if me else None,
+    })
+
+
+@api_view(['GET'])
+def bootstrap(request):
+    """
+    Everything a dashboard needs on first paint, in one response.
+    Sections are cached under their shared version tokens; the response ETag
+    covers every section, so an unchanged dashboard revalidates with a 304.
+    """
+    user = request.user
+    sections = _bootstrap_sections(user)
+    versions = get_versions({name for _, names, _ in sections.values() for name in names})
+    
+    cache_keys = {
+        section: f"bootstrap:{section}:{scope}:{':'.join(versions[name] for name in names)}"
+        for section, (scope, names, _) in sections.items()
+    }
+    
+    def build_payload():
+        payload = {}
+        cached = cache.get_many(cache_keys.values())
+        missing = []
+        for section, key in cache_keys.items():
+            if key in cached:
+                payload[section] = cached[key]
+            else:
+                missing.append(section)
+        
+        if len(missing) > 1:
+            # copy_context() carries the request's replica routing into the pool threads
+            futures = {
+                section: _bootstrap_pool.submit(
+                    contextvars.copy_context().run, _run_on_own_connection, sections[section][2]
+                )
+                for section in missing
+            }
+            built = {section: future.result() for section, future in futures.items()}
+        else:
+            built = {section: sections[section][2]() for section in missing}
+        
+        cache.set_many({cache_keys[section]: data for section, data in built.items()}, PAYLOAD_TIMEOUT)
+        payload.update(built)
+        return payload
+    
+    # Counters change without bumping 'courses': the cached section gets live ones
+    counters = live_course_counters(visible_courses(user)) if 'courses' in sections else {}
+    
+    def build_live_payload():
+        payload = build_payload()
+        if 'courses' in payload:
+            payload['courses'] = [with_course_counters(item, counters) for item in payload['courses']]
+        return payload
+    
+    etag = make_etag('bootstrap', *sorted(cache_keys.values()), sorted(counters.items()))
+    return conditional_response(request, etag, build_live_payload)
+
+
+@api_view(['GET'])
+def sync_changes(request):
+    """
+    Courses, own assignments and own notifications changed since a sync token.
+    Query params:
+    - since: token from the previous response; omit it for a full sync
+    Deleted rows, and courses the user can no longer see (e.g. unpublished),
+    are listed by id under "deleted". 410 means the token is too old: sync in full.
+    """
+    user = request.user
+    since = request.query_params.get('since')
+    # Taken before reading, so anything committed meanwhile is sent again next time
+    token = delta_sync.new_token()
+    
+    querysets = {
+        'course': visible_courses(user).select_related('created_by'),
+        'assignment': Assignment.objects.filter(user=user).select_related('course', 'user', 'assigned_by'),
+        'notification': Notification.objects.filter(user=user),
+    }
+    serializer_classes = {
+        'course': CourseSerializer,
+        'assignment': AssignmentSerializer,
+        'notification': NotificationSerializer,
+    }
+    
+    if since:
+        decoded = delta_sync.decode_token(since)
+        if decoded is None:
+            return Response({'error': 'Invalid sync token'}, status=status.HTTP_400_BAD_REQUEST)
+        xmin, issued_at = decoded
+        if delta_sync.is_expired(issued_at):
+            return Response(
+                {'error': 'Sync token expired; sync again without since'},
+                status=status.HTTP_410_GONE
+            )
+        changes = delta_sync.changes_since(xmin, user)
+    else:
+        changes = None
+    
+    payload = {'token': token, 'full': changes is None}
+    for entity, queryset in querysets.items():
+        if changes is None:
+            rows, deleted = list(queryset), []
+        else:
+            changed_ids, deleted_ids = changes[entity]
+            rows = list(queryset.filter(id__in=changed_ids)) if changed_ids else []
+            # Changed but no longer visible (unpublished course) reads as deleted for this client
+            deleted = sorted(deleted_ids | (changed_ids - {row.id for row in rows}))
+        payload[f'{entity}s'] = {
+            'changed': serializer_classes[entity](rows, many=True, context={'request': request}).data,
+            'deleted': deleted,
+        }
+    return Response(payload)
+
+
 @api_view(['GET'])
 @permission_classes([IsManagerOrAdmin])
 def employees_list(request):
@@ -280,10 +738,60 @@ def employees_list(request):
             Q(email__icontains=search_query)
         )
     
-    serializer = EmployeeSerializer(queryset, many=True)
+    serializer = EmployeeSerializer(queryset, many=True, context={'request': request})
+    serializer.instance = apply_sparse_fieldset(queryset, serializer.child)
     return Response(serializer.data)
 
 
+@api_view(['POST'])
+@permission_classes([IsAdmin])
+def employee_invite(request):
+    """
+    Create an account and email the person a link to choose their password.
+    Only accessible by ADMIN role.
+    """
+    email = (request.data.get('email') or '').strip()
+    role = request.data.get('role', 'EMPLOYEE')
+    
+    if not email:
+        return Response(
+            {'error': 'Email is required'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    if role not in VALID_ROLES:
+        return Response(
+            {'error': f'Invalid role. Must be one of: {", ".join(VALID_ROLES)}'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    if User.objects.filter(email=email).exists():
+        return Response(
+            {'error': 'User with this email already exists'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    with transaction.atomic():
+        user = User.objects.create_user(
+            email=email,
+            password=None,
+            first_name=(request.data.get('firstName') or '').strip(),
+            last_name=(request.data.get('lastName') or '').strip(),
+            job_title=(request.data.get('jobTitle') or '').strip(),
+            role=role,
+        )
+        token = secrets.token_urlsafe(32)
+        PasswordResetToken.objects.create(
+            user=user,
+            token=token,
+            expires_at=timezone.now() + INVITE_EXPIRY
+        )
+        queue_invite(user, token, request.user)
+    
+    serializer = EmployeeSerializer(user)
+    return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
 @api_view(['PATCH'])
 @permission_classes([IsAdmin])
 def employee_update(request, user_id):
@@ -326,7 +834,6 @@ def employee_update(request, user_id):
         user.job_title = job_title.strip()
         
     if role is not None:
-        VALID_ROLES = ['ADMIN', 'MANAGER', 'TL', 'SRMGR', 'EMPLOYEE']
         if role not in VALID_ROLES:
             return Response(
                 {'error': f'Invalid role. Must be one of: {", ".join(VALID_ROLES)}'},
@@ -365,7 +872,7 @@ def employee_delete(request, user_id):
     return Response({'message': 'User deleted successfully'})
 
 
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [IsManagerOrAdmin]
@@ -385,12 +892,14 @@ class UserViewSet(viewsets.ModelViewSet):
             )
         
         # Use EmployeeSerializer for the response
-        serializer = EmployeeSerializer(users, many=True)
+        serializer = EmployeeSerializer(users, many=True, context={'request': request})
+        serializer.instance = apply_sparse_fieldset(users, serializer.child)
         return Response(serializer.data)
 
 
-class TeamViewSet(viewsets.ModelViewSet):
-    queryset = Team.objects.all()
+class TeamViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
+    # TeamSerializer shows manager_name
+    queryset = Team.objects.select_related('manager')
     serializer_class = TeamSerializer
     permission_classes = [IsManagerOrAdmin]
     
@@ -442,17 +951,59 @@ class TeamViewSet(viewsets.ModelViewSet):
             manager.save(update_fields=['team'])
         
         # Add user to team
-        user_to_add.team = team
-        user_to_add.save(update_fields=['team'])
+        teams.move_members([user_to_add.id], team)
+        user_to_add.refresh_from_db()
+        team.refresh_from_db()
         
         return Response({
             'message': 'User added to team successfully',
             'user': EmployeeSerializer(user_to_add).data,
             'team': TeamSerializer(team).data
         })
+    
+    @action(detail=False, methods=['post'])
+    def move_members(self, request):
+        """
+        Move many users into a team, or out of their team with "team_id": null.
+        Body: {"user_ids": [...], "team_id": 3}
+        Managers can only add to their own team and only remove their own members.
+        """
+        user = request.user
+        user_ids = request.data.get('user_ids')
+        team_id = request.data.get('team_id')
+        
+        if not _is_id_list(user_ids):
+            return Response(
+                {'error': 'user_ids must be a non-empty list of ids'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        team = None
+        if team_id is not None:
+            team = Team.objects.filter(id=team_id).first()
+            if not team:
+                return Response({'error': 'Team not found'}, status=status.HTTP_404_NOT_FOUND)
+        
+        if user.role != 'ADMIN':
+            if not user.team_id or (team and team.id != user.team_id):
+                return Response(
+                    {'error': 'You can only move users into your own team'},
+                    status=status.HTTP_403_FORBIDDEN
+                )
+            if team is None:
+                # Removing: only members of the manager's own team
+                user_ids = list(
+                    User.objects.filter(id__in=user_ids, team_id=user.team_id).values_list('id', flat=True)
+                )
+        
+        moved_ids = teams.move_members(user_ids, team)
+        return Response({
+            'moved': moved_ids,
+            'team': TeamSerializer(Team.objects.get(id=team.id)).data if team else None
+        })
 
 
-class CourseViewSet(viewsets.ModelViewSet):
+class CourseViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = Course.objects.all()
     serializer_class = CourseSerializer
     permission_classes = [IsAuthenticated]
@@ -469,19 +1020,98 @@ class CourseViewSet(viewsets.ModelViewSet):
     
     def get_queryset(self):
         """Role-aware course filtering"""
-        user = self.request.user
+        return visible_courses(self.request.user)
+    
+    def get_serializer_class(self):
+        if self.action == 'retrieve':
+            return CourseDetailSerializer
+        return CourseSerializer
+    
+    def _visible_course(self, pk):
+        """(id, updated_at) of a course the user may see; 404 otherwise"""
+        try:
+            pk = int(pk)
+        except (TypeError, ValueError):
+            raise NotFound()
+        updated_at = self.get_queryset().filter(pk=pk).values_list('updated_at', flat=True).first()
+        if updated_at is None:
+            raise NotFound()
+        return pk, updated_at
+    
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Course with its resources embedded, cached on the course's updated_at;
+        the counters are read live on every request.
+        """
+        pk, updated_at = self._visible_course(kwargs['pk'])
+        counters = live_course_counters(Course.objects.filter(pk=pk))
         
-        if user.role == 'ADMIN':
-            # Admin sees all courses
-            return Course.objects.all()
-        elif user.role in ['MANAGER', 'TL', 'SRMGR']:
-            # Manager sees published courses + their own courses
-            return Course.objects.filter(
-                models.Q(status='published') | models.Q(created_by=user)
-            )
-        else:
-            # Employee sees only published courses
-            return Course.objects.filter(status='published')
+        def build_course():
+            course = Course.objects.select_related('created_by').prefetch_related(
+                models.Prefetch('resources', queryset=Resource.objects.order_by('created_at'))
+            ).get(pk=pk)
+            return CourseDetailSerializer(course).data
+        
+        def build_payload():
+            course = cache.get_or_set(f'course-detail:{pk}:{updated_at.isoformat()}', build_course, PAYLOAD_TIMEOUT)
+            return with_course_counters(course, counters)
+        
+        return conditional_response(
+            request,
+            make_etag('course-detail', pk, updated_at.isoformat(), counters),
+            build_payload,
+        )
+    
+    @action(detail=True, methods=['get'])
+    def resources(self, request, pk=None):
+        """Resources of one course, cached on the course's updated_at"""
+        pk, updated_at = self._visible_course(pk)
+        
+        def build_payload():
+            resources = Resource.objects.filter(course_id=pk).order_by('created_at')
+            return ResourceSerializer(resources, many=True).data
+        
+        return conditional_response(
+            request,
+            make_etag('course-resources', pk, updated_at.isoformat()),
+            build_payload,
+            cache_key=f'course-resources:{pk}:{updated_at.isoformat()}',
+        )
+    
+    @action(detail=False, methods=['get'])
+    def recommended(self, request):
+        """
+        Courses to take next, best first, from the precomputed course similarity
+        (see core.recommendations) and the user's own assignments.
+        ?limit=N (default 10, at most 50). Each course carries its `score`.
+        """
+        user = request.user
+        try:
+            limit = min(max(int(request.query_params.get('limit', 10)), 1), 50)
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        versions = get_versions(['recommendations', 'courses', f'assignments:user:{user.id}'])
+        cache_key = f'course-recommended:{user.id}:{limit}:{":".join(sorted(versions.values()))}'
+        
+        def build_ranking():
+            history = Assignment.objects.filter(user=user).values_list('course_id', 'status')
+            allowed_ids = set(self.get_queryset().values_list('id', flat=True))
+            ranked = recommendations.recommend(list(history), allowed_ids, limit)
+            courses = Course.objects.select_related('created_by').in_bulk([course_id for course_id, _ in ranked])
+            ranked = [(courses[course_id], score) for course_id, score in ranked if course_id in courses]
+            data = CourseSerializer([course for course, _ in ranked], many=True).data
+            return [{**item, 'score': round(score, 4)} for item, (_, score) in zip(data, ranked)]
+        
+        # The ranking is cached; its courses' counters are read live
+        ranking = cache.get_or_set(cache_key, build_ranking, PAYLOAD_TIMEOUT)
+        counters = live_course_counters(Course.objects.filter(id__in=[item['id'] for item in ranking]))
+        
+        return conditional_response(
+            request,
+            make_etag('course-recommended', user.id, limit, *sorted(versions.values()), sorted(counters.items())),
+            lambda: [with_course_counters(item, counters) for item in ranking],
+        )
     
     def create(self, request, *args, **kwargs):
         """Handle role-based course creation"""
@@ -521,20 +1151,39 @@ class CourseViewSet(viewsets.ModelViewSet):
         headers = self.get_success_headers(serializer.data)
         return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
     
+    def _decide(self, course, decision, reviewer, note=''):
+        """
+        Apply an admin's decision to a course. A course awaiting approval only
+        changes status if its pending approval is decided here, as in
+        bulk_decide; returns None when another admin holds or already decided it.
+        A course left awaiting approval without a pending approval row is moved
+        directly.
+        """
+        _, course_status = DECISIONS[decision]
+        with transaction.atomic():
+            course = Course.objects.select_for_update().get(pk=course.pk)
+            pending = Approval.objects.filter(course=course, status='pending')
+            if course.status == 'awaiting_approval' and pending.exists():
+                if not bulk_decide(pending, decision, reviewer, note):
+                    return None
+                course.refresh_from_db()
+            elif decision == 'reject' and course.status != 'awaiting_approval':
+                # Nothing awaits a decision: the course was approved meanwhile
+                return None
+            else:
+                course.status = course_status
+                course.save()
+        return course
+    
     @action(detail=True, methods=['patch'], permission_classes=[IsAdmin])
     def publish(self, request, pk=None):
         """Publish a course and approve it (Admin only)"""
-        course = self.get_object()
-        course.status = 'published'
-        course.save()
-        
-        # Update related approval if exists
-        approval = Approval.objects.filter(course=course, status='pending').first()
-        if approval:
-            approval.status = 'approved'
-            approval.approved_by = request.user
-            approval.reviewed_at = timezone.now()
-            approval.save()
+        course = self._decide(self.get_object(), 'approve', request.user)
+        if course is None:
+            return Response(
+                {'error': 'This course\'s approval request is being reviewed or was already decided'},
+                status=status.HTTP_409_CONFLICT
+            )
         
         serializer = self.get_serializer(course)
         return Response(serializer.data)
@@ -552,31 +1201,57 @@ class CourseViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['post'], permission_classes=[IsAdmin])
     def reject(self, request, pk=None):
         """Reject a course approval request (Admin only)"""
-        course = self.get_object()
         note = request.data.get('note', '')
-        
-        course.status = 'draft'
-        course.save()
-        
-        # Update related approval
-        approval = Approval.objects.filter(course=course, status='pending').first()
-        if approval:
-            approval.status = 'rejected'
-            approval.approved_by = request.user
-            approval.reviewed_at = timezone.now()
-            approval.rejection_note = note
-            approval.save()
+        course = self._decide(self.get_object(), 'reject', request.user, note)
+        if course is None:
+            return Response(
+                {'error': 'This course has no approval request awaiting a decision'},
+                status=status.HTTP_409_CONFLICT
+            )
         
         serializer = self.get_serializer(course)
         return Response(serializer.data)
 
 
-class ResourceViewSet(viewsets.ModelViewSet):
+class ResourceViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = Resource.objects.all()
     serializer_class = ResourceSerializer
+    
+    def get_queryset(self):
+        """Listing is optionally scoped to one course with ?course=<id>"""
+        queryset = Resource.objects.all()
+        course_id = self.request.query_params.get('course')
+        if self.action == 'list' and course_id:
+            queryset = queryset.filter(course_id=int(course_id)).order_by('created_at')
+        return queryset
+    
+    def list(self, request, *args, **kwargs):
+        course_id = request.query_params.get('course')
+        if course_id:
+            try:
+                int(course_id)
+            except ValueError:
+                return Response({'error': 'course must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        return super().list(request, *args, **kwargs)
+    
+    # Resources are embedded in the course detail, whose cache is keyed on
+    # the course's updated_at, so every resource change touches its course.
+    def perform_create(self, serializer):
+        resource = serializer.save()
+        touch_courses([resource.course_id])
+    
+    def perform_update(self, serializer):
+        previous_course_id = serializer.instance.course_id
+        resource = serializer.save()
+        touch_courses([previous_course_id, resource.course_id])
+    
+    def perform_destroy(self, instance):
+        course_id = instance.course_id
+        instance.delete()
+        touch_courses([course_id])
 
 
-class AssignmentViewSet(viewsets.ModelViewSet):
+class AssignmentViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = Assignment.objects.all()
     serializer_class = AssignmentSerializer
     permission_classes = [IsAuthenticated]
@@ -598,6 +1273,9 @@ class AssignmentViewSet(viewsets.ModelViewSet):
             # Employees see only their own assignments
             return Assignment.objects.filter(user=user)
     
+    def list(self, request, *args, **kwargs):
+        return self.list_response(self.get_queryset())
+    
     def create(self, request, *args, **kwargs):
         """Create or update an assignment (upsert)"""
         course_id = request.data.get('course_id')
@@ -621,6 +1299,10 @@ class AssignmentViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_403_FORBIDDEN
                 )
         
+        due_at, error = _parse_due_at(request.data.get('due_at'))
+        if error:
+            return error
+        
         try:
             course = Course.objects.get(id=course_id)
             user = User.objects.get(id=user_id)
@@ -636,24 +1318,107 @@ class AssignmentViewSet(viewsets.ModelViewSet):
             defaults={
                 'assigned_by': request.user,
                 'status': 'not_started',
-                'progress_pct': 0
+                'progress_pct': 0,
+                'due_at': due_at
             }
         )
         
         if not created:
             # Update assigned_by if reassigning
             assignment.assigned_by = request.user
-            assignment.save(update_fields=['assigned_by'])
+            update_fields = ['assigned_by']
+            if 'due_at' in request.data and due_at != assignment.due_at:
+                assignment.due_at = due_at
+                assignment.reminder_stage = 0
+                update_fields += ['due_at', 'reminder_stage']
+            assignment.save(update_fields=update_fields)
         
         serializer = self.get_serializer(assignment)
         return Response(serializer.data, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
     
+    @action(detail=False, methods=['post'], permission_classes=[IsManagerOrAdmin])
+    def bulk(self, request):
+        """
+        Assign many courses to many users in the background.
+        Body: {"user_ids": [...], "course_ids": [...], "due_at": optional}; returns 202 with the job id.
+        """
+        user_ids = request.data.get('user_ids')
+        course_ids = request.data.get('course_ids')
+        
+        if not _is_id_list(user_ids) or not _is_id_list(course_ids):
+            return Response(
+                {'error': 'user_ids and course_ids must be non-empty lists of ids'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        due_at, error = _parse_due_at(request.data.get('due_at'))
+        if error:
+            return error
+        
+        job = enqueue('assignments.bulk_assign', {
+            'user_ids': user_ids,
+            'course_ids': course_ids,
+            'assigned_by': request.user.id,
+            'due_at': due_at.isoformat() if due_at else None,
+        }, created_by=request.user)
+        return Response({'job_id': job.id, 'status': job.status}, status=status.HTTP_202_ACCEPTED)
+    
+    @action(detail=False, methods=['post'], permission_classes=[IsManagerOrAdmin])
+    def set_due(self, request):
+        """
+        Set (or with null, clear) the due date of many assignments in one update.
+        Body: {"assignment_ids": [...], "due_at": "2025-07-01T17:00:00Z"}
+        Managers can only change their team's assignments.
+        """
+        assignment_ids = request.data.get('assignment_ids')
+        
+        if not _is_id_list(assignment_ids) or 'due_at' not in request.data:
+            return Response(
+                {'error': 'assignment_ids (non-empty list of ids) and due_at are required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        due_at, error = _parse_due_at(request.data['due_at'])
+        if error:
+            return error
+        
+        assignments = self.get_queryset().filter(id__in=assignment_ids)
+        user_ids = set(assignments.values_list('user_id', flat=True))
+        updated = set_due_dates(assignments, due_at)
+        
+        if updated:
+            team_ids = set(User.objects.filter(id__in=user_ids, team__isnull=False).values_list('team_id', flat=True))
+            bump_versions(
+                *[f'assignments:user:{user_id}' for user_id in user_ids],
+                *[f'assignments:team:{team_id}' for team_id in team_ids],
+            )
+        return Response({'updated': updated})
+    
+    def perform_update(self, serializer):
+        # A new due date starts its reminders over
+        due_at = serializer.validated_data.get('due_at', serializer.instance.due_at)
+        if due_at != serializer.instance.due_at:
+            serializer.save(reminder_stage=0)
+        else:
+            serializer.save()
+    
+    @action(detail=False, methods=['post'], permission_classes=[IsManagerOrAdmin])
+    def export(self, request):
+        """Export assignments (team for managers, all for admins) to CSV in the background"""
+        user = request.user
+        
+        if user.role != 'ADMIN' and not user.team_id:
+            return Response({'error': 'You are not on a team'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        payload = {} if user.role == 'ADMIN' else {'team_id': user.team_id}
+        job = enqueue('assignments.export_csv', payload, created_by=user)
+        return Response({'job_id': job.id, 'status': job.status}, status=status.HTTP_202_ACCEPTED)
+    
     @action(detail=False, methods=['get'])
     def mine(self, request):
         """Get employee's own assignments with nested course data"""
         assignments = Assignment.objects.filter(user=request.user).select_related('course', 'assigned_by')
-        serializer = self.get_serializer(assignments, many=True)
-        return Response(serializer.data)
+        return self.list_response(assignments)
     
     @action(detail=False, methods=['get'], permission_classes=[IsManagerOrAdmin])
     def team(self, request):
@@ -668,12 +1433,97 @@ class AssignmentViewSet(viewsets.ModelViewSet):
             assignments = Assignment.objects.none()
         
         assignments = assignments.select_related('user', 'course', 'assigned_by')
-        serializer = self.get_serializer(assignments, many=True)
-        return Response(serializer.data)
+        return self.list_response(assignments)
+    
+    @action(detail=True, methods=['post'])
+    def heartbeat(self, request, pk=None):
+        """
+        Video position report from the assigned learner, sent every 10-15 seconds.
+        Body: {"position_seconds": 312, "watched_seconds": 15, "progress_pct": 17 (optional)}
+        Buffered and merged into the assignment by a background job (see core.heartbeats).
+        """
+        try:
+            assignment_id = int(pk)
+        except ValueError:
+            return Response({'error': 'Assignment not found'}, status=status.HTTP_404_NOT_FOUND)
+        
+        try:
+            position_seconds = int(request.data.get('position_seconds'))
+            watched_seconds = int(request.data.get('watched_seconds', 0))
+            progress_pct = request.data.get('progress_pct')
+            progress_pct = int(progress_pct) if progress_pct is not None else None
+            if any(not 0 <= seconds <= heartbeats.MAX_SECONDS for seconds in (position_seconds, watched_seconds)) or (
+                progress_pct is not None and not 0 <= progress_pct <= 100
+            ):
+                raise ValueError()
+        except (ValueError, TypeError):
+            return Response(
+                {'error': f'position_seconds and watched_seconds must be integers from 0 to {heartbeats.MAX_SECONDS} '
+                          'and progress_pct between 0 and 100'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if not heartbeats.record(assignment_id, request.user.id, position_seconds, watched_seconds, progress_pct):
+            return Response({'error': 'Assignment not found'}, status=status.HTTP_404_NOT_FOUND)
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    
+    @action(detail=True, methods=['get'])
+    def certificate(self, request, pk=None):
+        """
+        Where to download the completion certificate. 202 while it is being
+        generated (certificates.generate job), 404 before completion.
+        """
+        assignment = self.get_object()
+        if assignment.status != 'completed':
+            return Response({'error': 'Assignment is not completed'}, status=status.HTTP_404_NOT_FOUND)
+        
+        certificate = Certificate.objects.filter(assignment=assignment).first()
+        if certificate is None or not certificates.has_file(certificate):
+            # Completed before certificates existed, its job has not run yet, or its file was lost
+            certificates.queue(assignment_ids=[assignment.id])
+            return Response({'status': 'pending'}, status=status.HTTP_202_ACCEPTED)
+        
+        return Response({
+            'status': 'ready',
+            'url': reverse('certificate_file', kwargs={'digest': certificate.digest}),
+            'generated_at': certificate.generated_at,
+        })
+    
+    @action(detail=False, methods=['get'])
+    def summary(self, request):
+        """
+        Assigned / in progress / completed counts for a learner (default: yourself).
+        Managers may ask about their team members, admins about anyone.
+        """
+        user = request.user
+        user_id = request.query_params.get('user_id', user.id)
+        
+        try:
+            user_id = int(user_id)
+        except (TypeError, ValueError):
+            return Response({'error': 'user_id must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        if user_id != user.id and user.role != 'ADMIN':
+            in_team = (
+                user.role in MANAGER_ROLES and user.team_id and
+                User.objects.filter(id=user_id, team_id=user.team_id).exists()
+            )
+            if not in_team:
+                return Response(
+                    {'error': 'You do not have permission to view this learner'},
+                    status=status.HTTP_403_FORBIDDEN
+                )
+        
+        summary = LearnerSummary.objects.filter(user_id=user_id).first()
+        if summary is None:
+            if not User.objects.filter(id=user_id).exists():
+                return Response({'error': 'User not found'}, status=status.HTTP_404_NOT_FOUND)
+            summary = LearnerSummary(user_id=user_id)
+        return Response(LearnerSummarySerializer(summary).data)
     
     @action(detail=True, methods=['patch'])
     def progress(self, request, pk=None):
-        """Update assignment progress and create progress event"""
+        """Update assignment progress and create progress event (see core.progress)"""
         assignment = self.get_object()
         
         # Check permission: only the assigned user or managers/admins can update
@@ -697,29 +1547,15 @@ class AssignmentViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
             
-            assignment.progress_pct = progress_pct
-            assignment.last_activity_at = timezone.now()
-            
-            # Auto-complete at 100%
-            if progress_pct >= 100:
-                assignment.status = 'completed'
-                if not assignment.completed_at:
-                    assignment.completed_at = timezone.now()
-            elif progress_pct > 0 and assignment.status == 'not_started':
-                assignment.status = 'in_progress'
-            
-            # Create progress event
-            ProgressEvent.objects.create(
-                assignment=assignment,
-                progress_pct=progress_pct
-            )
+        if new_status not in STATUSES:
+            new_status = None
         
-        if new_status and new_status in ['not_started', 'in_progress', 'completed']:
-            assignment.status = new_status
-            if new_status == 'completed' and not assignment.completed_at:
-                assignment.completed_at = timezone.now()
-        
-        assignment.save()
+        # One statement: progress never goes backwards under concurrent reports
+        result = apply_progress(assignment.id, progress_pct, new_status)
+        if result is None:
+            return Response({'error': 'Assignment not found'}, status=status.HTTP_404_NOT_FOUND)
+        for field, value in result.items():
+            setattr(assignment, field, value)
         
         serializer = self.get_serializer(assignment)
         return Response(serializer.data)
@@ -730,12 +1566,155 @@ class ProgressEventViewSet(viewsets.ModelViewSet):
     serializer_class = ProgressEventSerializer
 
 
-class NotificationViewSet(viewsets.ModelViewSet):
+class NotificationViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = Notification.objects.all()
     serializer_class = NotificationSerializer
+    
+    @action(detail=False, methods=['post'], permission_classes=[IsAdmin])
+    def broadcast(self, request):
+        """
+        Send a notification to every active user, optionally narrowed by team_id and/or role.
+        Fan-out runs in the background; returns 202 with the job id.
+        """
+        text = (request.data.get('text') or '').strip()
+        if not text:
+            return Response({'error': 'text is required'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        payload = {'text': text}
+        if request.data.get('team_id'):
+            payload['team_id'] = request.data['team_id']
+        if request.data.get('role'):
+            payload['role'] = request.data['role']
+        
+        job = enqueue('notifications.broadcast', payload, created_by=request.user)
+        return Response({'job_id': job.id, 'status': job.status}, status=status.HTTP_202_ACCEPTED)
+
+
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    """Status of background jobs: your own, or all of them for admins"""
+    queryset = Job.objects.all()
+    serializer_class = JobSerializer
+    
+    def get_queryset(self):
+        if self.request.user.role == 'ADMIN':
+            return Job.objects.all()
+        return Job.objects.filter(created_by=self.request.user)
+    
+    @action(detail=True, methods=['get'])
+    def download(self, request, pk=None):
+        """Download the file produced by an export job"""
+        job = self.get_object()
+        file_name = (job.result or {}).get('file') if job.status == 'succeeded' else None
+        
+        if not file_name:
+            return Response({'error': 'This job has no file to download'}, status=status.HTTP_404_NOT_FOUND)
+        
+        path = settings.EXPORTS_ROOT / os.path.basename(file_name)
+        if not path.exists():
+            return Response({'error': 'Export file no longer exists'}, status=status.HTTP_404_NOT_FOUND)
+        
+        return FileResponse(open(path, 'rb'), as_attachment=True, filename=path.name)
+    
+    @action(detail=True, methods=['post'], permission_classes=[IsAdmin])
+    def retry(self, request, pk=None):
+        """Requeue a dead-lettered job"""
+        job = self.get_object()
+        if not retry_dead([job.id]):
+            return Response({'error': 'Only dead jobs can be retried'}, status=status.HTTP_400_BAD_REQUEST)
+        job.refresh_from_db()
+        return Response(self.get_serializer(job).data)
 
 
-class ApprovalViewSet(viewsets.ModelViewSet):
+class ApprovalViewSet(SparseFieldsetViewMixin, viewsets.ModelViewSet):
     queryset = Approval.objects.all()
     serializer_class = ApprovalSerializer
     permission_classes = [IsManagerOrAdmin]
+    
+    @action(detail=False, methods=['get'], permission_classes=[IsAdmin])
+    def queue(self, request):
+        """
+        Pending approvals, oldest first, with keyset pagination.
+        Query params:
+        - limit: page size (default 50, max 200)
+        - cursor: `next_cursor` from the previous page
+        """
+        try:
+            limit = min(max(int(request.query_params.get('limit', 50)), 1), 200)
+        except ValueError:
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        queryset = pending_queue().select_related('course', 'requested_by', 'approved_by')
+        
+        cursor = request.query_params.get('cursor')
+        if cursor:
+            position = decode_cursor(cursor)
+            if position is None:
+                return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+            queryset = after_cursor(queryset, position)
+        
+        page = list(queryset[:limit + 1])
+        has_more = len(page) > limit
+        page = page[:limit]
+        
+        return Response({
+            'results': self.get_serializer(page, many=True).data,
+            'next_cursor': encode_cursor(page[-1]) if has_more else None,
+        })
+    
+    @action(detail=False, methods=['post'], permission_classes=[IsAdmin])
+    def claim(self, request):
+        """Claim the oldest pending approvals nobody else is reviewing"""
+        try:
+            limit = min(max(int(request.data.get('limit', 10)), 1), 100)
+        except (ValueError, TypeError):
+            return Response({'error': 'limit must be an integer'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        approval_ids = claim_pending(request.user, limit)
+        approvals = Approval.objects.filter(id__in=approval_ids).select_related(
+            'course', 'requested_by', 'approved_by'
+        ).order_by('requested_at', 'id')
+        serializer = self.get_serializer(approvals, many=True)
+        return Response(serializer.data)
+    
+    @action(detail=False, methods=['post'], permission_classes=[IsAdmin])
+    def bulk_decide(self, request):
+        """
+        Approve or reject many pending approvals in one transaction.
+        Body: {"decision": "approve"|"reject", "approval_ids": [...] and/or "course_ids": [...], "note": ""}
+        """
+        decision = request.data.get('decision')
+        approval_ids = request.data.get('approval_ids') or []
+        course_ids = request.data.get('course_ids') or []
+        note = request.data.get('note', '')
+        
+        if decision not in DECISIONS:
+            return Response(
+                {'error': 'decision must be "approve" or "reject"'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if not (approval_ids or course_ids) or any(
+            ids and not _is_id_list(ids) for ids in (approval_ids, course_ids)
+        ):
+            return Response(
+                {'error': 'approval_ids or course_ids must be a non-empty list of ids'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        approvals = Approval.objects.filter(
+            models.Q(id__in=approval_ids) | models.Q(course_id__in=course_ids)
+        )
+        decided = bulk_decide(approvals, decision, request.user, note)
+        # Still pending afterwards: claimed or being decided by another admin
+        skipped = sorted(approvals.filter(status='pending').values_list('id', flat=True))
+        if skipped and not decided:
+            return Response(
+                {'error': 'These approvals are claimed by another reviewer', 'skipped': skipped},
+                status=status.HTTP_409_CONFLICT
+            )
+        
+        return Response({
+            'decided': [approval_id for approval_id, _ in decided],
+            'courses': sorted({course_id for _, course_id in decided}),
+            'skipped': skipped,
+        })
@@ -0,0 +1,47 @@
+"""
+Gunicorn settings for the deployment (picked up from the working directory).
+
+The app is preloaded in the master and warmed up there without the database,
+so every worker forks with Django, the URL resolvers and the serializers
+already loaded. Each worker then opens its database connection in
+post_worker_init, before it accepts a request. See core/startup.py.
+
+GUNICORN_PRELOAD=0 and STARTUP_WARMUP=0 turn these off (used by bench_startup).
+"""
+import os
+
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', '4'))
+timeout = 120
+preload_app = os.environ.get('GUNICORN_PRELOAD', '1') == '1'
+
+WARMUP = os.environ.get('STARTUP_WARMUP', '1') == '1'
+
+
+def when_ready(server):
+    # Runs in the master before the first fork; with preload the app is loaded by now
+    if not (preload_app and WARMUP):
+        return
+    from django.db import connections
+    from core import startup
+
+    timings = startup.warm_up(connect=False)
+    # Workers must not inherit an open socket
+    connections.close_all()
+    server.log.info('Master warm-up: %s', timings)
+
+
+def post_fork(server, worker):
+    if preload_app:
+        from core import startup
+        startup.after_fork()
+
+
+def post_worker_init(worker):
+    if not WARMUP:
+        return
+    from core import startup
+
+    timings = startup.warm_up()
+    worker.log.info('Worker %s warm-up: %s', worker.pid, timings)